@@ -1,10 +1,13 @@
 import json
 import re
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import asdict
 
 from mistralai import Mistral
 
+from application.services.comparables_cache import ComparablesCache
 from application.services.investment_calculator import InvestmentCalculator
 from application.services.local_property_search import LocalPropertySearchService
 from config.settings import settings
@@ -42,6 +45,25 @@ STARS_4_THRESHOLD = 70
 STARS_3_THRESHOLD = 55
 STARS_2_THRESHOLD = 40
 
+# Concurrent mode
+MIN_LOCAL_COMPARABLES = 3
+APPRAISAL_WORKERS = 8
+
+# The research query asks for 3 listings: when the regex finds them all, skip the LLM
+MIN_REGEX_COMPARABLES = 3
+# Rentals and judicial auctions are not sale comparables. Only the listing's own
+# title (the text before its price) is checked: notes after the price often
+# mention rental yields or nearby auctions for listings that are valid sales.
+EXCLUDED_LISTING_PATTERN = re.compile(
+    r"\b(affitto|rent|asta|auction|giudiziari[ao])\b",
+    re.IGNORECASE,
+)
+# A price followed by a monthly unit is a rent, e.g. "€1.300/mese", "1.300 € al mese"
+MONTHLY_PRICE_PATTERN = re.compile(
+    r"\s*(?:€|EUR)?\s*(?:/\s*(?:mese|month|mo)\b|al mese\b|per month\b|a month\b)",
+    re.IGNORECASE,
+)
+
 
 class AppraisalService:
     def __init__(
@@ -49,11 +71,36 @@ class AppraisalService:
         research_port: ResearchPort,
         local_search: LocalPropertySearchService | None = None,
         performance_logger: PerformanceMetricLogger | None = None,
+        concurrent: bool | None = None,
+        deadline_seconds: float | None = None,
+        *,
+        comparables_cache: ComparablesCache | None = None,
+        hedge_seconds: float | None = None,
     ) -> None:
         self.research = research_port
+        self.comparables_cache = comparables_cache
         self.investment_calc = InvestmentCalculator()
         self.local_search = local_search
         self.performance_logger = performance_logger
+        self.concurrent = (
+            bool(settings.APPRAISAL_CONCURRENT_MODE) if concurrent is None else concurrent
+        )
+        self.deadline_seconds = (
+            settings.APPRAISAL_DEADLINE_SECONDS if deadline_seconds is None else deadline_seconds
+        )
+        self.hedge_seconds = (
+            settings.APPRAISAL_HEDGE_SECONDS if hedge_seconds is None else hedge_seconds
+        )
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Lazy thread pool for concurrent mode (shared across requests)."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=APPRAISAL_WORKERS, thread_name_prefix="appraisal"
+            )
+        return self._executor
 
     def estimate_value(self, request: AppraisalRequest) -> AppraisalResult:
         """
@@ -70,40 +117,10 @@ class AppraisalService:
 
         logger.info("APPRAISAL_START", context=request.model_dump())
 
-        # 1. Try Local Database First
-        comparables = []
-        if self.local_search:
-            try:
-                comparables = self.local_search.search_local_comparables(
-                    city=request.city,
-                    zone=request.zone,
-                    property_type=request.property_type,
-                    surface_sqm=request.surface_sqm,
-                    min_comparables=3,
-                )
-                if comparables:
-                    used_local_search = True
-                    logger.info("LOCAL_SEARCH_SUCCESS", context={"count": len(comparables)})
-            except Exception as e:
-                logger.warning("LOCAL_SEARCH_FAILED", context={"error": str(e)})
-
-        # 2. Fall back to Perplexity if local search didn't find enough
-        if not comparables:
-            used_perplexity = True
-            logger.info("FALLBACK_TO_PERPLEXITY")
-            try:
-                research_text = self.research.find_market_comparables(
-                    city=request.city,
-                    zone=request.zone,
-                    property_type="appartamento"
-                    if request.property_type == "apartment"
-                    else request.property_type,
-                    surface_sqm=request.surface_sqm,
-                )
-                comparables = self._parse_comparables(research_text)
-            except Exception as e:
-                logger.error("APPRAISAL_RESEARCH_FAILED", context={"error": str(e)})
-                comparables = []
+        if self.concurrent and self.local_search:
+            comparables, used_local_search, used_perplexity = self._gather_concurrent(request)
+        else:
+            comparables, used_local_search, used_perplexity = self._gather_sequential(request)
 
         if not comparables:
             logger.warning("APPRAISAL_NO_COMPS_FOUND")
@@ -185,7 +202,172 @@ class AppraisalService:
         result.id = appraisal_id
         return result
 
+    def _search_local(self, request: AppraisalRequest) -> list[Comparable]:
+        """Queries the local database for comparables."""
+        if not self.local_search:
+            return []
+        try:
+            comparables = self.local_search.search_local_comparables(
+                city=request.city,
+                zone=request.zone,
+                property_type=request.property_type,
+                surface_sqm=request.surface_sqm,
+                min_comparables=MIN_LOCAL_COMPARABLES,
+                condition=request.condition.value,
+            )
+            if comparables:
+                logger.info("LOCAL_SEARCH_SUCCESS", context={"count": len(comparables)})
+            return comparables
+        except Exception as e:
+            logger.warning("LOCAL_SEARCH_FAILED", context={"error": str(e)})
+            return []
+
+    @staticmethod
+    def _research_property_type(request: AppraisalRequest) -> str:
+        return "appartamento" if request.property_type == "apartment" else request.property_type
+
+    def _cached_research(
+        self, request: AppraisalRequest
+    ) -> tuple[str | None, list[Comparable] | None]:
+        """ComparablesCache key and entry for the research query."""
+        if not self.comparables_cache:
+            return None, None
+        cache_key = None
+        try:
+            cache_key = self.comparables_cache.key(
+                request.city,
+                request.zone,
+                self._research_property_type(request),
+                request.surface_sqm,
+            )
+            return cache_key, self.comparables_cache.get(cache_key)
+        except Exception as e:
+            # A broken cache must never fail the appraisal: treat it as a miss
+            logger.warning("COMPARABLES_CACHE_LOOKUP_FAILED", context={"error": str(e)})
+            return cache_key, None
+
+    def _research_comparables(
+        self, request: AppraisalRequest, cancelled: threading.Event | None = None
+    ) -> list[Comparable]:
+        """Fetches comparables from Perplexity and extracts them (regex, then Mistral)."""
+        property_type = self._research_property_type(request)
+        cache_key, cached = self._cached_research(request)
+        if cached:
+            return cached
+        try:
+            research_text = self.research.find_market_comparables(
+                city=request.city,
+                zone=request.zone,
+                property_type=property_type,
+                surface_sqm=request.surface_sqm,
+            )
+            # Skip the LLM extraction if local search already won the race
+            if cancelled is not None and cancelled.is_set():
+                return []
+            comparables = self._parse_comparables(research_text)
+        except Exception as e:
+            logger.error("APPRAISAL_RESEARCH_FAILED", context={"error": str(e)})
+            return []
+
+        if self.comparables_cache and cache_key and comparables:
+            self.comparables_cache.set(cache_key, comparables, source="perplexity")
+        return comparables
+
+    def _gather_sequential(self, request: AppraisalRequest) -> tuple[list[Comparable], bool, bool]:
+        """Local database first, Perplexity only on a miss."""
+        comparables = self._search_local(request)
+        if comparables:
+            return comparables, True, False
+
+        logger.info("FALLBACK_TO_PERPLEXITY")
+        return self._research_comparables(request), False, True
+
+    def _gather_concurrent(self, request: AppraisalRequest) -> tuple[list[Comparable], bool, bool]:
+        """
+        Starts local search, then a speculative Perplexity call if local search
+        hasn't found enough within `hedge_seconds`. A Perplexity call can't be
+        stopped once sent, so the hedge keeps fast local hits from paying for
+        one; cached research costs nothing and starts straight away.
+        Local results win when there are enough of them, and a remote answer
+        that lands first waits up to `hedge_seconds` for local search. The
+        whole gather is bounded by `deadline_seconds`.
+        """
+        deadline = time.monotonic() + self.deadline_seconds
+        cancelled = threading.Event()
+        local: Future[list[Comparable]] = self.executor.submit(self._search_local, request)
+
+        local_comps: list[Comparable] = []
+        _, cached = self._cached_research(request)
+        if not cached:
+            wait([local], timeout=self._until(deadline, self.hedge_seconds))
+            if local.done():
+                local_comps = local.result()
+                if len(local_comps) >= MIN_LOCAL_COMPARABLES:
+                    logger.info("SPECULATIVE_RESEARCH_SKIPPED", context={"local": len(local_comps)})
+                    return local_comps, True, False
+        remote: Future[list[Comparable]] = self.executor.submit(
+            self._research_comparables, request, cancelled
+        )
+
+        pending = {local, remote}
+        while pending:
+            remaining = self._until(deadline)
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if local in done:
+                local_comps = local.result()
+                if len(local_comps) >= MIN_LOCAL_COMPARABLES:
+                    cancelled.set()
+                    remote.cancel()
+                    logger.info(
+                        "SPECULATIVE_RESEARCH_CANCELLED", context={"local": len(local_comps)}
+                    )
+                    return local_comps, True, False
+            if remote in done and remote.result():
+                if not local.done():
+                    # Local search may be moments away: give it a short grace period
+                    wait([local], timeout=self._until(deadline, self.hedge_seconds))
+                if local.done():
+                    local_comps = local.result()
+                    if len(local_comps) >= MIN_LOCAL_COMPARABLES:
+                        return local_comps, True, False
+                # Local was thin or still running: prefer the larger set
+                if len(remote.result()) >= len(local_comps):
+                    cancelled.set()
+                    return remote.result(), False, True
+            if local.done() and remote.done():
+                break
+
+        cancelled.set()
+        if pending:
+            logger.warning(
+                "APPRAISAL_DEADLINE_EXCEEDED",
+                context={"deadline_seconds": self.deadline_seconds, "local": len(local_comps)},
+            )
+        # Thin local results still beat nothing (same as sequential mode)
+        if local_comps:
+            return local_comps, True, False
+        return [], False, True
+
+    @staticmethod
+    def _until(deadline: float, limit: float | None = None) -> float:
+        """Seconds left before `deadline` (at most `limit`), never negative."""
+        remaining = max(deadline - time.monotonic(), 0.0)
+        return remaining if limit is None else min(remaining, limit)
+
     def _parse_comparables(self, text: str) -> list[Comparable]:
+        """
+        Extracts comparables with the regex parser, falling back to the LLM
+        when the regex finds fewer listings than the research asked for.
+        """
+        comps = self._parse_comparables_regex(text)
+        if len(comps) >= MIN_REGEX_COMPARABLES:
+            logger.info("COMPARABLES_PARSED_WITH_REGEX", context={"count": len(comps)})
+            return comps
+        return self._parse_comparables_llm(text)
+
+    def _parse_comparables_llm(self, text: str) -> list[Comparable]:
         """
         Use Mistral LLM to extract structured comparable data.
         """
@@ -254,7 +436,7 @@ If no valid comparables found, return: []"""
             return self._parse_comparables_regex(text)
 
     def _parse_comparables_regex(self, text: str) -> list[Comparable]:
-        """Fallback regex parser."""
+        """Line-based regex parser (first pass, and fallback when the LLM fails)."""
         comps = []
         lines = text.split("\n")
 
@@ -272,6 +454,11 @@ If no valid comparables found, return: []"""
                 sqm_match = re.search(r"(\d+)\s?(?:sqm|mq|m²|m2|m\^2)", line, re.IGNORECASE)
 
                 if price_match and sqm_match:
+                    title = line[: price_match.start()]
+                    if EXCLUDED_LISTING_PATTERN.search(title) or MONTHLY_PRICE_PATTERN.match(
+                        line, price_match.end()
+                    ):
+                        continue
                     price_str = (
                         (price_match.group(1) or price_match.group(2))
                         .replace(".", "")
@@ -0,0 +1,142 @@
+"""
+Comparable Ranking
+Scores candidate listings against the subject property and keeps the closest.
+"""
+
+import math
+import statistics
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+MIN_PRICE_PER_SQM = 500
+MAX_PRICE_PER_SQM = 15000
+
+# Relative weight of each similarity signal (sum to 1)
+SIZE_WEIGHT = 0.40
+ZONE_WEIGHT = 0.25
+CONDITION_WEIGHT = 0.15
+RECENCY_WEIGHT = 0.10
+PRICE_WEIGHT = 0.10
+
+MAX_SIZE_DEVIATION = 0.5  # 50% larger/smaller scores zero on size
+RECENCY_HALF_LIFE_DAYS = 180
+MAX_PRICE_DEVIATION = 0.5  # 50% away from the pool median scores zero on price
+UNKNOWN_SIGNAL = 0.5  # Neutral score when a candidate lacks the field
+
+# Ordered worst -> best, matching PropertyCondition values
+CONDITION_SCALE = ["poor", "fair", "good", "excellent", "luxury"]
+CONDITION_ALIASES = {
+    "da ristrutturare": "poor",
+    "scadente": "poor",
+    "needs_work": "fair",
+    "discreto": "fair",
+    "abitabile": "fair",
+    "buono": "good",
+    "ottimo": "excellent",
+    "ristrutturato": "excellent",
+    "renovated": "luxury",
+    "nuovo": "luxury",
+    "nuova costruzione": "luxury",
+}
+
+
+@dataclass
+class RankedComparable:
+    prop: dict[str, Any]
+    price_per_sqm: float
+    score: float
+
+
+def price_per_sqm(prop: dict[str, Any]) -> float | None:
+    """Price per sqm if the listing is complete and plausible, else None."""
+    try:
+        price = float(prop.get("price") or 0)
+        sqm = float(prop.get("sqm") or 0)
+    except (TypeError, ValueError):
+        return None
+    if price <= 0 or sqm <= 0:
+        return None
+    value = price / sqm
+    return value if MIN_PRICE_PER_SQM < value < MAX_PRICE_PER_SQM else None
+
+
+def condition_rank(condition: str | None) -> int | None:
+    """Position of `condition` on CONDITION_SCALE (0 = poor), or None if unknown."""
+    if not condition:
+        return None
+    key = condition.strip().lower()
+    key = CONDITION_ALIASES.get(key, key)
+    return CONDITION_SCALE.index(key) if key in CONDITION_SCALE else None
+
+
+def _listed_at(prop: dict[str, Any]) -> datetime | None:
+    raw = prop.get("updated_at") or prop.get("created_at")
+    if not raw:
+        return None
+    try:
+        listed = datetime.fromisoformat(str(raw).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return listed if listed.tzinfo else listed.replace(tzinfo=UTC)
+
+
+def rank_comparables(
+    candidates: list[dict[str, Any]],
+    target_sqm: int | None,
+    *,
+    zone_slug: str | None = None,
+    condition: str | None = None,
+    k: int = 10,
+    now: datetime | None = None,
+) -> list[RankedComparable]:
+    """
+    Returns the `k` best candidates, best first.
+
+    Implausible prices are dropped; the rest are scored on size distance,
+    zone match, condition distance, listing age and distance from the
+    pool's median price per sqm.
+    """
+    now = now or datetime.now(UTC)
+    priced = [(prop, value) for prop in candidates if (value := price_per_sqm(prop)) is not None]
+    if not priced:
+        return []
+
+    median = statistics.median(value for _, value in priced)
+    target_condition = condition_rank(condition)
+
+    ranked = []
+    for prop, value in priced:
+        size = UNKNOWN_SIGNAL
+        if target_sqm:
+            deviation = abs(float(prop["sqm"]) - target_sqm) / target_sqm
+            size = 1 - min(deviation / MAX_SIZE_DEVIATION, 1)
+
+        zone = UNKNOWN_SIGNAL
+        if zone_slug:
+            zone = 1.0 if prop.get("zone_slug") == zone_slug else 0.0
+
+        cond = UNKNOWN_SIGNAL
+        prop_condition = condition_rank(prop.get("condition"))
+        if target_condition is not None and prop_condition is not None:
+            cond = 1 - abs(target_condition - prop_condition) / (len(CONDITION_SCALE) - 1)
+
+        recency = UNKNOWN_SIGNAL
+        listed = _listed_at(prop)
+        if listed:
+            age_days = max((now - listed).total_seconds() / 86400, 0)
+            recency = math.pow(0.5, age_days / RECENCY_HALF_LIFE_DAYS)
+
+        price = 1 - min(abs(value - median) / median / MAX_PRICE_DEVIATION, 1)
+
+        score = (
+            SIZE_WEIGHT * size
+            + ZONE_WEIGHT * zone
+            + CONDITION_WEIGHT * cond
+            + RECENCY_WEIGHT * recency
+            + PRICE_WEIGHT * price
+        )
+        ranked.append(RankedComparable(prop=prop, price_per_sqm=value, score=round(score, 4)))
+
+    ranked.sort(key=lambda r: r.score, reverse=True)
+    return ranked[:k]
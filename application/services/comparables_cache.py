@@ -0,0 +1,80 @@
+"""
+Comparables Cache
+Validated comparables from market research, keyed by the canonical query.
+"""
+
+import json
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from pydantic import ValidationError
+
+from domain.appraisal import Comparable
+from domain.ports import CachePort
+from domain.property_search import comparables_query_key
+from infrastructure.logging import get_logger
+from infrastructure.metrics import cache_hits_total, cache_misses_total
+
+logger = get_logger(__name__)
+
+CACHE_TYPE = "comparables"
+KEY_PREFIX = "comparables:"
+DEFAULT_TTL_HOURS = 24
+
+
+class ComparablesCache:
+    """
+    Stores parsed `Comparable` lists so a repeated appraisal skips both the
+    research call and the LLM extraction.
+
+    Entries record where the comparables came from and when they expire;
+    equivalent queries (city spelling, zone slug, nearby sizes) share an
+    entry through `comparables_query_key`.
+    """
+
+    def __init__(self, cache: CachePort, ttl_hours: int = DEFAULT_TTL_HOURS):
+        self.cache = cache
+        self.ttl = timedelta(hours=ttl_hours)
+
+    @staticmethod
+    def key(city: str, zone: str, property_type: str, surface_sqm: int) -> str:
+        return KEY_PREFIX + comparables_query_key(city, zone, property_type, surface_sqm)
+
+    def get(self, key: str) -> list[Comparable] | None:
+        """Cached comparables for `key`; unreadable, malformed or expired entries are misses."""
+        entry: dict[str, Any] = {}
+        comparables = None
+        try:
+            raw = self.cache.get(key)
+            if raw:
+                entry = json.loads(raw)
+                if datetime.fromisoformat(entry["expires_at"]) > datetime.now(UTC):
+                    comparables = [Comparable(**item) for item in entry["comparables"]]
+        except (KeyError, TypeError, ValueError, ValidationError) as e:
+            logger.warning("COMPARABLES_CACHE_CORRUPT", context={"key": key, "error": str(e)})
+        except Exception as e:
+            logger.warning("COMPARABLES_CACHE_READ_FAILED", context={"key": key, "error": str(e)})
+        if comparables is None:
+            cache_misses_total.labels(cache_type=CACHE_TYPE).inc()
+            return None
+
+        cache_hits_total.labels(cache_type=CACHE_TYPE).inc()
+        logger.info(
+            "COMPARABLES_CACHE_HIT",
+            context={
+                "key": key,
+                "source": entry.get("source"),
+                "cached_at": entry.get("cached_at"),
+            },
+        )
+        return comparables
+
+    def set(self, key: str, comparables: list[Comparable], source: str) -> None:
+        now = datetime.now(UTC)
+        entry = {
+            "source": source,
+            "cached_at": now.isoformat(),
+            "expires_at": (now + self.ttl).isoformat(),
+            "comparables": [c.model_dump() for c in comparables],
+        }
+        self.cache.set(key, json.dumps(entry), ttl=int(self.ttl.total_seconds()))
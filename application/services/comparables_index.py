@@ -0,0 +1,303 @@
+"""
+Comparables Index
+In-process, columnar copy of the available inventory for appraisal searches.
+"""
+
+import re
+import sys
+import threading
+import time
+from typing import Any
+
+import numpy as np
+from supabase import Client
+
+from application.services.comparable_ranking import (
+    CONDITION_SCALE,
+    MAX_PRICE_PER_SQM,
+    MIN_PRICE_PER_SQM,
+    condition_rank,
+)
+from infrastructure.adapters.supabase_pager import ChangeWatermark, iter_rows
+from infrastructure.logging import get_logger
+from infrastructure.metrics import (
+    comparables_index_memory_bytes,
+    comparables_index_refresh_lag_seconds,
+    comparables_index_rows,
+)
+
+logger = get_logger(__name__)
+
+INDEX_COLUMNS = (
+    "id, title, description, price, sqm, city, zone_slug, property_type, condition, "
+    "status, search_text, updated_at, created_at"
+)
+PAGE_SIZE = 1000
+DEFAULT_REFRESH_SECONDS = 60
+TITLE_MAX_LENGTH = 100
+DESC_MAX_LENGTH = 300
+UNKNOWN_CONDITION = -1
+# Separates listings in the joined search-text corpus; never part of a query
+TEXT_SEPARATOR = "\n"
+
+# Fields kept per listing (what ranking and Comparable need)
+ROW_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "price",
+    "sqm",
+    "zone_slug",
+    "property_type",
+    "condition",
+    "updated_at",
+    "created_at",
+)
+
+
+class _CityColumns:
+    """Numpy columns for one city's listings; immutable once built."""
+
+    def __init__(self, rows: list[dict[str, Any]]):
+        self.rows = rows
+        self.sqm = np.array([float(r.get("sqm") or 0) for r in rows], dtype=np.float64)
+        self.price = np.array([float(r.get("price") or 0) for r in rows], dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.price_per_sqm = np.where(self.sqm > 0, self.price / self.sqm, 0.0)
+        # Same bounds as comparable_ranking.price_per_sqm
+        self.plausible = (self.price_per_sqm > MIN_PRICE_PER_SQM) & (
+            self.price_per_sqm < MAX_PRICE_PER_SQM
+        )
+        self.condition = np.array(
+            [self._condition_code(r.get("condition")) for r in rows], dtype=np.int8
+        )
+        self.zone_codes, self.zones = self._encode([r.get("zone_slug") for r in rows])
+        self.type_codes, self.types = self._encode([r.get("property_type") for r in rows])
+        # One lowercase corpus searched in C instead of a Python loop per row
+        texts = [(r.pop("search_text", None) or "").lower() for r in rows]
+        lengths = np.fromiter((len(t) + 1 for t in texts), dtype=np.int64, count=len(texts))
+        self.text_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+        self.corpus = TEXT_SEPARATOR.join(texts)
+
+    @staticmethod
+    def _condition_code(condition: str | None) -> int:
+        rank = condition_rank(condition)
+        return UNKNOWN_CONDITION if rank is None else rank
+
+    def text_mask(self, text: str) -> np.ndarray:
+        """Rows whose search text contains `text` (case-insensitive)."""
+        mask = np.zeros(len(self.rows), dtype=bool)
+        needle = text.lower()
+        if not needle or TEXT_SEPARATOR in needle:
+            return mask
+        hits = np.fromiter(
+            (m.start() for m in re.finditer(re.escape(needle), self.corpus)), dtype=np.int64
+        )
+        if hits.size:
+            mask[np.searchsorted(self.text_starts, hits, side="right") - 1] = True
+        return mask
+
+    @staticmethod
+    def _encode(values: list[str | None]) -> tuple[np.ndarray, dict[str, int]]:
+        lookup: dict[str, int] = {}
+        codes = np.array(
+            [lookup.setdefault(v, len(lookup)) if v else -1 for v in values], dtype=np.int32
+        )
+        return codes, lookup
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (
+            self.sqm,
+            self.price,
+            self.price_per_sqm,
+            self.plausible,
+            self.condition,
+            self.zone_codes,
+            self.type_codes,
+            self.text_starts,
+        )
+        text_bytes = sys.getsizeof(self.corpus)
+        row_bytes = sum(
+            sys.getsizeof(r) + sum(sys.getsizeof(v) for v in r.values()) for r in self.rows
+        )
+        return sum(a.nbytes for a in arrays) + text_bytes + row_bytes
+
+
+class ComparablesIndex:
+    """
+    Answers comparable searches from memory.
+
+    `refresh()` loads available listings once, then only rows whose
+    `updated_at` changed since (see ChangeWatermark); listings that stop
+    being available are dropped. Queries use vectorized masks over per-city
+    numpy columns and kick off a background refresh when the data is older
+    than `refresh_seconds`. Until the first load completes `ready` is False and
+    callers should query the database instead.
+    """
+
+    def __init__(self, db_client: Client, refresh_seconds: int = DEFAULT_REFRESH_SECONDS):
+        self.db = db_client
+        self.refresh_seconds = refresh_seconds
+        self._cities: dict[str, _CityColumns] = {}
+        self._rows_by_city: dict[str, dict[Any, dict[str, Any]]] = {}
+        self._city_of: dict[Any, str] = {}
+        self._watermark = ChangeWatermark()
+        self._refreshed_at: float | None = None
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+
+    @property
+    def ready(self) -> bool:
+        return self._refreshed_at is not None
+
+    def _fetch_changes(self) -> list[dict[str, Any]]:
+        since = self._watermark.since()
+
+        def where(query: Any) -> Any:
+            if since is None:
+                return query.eq("status", "available")
+            return query.gte("updated_at", since)
+
+        return list(
+            iter_rows(
+                self.db,
+                "properties",
+                INDEX_COLUMNS,
+                where=where,
+                key="updated_at",
+                page_size=PAGE_SIZE,
+            )
+        )
+
+    def refresh(self) -> int:
+        """Applies inventory changes since the last refresh; returns rows applied."""
+        with self._refresh_lock:
+            started = time.perf_counter()
+            changes = self._watermark.accept(self._fetch_changes())
+            touched: set[str] = set()
+            for row in changes:
+                row_id = row.get("id")
+                previous = self._city_of.pop(row_id, None)
+                if previous:
+                    self._rows_by_city[previous].pop(row_id, None)
+                    touched.add(previous)
+                city = row.get("city")
+                if row.get("status") == "available" and city:
+                    kept = {field: row.get(field) for field in ROW_FIELDS}
+                    kept["title"] = (kept["title"] or "")[:TITLE_MAX_LENGTH]
+                    kept["description"] = (kept["description"] or "")[:DESC_MAX_LENGTH]
+                    kept["search_text"] = row.get("search_text")
+                    self._rows_by_city.setdefault(city, {})[row_id] = kept
+                    self._city_of[row_id] = city
+                    touched.add(city)
+
+            # Copy-on-write so concurrent readers keep a consistent snapshot
+            cities = dict(self._cities)
+            for city in touched:
+                rows = [dict(r) for r in self._rows_by_city.get(city, {}).values()]
+                if rows:
+                    cities[city] = _CityColumns(rows)
+                else:
+                    cities.pop(city, None)
+            self._cities = cities
+            self._refreshed_at = time.time()
+
+            stats = self.stats()
+            comparables_index_rows.set(stats["rows"])
+            comparables_index_memory_bytes.set(stats["memory_bytes"])
+            logger.info(
+                "COMPARABLES_INDEX_REFRESHED",
+                context={
+                    "changes": len(changes),
+                    "cities_rebuilt": len(touched),
+                    "refresh_seconds": round(time.perf_counter() - started, 3),
+                    **stats,
+                },
+            )
+            return len(changes)
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning("COMPARABLES_INDEX_REFRESH_FAILED", context={"error": str(e)})
+        finally:
+            self._refreshing = False
+
+    def _maybe_refresh(self) -> None:
+        lag = self.refresh_lag_seconds
+        comparables_index_refresh_lag_seconds.set(lag or 0)
+        if lag is not None and lag > self.refresh_seconds and not self._refreshing:
+            self._refreshing = True
+            threading.Thread(
+                target=self._refresh_in_background, name="comparables-index", daemon=True
+            ).start()
+
+    @property
+    def refresh_lag_seconds(self) -> float | None:
+        return None if self._refreshed_at is None else time.time() - self._refreshed_at
+
+    def candidates(
+        self,
+        city: str,
+        *,
+        zone_slug: str | None = None,
+        property_type: str | None = None,
+        sqm_range: tuple[int, int] | None = None,
+        text: str | None = None,
+        condition: str | None = None,
+        limit: int = 40,
+    ) -> list[dict[str, Any]]:
+        """
+        Plausibly priced listings matching the filters.
+
+        When more than `limit` match, the ones closest to the middle of
+        `sqm_range` are kept, then those closest to `condition`.
+        """
+        self._maybe_refresh()
+        columns = self._cities.get(city)
+        if columns is None:
+            return []
+
+        mask = columns.plausible.copy()
+        if zone_slug:
+            mask &= columns.zone_codes == columns.zones.get(zone_slug, -2)
+        if property_type:
+            mask &= columns.type_codes == columns.types.get(property_type, -2)
+        if sqm_range:
+            mask &= (columns.sqm >= sqm_range[0]) & (columns.sqm <= sqm_range[1])
+        if text:
+            mask &= columns.text_mask(text)
+
+        matches = np.flatnonzero(mask)
+        if len(matches) > limit:
+            keys = []
+            target = condition_rank(condition)
+            if target is not None:
+                codes = columns.condition[matches]
+                keys.append(
+                    np.where(
+                        codes == UNKNOWN_CONDITION, len(CONDITION_SCALE), np.abs(codes - target)
+                    )
+                )
+            if sqm_range:
+                middle = (sqm_range[0] + sqm_range[1]) / 2
+                keys.append(np.abs(columns.sqm[matches] - middle))
+            if keys:
+                # lexsort sorts by the last key first
+                matches = matches[np.lexsort(keys)]
+        return [dict(columns.rows[i]) for i in matches[:limit]]
+
+    def stats(self) -> dict[str, Any]:
+        cities = self._cities
+        lag = self.refresh_lag_seconds
+        latest = self._watermark.latest
+        return {
+            "ready": self.ready,
+            "cities": len(cities),
+            "rows": sum(len(c.rows) for c in cities.values()),
+            "memory_bytes": sum(c.nbytes for c in cities.values()),
+            "refresh_lag_seconds": round(lag, 1) if lag is not None else None,
+            "watermark": latest.isoformat() if latest else None,
+        }
@@ -0,0 +1,116 @@
+import hashlib
+import json
+
+from config.settings import settings
+from domain.ports import AIPort, CachePort
+from infrastructure.cache.memory_cache import BoundedTTLCache
+from infrastructure.cache.single_flight import SingleFlight
+from infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600  # Embeddings only change with the model
+DEFAULT_BATCH_SIZE = 64
+
+
+class EmbeddingService:
+    """
+    Single entry point for text embeddings.
+
+    Vectors are keyed by a hash of the model name and text and looked up in a
+    process-local BoundedTTLCache, then in the shared cache (Redis) before
+    calling the AI port. Concurrent requests for the same text share one
+    in-flight call (SingleFlight), and `embed_many` sends all misses to the
+    provider in batches.
+    """
+
+    def __init__(
+        self,
+        ai: AIPort,
+        cache: CachePort | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: int = DEFAULT_TTL_SECONDS,
+    ):
+        self.ai = ai
+        self.cache = cache
+        self.ttl = ttl
+        self._local = BoundedTTLCache(
+            max_entries=max_entries, default_ttl=ttl, cache_type="embedding"
+        )
+        self._flight = SingleFlight("embedding")
+
+    @staticmethod
+    def cache_key(text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"embedding:{settings.MISTRAL_EMBEDDING_MODEL}:{digest}"
+
+    def _get_shared(self, key: str) -> list[float] | None:
+        if not self.cache:
+            return None
+        cached = self.cache.get(key)
+        if not cached:
+            return None
+        try:
+            vector: list[float] = json.loads(cached)
+        except ValueError:
+            return None
+        self._local.set(key, vector)
+        return vector
+
+    def _store(self, key: str, vector: list[float]) -> None:
+        self._local.set(key, vector)
+        if self.cache:
+            self.cache.set(key, json.dumps(vector), ttl=self.ttl)
+
+    def embed(self, text: str) -> list[float]:
+        """Returns the embedding for `text`, computing it at most once across callers."""
+        key = self.cache_key(text)
+        vector: list[float] | None = self._local.get(key)
+        if vector is not None:
+            return vector
+
+        def compute() -> list[float]:
+            shared = self._get_shared(key)
+            if shared is not None:
+                return shared
+            fresh = self.ai.get_embedding(text)
+            self._store(key, fresh)
+            return fresh
+
+        # Concurrent callers for the same text share one lookup and provider call
+        return self._flight.run(key, compute)
+
+    def embed_many(
+        self, texts: list[str], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> list[list[float]]:
+        """Embeds `texts` in order, sending only cache misses to the provider in batches."""
+        keys = [self.cache_key(text) for text in texts]
+        vectors: dict[str, list[float]] = {}
+        misses: dict[str, str] = {}
+        for key, text in zip(keys, texts, strict=True):
+            if key in vectors or key in misses:
+                continue
+            vector = self._local.get(key) or self._get_shared(key)
+            if vector is not None:
+                vectors[key] = vector
+            else:
+                misses[key] = text
+
+        miss_keys = list(misses)
+        for start in range(0, len(miss_keys), batch_size):
+            batch = miss_keys[start : start + batch_size]
+            results = self.ai.get_embeddings([misses[key] for key in batch])
+            for key, vector in zip(batch, results, strict=True):
+                self._store(key, vector)
+                vectors[key] = vector
+
+        logger.info(
+            "EMBEDDINGS_BATCH",
+            context={
+                "texts": len(texts),
+                "cached": len(vectors) - len(misses),
+                "computed": len(misses),
+            },
+        )
+        return [vectors[key] for key in keys]
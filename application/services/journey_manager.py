@@ -22,7 +22,7 @@ class JourneyManager:
     ) -> None:
         logger.info("JOURNEY_TRANSITION", context={"phone": phone, "to": target_state})
 
-        lead = self.db.get_lead(phone)
+        lead = self.db.get_lead(phone, message_limit=0)
         if not lead:
             return
 
@@ -99,7 +99,7 @@ class JourneyManager:
             self.msg.send_message(phone, msg_body, media_url=media_url)
 
             # Record interest in DB
-            lead_data = self.db.get_lead(phone)
+            lead_data = self.db.get_lead(phone, message_limit=0)
             if lead_data:
                 metadata = lead_data.get("metadata") or {}
                 if not isinstance(metadata, dict):
@@ -3,6 +3,7 @@ import re
 from datetime import UTC, datetime
 from typing import Any, cast
 
+from application.services.embedding_service import EmbeddingService
 from domain.enums import LeadStatus
 from domain.ports import (
     AIPort,
@@ -14,6 +15,7 @@ from domain.ports import (
     ScraperPort,
 )
 from domain.services.logging import get_logger
+from infrastructure.cache.lead_cache import lead_request_scope
 
 logger = get_logger(__name__)
 
@@ -77,6 +79,7 @@ class LeadProcessor:
         email: EmailPort | None = None,
         validation: Any = None,
         routing: Any = None,
+        embeddings: EmbeddingService | None = None,
     ):
         self.db = db
         from application.workflows.agents import create_lead_processing_graph
@@ -94,7 +97,7 @@ class LeadProcessor:
 
         # The graph creation expects the ports
         self.graph = create_lead_processing_graph(
-            db, ai, msg, journey, scraper, market, calendar, validation
+            db, ai, msg, journey, scraper, market, calendar, validation, embeddings=embeddings
         )
 
     SIMILARITY_THRESHOLD = 0.78
@@ -125,28 +128,31 @@ class LeadProcessor:
         }
 
         try:
-            result = self.graph.invoke(inputs)
-
-            # Routing: Assign to agent if configured
-            if self.routing:
-                try:
-                    lead_data = self.db.get_lead(phone)
-                    if lead_data and not lead_data.get("assigned_agent_id"):
-                        from domain.models import Lead
-
-                        lead_obj = Lead(
-                            id=lead_data["id"],
-                            phone=phone,
-                            postcode=postcode or lead_data.get("postcode"),
+            with lead_request_scope():
+                result = self.graph.invoke(inputs)
+
+                # Routing: Assign to agent if configured
+                if self.routing:
+                    try:
+                        lead_data = self.db.get_lead(phone, message_limit=0)
+                        if lead_data and not lead_data.get("assigned_agent_id"):
+                            from domain.models import Lead
+
+                            lead_obj = Lead(
+                                id=lead_data["id"],
+                                phone=phone,
+                                postcode=postcode or lead_data.get("postcode"),
+                            )
+                            agent_id = self.routing.assign_lead(lead_obj)
+                            if agent_id:
+                                self.db.assign_lead_to_agent(lead_data["id"], agent_id)
+                    except Exception as ex:
+                        logger.error(
+                            "ROUTING_STEP_FAILED", context={"phone": phone, "error": str(ex)}
                         )
-                        agent_id = self.routing.assign_lead(lead_obj)
-                        if agent_id:
-                            self.db.assign_lead_to_agent(lead_data["id"], agent_id)
-                except Exception as ex:
-                    logger.error("ROUTING_STEP_FAILED", context={"phone": phone, "error": str(ex)})
-
-            # Side effects (messaging, persistence) are handled by finalize_node in agents.py
-            return cast(str, result.get("ai_response", ""))
+
+                # Side effects (messaging, persistence) are handled by finalize_node in agents.py
+                return cast(str, result.get("ai_response", ""))
         except Exception as e:
             logger.error("PROCESS_LEAD_GRAPH_FAILED", context={"phone": phone, "error": str(e)})
             return (
@@ -245,7 +251,7 @@ class LeadProcessor:
         channel: str = "whatsapp",
         metadata: dict[str, Any] | None = None,
     ) -> None:
-        lead = self.db.get_lead(phone)
+        lead = self.db.get_lead(phone, message_limit=0)
         if not lead:
             return
 
@@ -391,17 +397,23 @@ class LeadProcessor:
             inputs["context_data"] = context
 
         try:
-            # Pre-save message to history if it has media, even before graph runs
-            # This ensures it shows up in dashboard immediately
-            if media_url:
-                self.add_message_history(
-                    phone, "user", text or "Media received", media_url=media_url, channel=channel
-                )
+            # One lead fetch serves the whole message (graph, history, brochure)
+            with lead_request_scope():
+                # Pre-save message to history if it has media, even before graph runs
+                # This ensures it shows up in dashboard immediately
+                if media_url:
+                    self.add_message_history(
+                        phone,
+                        "user",
+                        text or "Media received",
+                        media_url=media_url,
+                        channel=channel,
+                    )
 
-            result = self.graph.invoke(inputs)
-            # 3. Handle Side Effects (like sending brochures)
-            self.send_brochure_if_interested(phone, text)
-            return str(result.get("ai_response", ""))
+                result = self.graph.invoke(inputs)
+                # 3. Handle Side Effects (like sending brochures)
+                self.send_brochure_if_interested(phone, text)
+                return str(result.get("ai_response", ""))
         except Exception as e:
             logger.error("GRAPH_INVOCATION_FAILED", context={"phone": phone, "error": str(e)})
             return ""
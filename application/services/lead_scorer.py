@@ -159,6 +159,8 @@ class LeadScorer:
         }
 
         self.db.client.table("leads").update(update_data).eq("id", str(lead_id)).execute()
+        if self.db.lead_cache:
+            self.db.lead_cache.apply_update_by_id(str(lead_id), update_data)
 
         return {
             "lead_id": str(lead_id),
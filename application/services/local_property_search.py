@@ -7,7 +7,18 @@ from typing import Any, cast
 
 from supabase import Client
 
+from application.services.comparable_ranking import (
+    RankedComparable,
+    price_per_sqm,
+    rank_comparables,
+)
+from application.services.comparables_index import ComparablesIndex
 from domain.appraisal import Comparable
+from domain.property_search import (
+    normalize_city,
+    normalize_property_type,
+    zone_slug,
+)
 from infrastructure.logging import get_logger
 
 logger = get_logger(__name__)
@@ -15,37 +26,40 @@ logger = get_logger(__name__)
 # Constants for maintainability
 SIZE_RANGE_BUFFER = 0.20  # +/- 20% on square meters
 MAX_RESULTS_LIMIT = 10
-MIN_PRICE_PER_SQM = 500
-MAX_PRICE_PER_SQM = 15000
+CANDIDATE_POOL_LIMIT = 40  # Rows fetched per search step, before ranking
 TITLE_MAX_LENGTH = 100
 DESC_MAX_LENGTH = 300
 
-# City Normalization Mapping
-CITY_VARIANTS = {
-    "florence": "Firenze",
-    "firenze": "Firenze",
-    "siena": "Siena",
-    "pisa": "Pisa",
-    "lucca": "Lucca",
-    "arezzo": "Arezzo",
-    "grosseto": "Grosseto",
-    "livorno": "Livorno",
-    "milan": "Milano",
-    "milano": "Milano",
-    "rome": "Roma",
-    "roma": "Roma",
-    "naples": "Napoli",
-    "napoli": "Napoli",
-    "venice": "Venezia",
-    "venezia": "Venezia",
-}
+# Search radius, widened step by step until enough plausible candidates are found:
+# (restrict to the requested zone, +/- sqm buffer)
+SEARCH_STEPS = [
+    (True, SIZE_RANGE_BUFFER),
+    (True, 0.35),
+    (False, 0.35),
+    (False, 0.50),
+]
+
+# Columns needed to rank and build comparables
+COMPARABLE_COLUMNS = (
+    "id, title, description, price, sqm, zone_slug, condition, updated_at, created_at"
+)
+LEGACY_COLUMNS = "id, title, description, price, sqm, updated_at, created_at"
+
+# PostgREST error for a column the migration hasn't added yet
+UNDEFINED_COLUMN = "42703"
 
 
 class LocalPropertySearchService:
-    """Service to search for comparable properties in the local database."""
+    """
+    Service to search for comparable properties in the local database.
 
-    def __init__(self, db_client: Client):
+    With a warm `index`, candidate lookups are answered in memory and the
+    database is only queried before the index's first load.
+    """
+
+    def __init__(self, db_client: Client, index: ComparablesIndex | None = None):
         self.db = db_client
+        self.index = index
 
     def search_local_comparables(
         self,
@@ -54,75 +68,57 @@ class LocalPropertySearchService:
         property_type: str | None = None,
         surface_sqm: int | None = None,
         min_comparables: int = 3,
+        *,
+        condition: str | None = None,
     ) -> list[Comparable]:
         """
         Search for properties in the local database.
+
+        Candidates are ranked by similarity to the subject property and the
+        best MAX_RESULTS_LIMIT are returned.
         """
         try:
-            # 1. Normalize City Name
-            normalized_city = CITY_VARIANTS.get(city.lower(), city)
-
-            # 2. Build Query
-            query = self.db.table("properties").select("*").eq("status", "available")
-
-            if normalized_city:
-                query = query.ilike("description", f"%{normalized_city}%")
-
-            if zone:
-                query = query.ilike("description", f"%{zone}%")
-
-            if property_type:
-                # Basic mapping for property types if needed
-                query = query.ilike("title", f"%{property_type}%")
+            # 1. Normalize search keys (same helpers used at ingest time)
+            normalized_city = normalize_city(city) or city
 
-            if surface_sqm:
-                min_sqm = int(surface_sqm * (1 - SIZE_RANGE_BUFFER))
-                max_sqm = int(surface_sqm * (1 + SIZE_RANGE_BUFFER))
-                query = query.gte("sqm", min_sqm).lte("sqm", max_sqm)
+            # 2. Gather candidates, widening the search radius as needed
+            try:
+                candidates = self._gather_candidates(
+                    normalized_city,
+                    zone,
+                    property_type,
+                    surface_sqm,
+                    min_comparables,
+                    condition=condition,
+                )
+            except Exception as e:
+                if UNDEFINED_COLUMN not in str(e):
+                    raise
+                logger.warning("LOCAL_SEARCH_LEGACY_SCHEMA", context={"error": str(e)})
+                candidates = self._search_legacy(normalized_city, zone, property_type, surface_sqm)
 
-            # 3. Execute Search
-            result = query.limit(MAX_RESULTS_LIMIT).execute()
-
-            properties = result.data
-            if not properties or not isinstance(properties, list):
+            if not candidates:
                 logger.info("LOCAL_SEARCH_NO_RESULTS")
                 return []
 
-            # 4. Filter and Transform
-            comparables = []
-            for prop_data in properties:
-                prop = cast(dict[str, Any], prop_data)
-                try:
-                    price = prop.get("price")
-                    sqm = prop.get("sqm")
-
-                    if price and sqm and sqm > 0:
-                        price_per_sqm = float(price) / float(sqm)
-
-                        if MIN_PRICE_PER_SQM < price_per_sqm < MAX_PRICE_PER_SQM:
-                            comparables.append(
-                                Comparable(
-                                    title=cast(str, prop.get("title", "Property"))[
-                                        :TITLE_MAX_LENGTH
-                                    ],
-                                    price=float(price),
-                                    surface_sqm=int(sqm),
-                                    price_per_sqm=round(price_per_sqm, 0),
-                                    description=cast(str, prop.get("description", ""))[
-                                        :DESC_MAX_LENGTH
-                                    ],
-                                )
-                            )
-                except (KeyError, ValueError, TypeError) as e:
-                    logger.debug(f"Skipping invalid property: {e}")
-                    continue
+            # 3. Rank and Transform
+            ranked = rank_comparables(
+                candidates,
+                target_sqm=surface_sqm,
+                zone_slug=zone_slug(zone),
+                condition=condition,
+                k=MAX_RESULTS_LIMIT,
+            )
+            comparables = [self._to_comparable(r) for r in ranked]
 
             logger.info(
                 "LOCAL_SEARCH_COMPLETE",
                 context={
                     "found": len(comparables),
+                    "candidates": len(candidates),
                     "city": normalized_city,
                     "zone": zone,
+                    "best_score": ranked[0].score if ranked else None,
                 },
             )
 
@@ -131,3 +127,143 @@ class LocalPropertySearchService:
         except Exception as e:
             logger.error("LOCAL_SEARCH_ERROR", context={"error": str(e)})
             return []
+
+    def _gather_candidates(
+        self,
+        city: str,
+        zone: str | None,
+        property_type: str | None,
+        surface_sqm: int | None,
+        min_comparables: int,
+        *,
+        condition: str | None = None,
+    ) -> list[dict[str, Any]]:
+        pool: dict[Any, dict[str, Any]] = {}
+        tried: set[tuple[bool, float | None]] = set()
+        for same_zone, size_buffer in SEARCH_STEPS:
+            if same_zone and not zone:
+                continue
+            step = (same_zone, size_buffer if surface_sqm else None)
+            if step in tried:
+                continue
+            tried.add(step)
+
+            step_zone = zone if same_zone else None
+            rows = self._search_indexed(
+                city, step_zone, property_type, surface_sqm, size_buffer, condition=condition
+            )
+            if step_zone and len(rows) < min_comparables:
+                rows += self._search_text(
+                    city, step_zone, property_type, surface_sqm, size_buffer, condition=condition
+                )
+            for row in rows:
+                pool.setdefault(row.get("id") or id(row), row)
+
+            plausible = sum(1 for prop in pool.values() if price_per_sqm(prop) is not None)
+            if plausible >= min_comparables:
+                break
+            logger.info(
+                "LOCAL_SEARCH_WIDENING",
+                context={"same_zone": same_zone, "size_buffer": size_buffer, "found": plausible},
+            )
+        return list(pool.values())
+
+    @staticmethod
+    def _sqm_range(surface_sqm: int | None, size_buffer: float) -> tuple[int, int] | None:
+        if not surface_sqm:
+            return None
+        return int(surface_sqm * (1 - size_buffer)), int(surface_sqm * (1 + size_buffer))
+
+    def _base_query(self, surface_sqm: int | None, size_buffer: float, columns: str) -> Any:
+        query = self.db.table("properties").select(columns).eq("status", "available")
+        sqm_range = self._sqm_range(surface_sqm, size_buffer)
+        if sqm_range:
+            query = query.gte("sqm", sqm_range[0]).lte("sqm", sqm_range[1])
+        return query
+
+    def _search_indexed(
+        self,
+        city: str,
+        zone: str | None,
+        property_type: str | None,
+        surface_sqm: int | None,
+        size_buffer: float = SIZE_RANGE_BUFFER,
+        *,
+        condition: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Equality on (city, zone_slug, property_type) plus the sqm range: one index scan."""
+        if self.index and self.index.ready:
+            return self.index.candidates(
+                city,
+                zone_slug=zone_slug(zone),
+                property_type=normalize_property_type(property_type),
+                sqm_range=self._sqm_range(surface_sqm, size_buffer),
+                condition=condition,
+                limit=CANDIDATE_POOL_LIMIT,
+            )
+        query = self._base_query(surface_sqm, size_buffer, COMPARABLE_COLUMNS).eq("city", city)
+        slug = zone_slug(zone)
+        if slug:
+            query = query.eq("zone_slug", slug)
+        canonical_type = normalize_property_type(property_type)
+        if canonical_type:
+            query = query.eq("property_type", canonical_type)
+        return cast(list[dict[str, Any]], query.limit(CANDIDATE_POOL_LIMIT).execute().data or [])
+
+    def _search_text(
+        self,
+        city: str,
+        zone: str,
+        property_type: str | None,
+        surface_sqm: int | None,
+        size_buffer: float = SIZE_RANGE_BUFFER,
+        *,
+        condition: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Zone mentioned only in the listing text: trigram-indexed match on search_text."""
+        if self.index and self.index.ready:
+            return self.index.candidates(
+                city,
+                property_type=normalize_property_type(property_type),
+                sqm_range=self._sqm_range(surface_sqm, size_buffer),
+                text=zone.lower(),
+                condition=condition,
+                limit=CANDIDATE_POOL_LIMIT,
+            )
+        query = (
+            self._base_query(surface_sqm, size_buffer, COMPARABLE_COLUMNS)
+            .eq("city", city)
+            .ilike("search_text", f"%{zone.lower()}%")
+        )
+        canonical_type = normalize_property_type(property_type)
+        if canonical_type:
+            query = query.eq("property_type", canonical_type)
+        return cast(list[dict[str, Any]], query.limit(CANDIDATE_POOL_LIMIT).execute().data or [])
+
+    def _search_legacy(
+        self,
+        city: str,
+        zone: str | None,
+        property_type: str | None,
+        surface_sqm: int | None,
+    ) -> list[dict[str, Any]]:
+        """Substring search for databases that predate the search columns."""
+        query = self._base_query(surface_sqm, SIZE_RANGE_BUFFER, LEGACY_COLUMNS).ilike(
+            "description", f"%{city}%"
+        )
+        if zone:
+            query = query.ilike("description", f"%{zone}%")
+        if property_type:
+            query = query.ilike("title", f"%{property_type}%")
+        return cast(list[dict[str, Any]], query.limit(CANDIDATE_POOL_LIMIT).execute().data or [])
+
+    @staticmethod
+    def _to_comparable(ranked: RankedComparable) -> Comparable:
+        prop = ranked.prop
+        return Comparable(
+            title=cast(str, prop.get("title") or "Property")[:TITLE_MAX_LENGTH],
+            price=float(prop["price"]),
+            surface_sqm=int(prop["sqm"]),
+            price_per_sqm=round(ranked.price_per_sqm, 0),
+            description=cast(str, prop.get("description") or "")[:DESC_MAX_LENGTH],
+        )
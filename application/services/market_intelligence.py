@@ -1,8 +1,9 @@
 import json
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
 from domain.ports import AIPort, CachePort, DatabasePort
+from infrastructure.cache.single_flight import SingleFlight
 from infrastructure.logging import get_logger
 
 logger = get_logger(__name__)
@@ -13,6 +14,8 @@ class MarketIntelligenceService:
         self.db = db
         self.ai = ai
         self.cache = cache
+        # Concurrent misses for one city/zone share a single AI analysis
+        self._flight = SingleFlight("market_analysis")
 
     def get_market_analysis(self, city: str = "Milano", zone: str | None = None) -> dict[str, Any]:
         """
@@ -28,28 +31,27 @@ class MarketIntelligenceService:
                 except Exception:
                     pass
 
-        try:
-            # 1. Fetch data from Supabase
-            query = self.db.client.table("market_data").select("*").eq("city", city)  # type: ignore
-            if zone:
-                query = query.ilike("zone", f"%{zone}%")
-
-            res = query.order("created_at", desc=True).limit(100).execute()
-            data = res.data
+        return self._flight.run(cache_key, lambda: self._analyze(city, zone, cache_key))
 
-            if not data:
+    def _analyze(self, city: str, zone: str | None, cache_key: str) -> dict[str, Any]:
+        try:
+            # 1. Aggregate stats in the database
+            stats = self.db.get_market_aggregates(zone=zone, city=city)
+            if not stats["listings_count"]:
                 return {
                     "sentiment": "NEUTRAL",
                     "summary": "Dati insufficienti per generare un'analisi accurata.",
                     "stats": {"avg_price": 0, "count": 0},
                 }
+            avg_price = stats["avg_price_sqm"]
 
-            # 2. Aggregate stats
-            prices = [item["price_per_mq"] for item in data if item.get("price_per_mq")]
-            avg_price = sum(prices) / len(prices) if prices else 0
+            # 2. Only the latest listings are sent to the AI as a sample
+            query = self.db.client.table("market_data").select("*").eq("city", city)  # type: ignore
+            if zone:
+                query = query.ilike("zone", f"%{zone}%")
+            data_sample = query.order("created_at", desc=True).limit(10).execute().data
 
             # 3. AI Analysis Prompt
-            data_sample = data[:10]  # Sample for AI
             prompt = (
                 f"Analizza i seguenti dati di mercato immobiliare per {city} {f'zona {zone}' if zone else ''}.\n"
                 f"Dati: {json.dumps(data_sample)}\n"
@@ -74,10 +76,13 @@ class MarketIntelligenceService:
                 }
 
             analysis["stats"] = {
-                "avg_price": round(avg_price, 2),
-                "count": len(data),
-                "min_price": round(min(prices), 2) if prices else 0,
-                "max_price": round(max(prices), 2) if prices else 0,
+                "avg_price": avg_price,
+                "count": stats["listings_count"],
+                "min_price": stats["min_price_sqm"],
+                "max_price": stats["max_price_sqm"],
+                "median_price": stats["median_price_sqm"],
+                "p25_price": stats["p25_price_sqm"],
+                "p75_price": stats["p75_price_sqm"],
             }
 
             # Cache the result for 24 hours
@@ -95,37 +100,18 @@ class MarketIntelligenceService:
         Simple predictive logic based on recent data vs older data.
         """
         try:
-            # Fetch last 30 days vs previous 30 days
-            now = datetime.now()
-            thirty_days_ago = (now - timedelta(days=30)).isoformat()
-            sixty_days_ago = (now - timedelta(days=60)).isoformat()
-
-            # Recent
-            res_recent = (
-                self.db.client.table("market_data")  # type: ignore
-                .select("price_per_mq")
-                .eq("city", city)
-                .ilike("zone", f"%{zone}%")
-                .gte("created_at", thirty_days_ago)
-                .execute()
+            # Last 30 days vs previous 30 days, averaged in the database
+            now = datetime.now(UTC)
+            thirty_days_ago = now - timedelta(days=30)
+            sixty_days_ago = now - timedelta(days=60)
+
+            recent = self.db.get_market_aggregates(zone=zone, city=city, since=thirty_days_ago)
+            history = self.db.get_market_aggregates(
+                zone=zone, city=city, since=sixty_days_ago, until=thirty_days_ago
             )
 
-            # Historical
-            res_history = (
-                self.db.client.table("market_data")  # type: ignore
-                .select("price_per_mq")
-                .eq("city", city)
-                .ilike("zone", f"%{zone}%")
-                .gte("created_at", sixty_days_ago)
-                .lt("created_at", thirty_days_ago)
-                .execute()
-            )
-
-            recent_prices = [r["price_per_mq"] for r in res_recent.data if r.get("price_per_mq")]
-            history_prices = [r["price_per_mq"] for r in res_history.data if r.get("price_per_mq")]
-
-            avg_recent = sum(recent_prices) / len(recent_prices) if recent_prices else 0
-            avg_history = sum(history_prices) / len(history_prices) if history_prices else 0
+            avg_recent = float(recent["avg_price_sqm"] or 0)
+            avg_history = float(history["avg_price_sqm"] or 0)
 
             trend = "STABLE"
             change_pct = 0
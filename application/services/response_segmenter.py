@@ -0,0 +1,44 @@
+import re
+
+# Sentence end followed by whitespace, or a blank line (paragraph break)
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?…])\s+|\n\s*\n")
+
+DEFAULT_MIN_SEGMENT_CHARS = 160
+
+
+class SentenceSegmenter:
+    """
+    Splits a streamed LLM response into sendable WhatsApp segments.
+
+    A segment is released at the last sentence boundary once at least
+    `min_chars` have accumulated, or at any paragraph break, so users get
+    complete sentences without a flood of one-line messages.
+    """
+
+    def __init__(self, min_chars: int = DEFAULT_MIN_SEGMENT_CHARS):
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, delta: str) -> list[str]:
+        """Adds streamed text and returns any segments that are now complete."""
+        self._buffer += delta
+        segments: list[str] = []
+        while True:
+            cut = None
+            for match in SENTENCE_BOUNDARY.finditer(self._buffer):
+                is_paragraph = match.group().count("\n") >= 2
+                if is_paragraph or match.start() >= self.min_chars:
+                    cut = match
+                    if is_paragraph:
+                        break
+            if cut is None:
+                return segments
+            segment = self._buffer[: cut.start()].strip()
+            self._buffer = self._buffer[cut.end() :]
+            if segment:
+                segments.append(segment)
+
+    def flush(self) -> str:
+        """Returns whatever is left once the stream has ended."""
+        tail, self._buffer = self._buffer.strip(), ""
+        return tail
@@ -1,13 +1,20 @@
 import re
+import threading
+import time
+import zlib
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
-from typing import Any, Literal, TypedDict, cast
+from typing import Annotated, Any, Literal, TypedDict, cast
 
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_mistralai import ChatMistralAI
 from langgraph.graph import END, START, StateGraph
 from pydantic import BaseModel, Field, SecretStr
 
+from application.services.embedding_service import EmbeddingService
 from application.services.lead_scoring_service import LeadScoringService
+from application.services.response_segmenter import SentenceSegmenter
 from config.settings import settings
 from domain.enums import LeadStatus
 from domain.handoff import HandoffReason, HandoffRequest
@@ -67,6 +74,33 @@ class SentimentAnalysis(BaseModel):
     notes: str = Field(description="Brief explanation of the mood.")
 
 
+class MessageUnderstanding(BaseModel):
+    """Intent, preferences and sentiment extracted together in one LLM call."""
+
+    intent: IntentExtraction
+    preferences: PropertyPreferences
+    sentiment: SentimentAnalysis
+
+
+UNDERSTANDING_PARTS: dict[str, type[BaseModel]] = {
+    "intent": IntentExtraction,
+    "preferences": PropertyPreferences,
+    "sentiment": SentimentAnalysis,
+}
+
+
+# Independent analysis steps that run as concurrent graph branches. Sentiment
+# runs before them: a handoff turn skips the market query and the embedding.
+ANALYSIS_BRANCHES = ["preferences", "market_analysis", "cache_check"]
+
+
+def _merge_timings(
+    left: dict[str, float] | None, right: dict[str, float] | None
+) -> dict[str, float]:
+    """Reducer so concurrent branches can each report their own timing."""
+    return {**(left or {}), **(right or {})}
+
+
 class AgentState(TypedDict):
     """The state of our lead processing graph."""
 
@@ -96,6 +130,27 @@ class AgentState(TypedDict):
     qualification_data: dict[str, Any]  # Serialized QualificationData
     lead_score: dict[str, Any]  # Serialized LeadScore
     interactive_message: InteractiveMessage | None  # New field for button/list payloads
+    extracted: list[str]  # Parts already filled by the combined extraction call
+    node_timings: Annotated[dict[str, float], _merge_timings]  # Wall time per node (ms)
+    sent_sids: list[str | None]  # Set when generation already delivered the reply in segments
+
+
+def _handoff_requested(state: AgentState) -> bool:
+    """True if the user is ANGRY or explicitly asking for a human."""
+    if state["sentiment"].sentiment == "ANGRY":
+        return True
+    # Simple keyword check backup
+    text = state["user_input"].lower()
+    return "human" in text or "agent" in text
+
+
+def _sends_property_list(state: AgentState) -> bool:
+    """True if finalize_node will deliver the reply as an interactive list of matches."""
+    return bool(
+        state["source"] == "WHATSAPP"
+        and state.get("retrieved_properties")
+        and "list" not in state["status_msg"]  # Avoid loops
+    )
 
 
 def create_lead_processing_graph(
@@ -107,13 +162,63 @@ def create_lead_processing_graph(
     market: Any = None,
     calendar: CalendarPort | None = None,
     validation: Any = None,
+    embeddings: EmbeddingService | None = None,
 ) -> Any:
-    def ingest_node(state: AgentState) -> dict[str, Any]:
+    # One embedding per turn: cache_check computes it, retrieval/finalize reuse state["embedding"]
+    embedder = embeddings or EmbeddingService(ai)
+
+    from infrastructure.metrics import graph_node_duration_seconds
+
+    fallback_llm: list[Any] = []
+    fallback_lock = threading.Lock()
+
+    def _chat_model() -> Any:
+        """
+        The chat model shared by every node.
+
+        Prefers the AI port's own client (LangChainAdapter.llm); otherwise builds
+        one ChatMistralAI on the pooled HTTP client, once per graph.
+        """
+        llm = getattr(ai, "llm", None)
+        if llm and hasattr(llm, "with_structured_output"):
+            return llm
+        # Branches run on worker threads, so guard the one-time construction
+        with fallback_lock:
+            if not fallback_llm:
+                from infrastructure.http_pool import MISTRAL_BASE_URL, http_pool
+
+                fallback_llm.append(
+                    ChatMistralAI(
+                        api_key=SecretStr(settings.MISTRAL_API_KEY),
+                        model_name=settings.MISTRAL_MODEL,
+                        endpoint=MISTRAL_BASE_URL,
+                        client=http_pool.mistral_client(),
+                        async_client=http_pool.mistral_async_client(),
+                    )
+                )
+            return fallback_llm[0]
+
+    def _timed(
+        name: str, node: Callable[[AgentState], dict[str, Any]]
+    ) -> Callable[[AgentState], dict[str, Any]]:
+        """Wraps a node so its wall time lands in state['node_timings'] and Prometheus."""
+
+        def timed_node(state: AgentState) -> dict[str, Any]:
+            start = time.perf_counter()
+            update = node(state)
+            elapsed = time.perf_counter() - start
+            graph_node_duration_seconds.labels(node=name).observe(elapsed)
+            return {**update, "node_timings": {name: round(elapsed * 1000, 1)}}
+
+        return timed_node
+
+    def ingest_node(state: AgentState) -> dict[str, Any]:  # noqa: PLR0912
         """Fetch lead data and prepare basic state."""
         phone = state["phone"]
         name = state.get("name")
         postcode = state.get("postcode")
-        lead = db.get_lead(phone)
+        # Only the recent history is used for context, so fetch just that
+        lead = db.get_lead(phone, message_limit=settings.MAX_CONTEXT_MESSAGES)
 
         if not lead:
             lead = {
@@ -128,8 +233,12 @@ def create_lead_processing_graph(
                 "created_at": datetime.now(UTC).isoformat(),
                 "updated_at": datetime.now(UTC).isoformat(),
             }
-            db.save_lead(lead)
-            lead = db.get_lead(phone) or lead
+            saved = db.save_lead(lead)
+            # save_lead returns the stored row, so a new lead needs no re-fetch
+            if isinstance(saved, dict) and saved.get("id"):
+                lead = {**lead, **saved, "messages": [], "message_count": 0}
+            else:
+                lead = db.get_lead(phone, message_limit=settings.MAX_CONTEXT_MESSAGES) or lead
         # Update name if provided and missing
         elif name and not lead.get("customer_name"):
             db.save_lead({"customer_phone": phone, "customer_name": name})
@@ -244,16 +353,16 @@ def create_lead_processing_graph(
             from infrastructure.ml.feature_engineering import (
                 extract_property_features,
             )
-            from infrastructure.ml.xgboost_adapter import XGBoostAdapter
+            from infrastructure.ml.model_server import model_server
 
             # 1. Extract features from user input
             features = extract_property_features(
                 description=state["user_input"], address=state["lead_data"].get("address")
             )
 
-            # 2. ML Prediction (Model Simulator for Week 3)
-            adapter = XGBoostAdapter()
-            prediction = adapter.predict(features)
+            # 2. ML Prediction against the process-wide warm model
+            adapter = model_server.adapter
+            prediction = model_server.predict(features)
 
             # 3. Find comparables for uncertainty estimation
             # We use existing retrieved properties if any, or fetch new ones
@@ -405,15 +514,8 @@ def create_lead_processing_graph(
 
             logger.info("PARSING_QUALIFICATION_ANSWER", context={"field": field})
 
-            from pydantic import SecretStr
-
             # Use LLM to extract structured answer
-            extracted_value = _extract_qualification_field(
-                field,
-                answer_text,
-                SecretStr(settings.MISTRAL_API_KEY),
-                settings.MISTRAL_MODEL,
-            )
+            extracted_value = _extract_qualification_field(field, answer_text, _chat_model())
 
             # Update Domain Object
             setattr(qual_data, field, extracted_value)
@@ -487,24 +589,69 @@ def create_lead_processing_graph(
                 "checkpoint": "done",
             }
 
+    def _understand_message(state: AgentState) -> dict[str, BaseModel]:
+        """
+        Extracts intent, preferences and sentiment in one structured call.
+
+        Returns only the parts that validated; the per-field nodes fill in the rest.
+        """
+        llm_to_use = _chat_model().with_structured_output(MessageUnderstanding, include_raw=True)
+        prompt = ChatPromptTemplate.from_messages(
+            [
+                (
+                    "system",
+                    "Extract the user's intent and budget, their property preferences "
+                    "(from the history and latest message) and their sentiment and urgency. "
+                    "Language: Italian/English.",
+                ),
+                ("human", "History: {history}\nLatest: {input}"),
+            ]
+        )
+
+        start = time.perf_counter()
+        try:
+            result = llm_to_use.invoke(
+                prompt.format(history=state.get("history_text", ""), input=state["user_input"])
+            )
+        except Exception as e:
+            logger.warning("COMBINED_EXTRACTION_FAILED", context={"error": str(e)})
+            return {}
+
+        parsed = result.get("parsed") if isinstance(result, dict) else result
+        if isinstance(parsed, MessageUnderstanding):
+            parts: dict[str, BaseModel] = {
+                name: getattr(parsed, name) for name in UNDERSTANDING_PARTS
+            }
+        else:
+            parts = _validate_understanding_parts(
+                result.get("raw") if isinstance(result, dict) else None
+            )
+
+        logger.info(
+            "COMBINED_EXTRACTION",
+            context={
+                "phone": state["phone"],
+                "parts": sorted(parts),
+                "fallback_parts": sorted(set(UNDERSTANDING_PARTS) - set(parts)),
+                "duration_ms": round((time.perf_counter() - start) * 1000),
+            },
+        )
+        return parts
+
     def intent_node(state: AgentState) -> dict[str, Any]:  # noqa: PLR0912
         """Structured extraction of intent and entities using LLM."""
         text = state["user_input"]
         phone = state["phone"]
         lead = state["lead_data"]
 
-        # We prefer using the LLM directly if it's a LangChainAdapter for advanced features
-        # Otherwise we fallback to the port's generic invoke/generate if it supports structured output
-        # To maintain architectural purity, we check if the port provides an 'llm' object.
-
-        llm = getattr(ai, "llm", None)
-        if llm and hasattr(llm, "with_structured_output"):
-            llm_to_use = llm.with_structured_output(IntentExtraction)
-        else:
-            llm_to_use = ChatMistralAI(
-                api_key=SecretStr(settings.MISTRAL_API_KEY),
-                model_name=settings.MISTRAL_MODEL,
-            ).with_structured_output(IntentExtraction)
+        understood: dict[str, Any] = {}
+        if _use_combined_extraction(phone):
+            understood = _understand_message(state)
+        # Preferences/sentiment from the combined call; their nodes skip the LLM
+        understood_update: dict[str, Any] = {
+            name: part for name, part in understood.items() if name != "intent"
+        }
+        understood_update["extracted"] = sorted(understood)
 
         prompt = ChatPromptTemplate.from_messages(
             [
@@ -517,7 +664,10 @@ def create_lead_processing_graph(
         )
 
         try:
-            extraction = llm_to_use.invoke(prompt.format(input=text))
+            extraction = understood.get("intent")
+            if extraction is None:
+                llm_to_use = _chat_model().with_structured_output(IntentExtraction)
+                extraction = llm_to_use.invoke(prompt.format(input=text))
 
             # Journey Transition
             current_state = lead.get("journey_state") or LeadStatus.ACTIVE
@@ -558,29 +708,19 @@ def create_lead_processing_graph(
                 "entities": extraction.entities,
                 "lead_data": updated_lead,
                 "qualification_data": qual_update,
-            }
-
-            return {
-                "budget": extraction.budget or lead.get("budget_max"),
-                "intent": extraction.intent,
-                "entities": extraction.entities,
-                "lead_data": updated_lead,
+                **understood_update,
             }
         except Exception as e:
             logger.error("INTENT_EXTRACTION_FAILED", context={"error": str(e)})
             budget = _extract_budget(text)
-            return {"budget": budget or lead.get("budget_max")}
+            return {"budget": budget or lead.get("budget_max"), **understood_update}
 
     def preference_extraction_node(state: AgentState) -> dict[str, Any]:
         """Extract detailed property preferences from history and input."""
-        llm = getattr(ai, "llm", None)
-        if llm and hasattr(llm, "with_structured_output"):
-            llm_to_use = llm.with_structured_output(PropertyPreferences)
-        else:
-            llm_to_use = ChatMistralAI(
-                api_key=SecretStr(settings.MISTRAL_API_KEY),
-                model_name=settings.MISTRAL_MODEL,
-            ).with_structured_output(PropertyPreferences)
+        if "preferences" in (state.get("extracted") or []):
+            return {}
+
+        llm_to_use = _chat_model().with_structured_output(PropertyPreferences)
 
         prompt = ChatPromptTemplate.from_messages(
             [
@@ -603,14 +743,10 @@ def create_lead_processing_graph(
 
     def sentiment_analysis_node(state: AgentState) -> dict[str, Any]:
         """Analyze user sentiment and urgency."""
-        llm = getattr(ai, "llm", None)
-        if llm and hasattr(llm, "with_structured_output"):
-            llm_to_use = llm.with_structured_output(SentimentAnalysis)
-        else:
-            llm_to_use = ChatMistralAI(
-                api_key=SecretStr(settings.MISTRAL_API_KEY),
-                model_name=settings.MISTRAL_MODEL,
-            ).with_structured_output(SentimentAnalysis)
+        if "sentiment" in (state.get("extracted") or []):
+            return {}
+
+        llm_to_use = _chat_model().with_structured_output(SentimentAnalysis)
 
         prompt = ChatPromptTemplate.from_messages(
             [
@@ -666,13 +802,18 @@ def create_lead_processing_graph(
 
     def cache_check_node(state: AgentState) -> dict[str, Any]:
         """Check semantic cache."""
+        embedding = embedder.embed(state["user_input"])
+
         # Skip cache for Agency Demo flow to ensure personalized name/template
         if state.get("source") == "AGENCY_DEMO":
-            embedding = ai.get_embedding(state["user_input"])
             return {"embedding": embedding, "checkpoint": "continue"}
 
-        embedding = ai.get_embedding(state["user_input"])
-        cached = db.get_cached_response(embedding)
+        cached = db.get_cached_response(
+            embedding,
+            threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+            tenant_id=state["lead_data"].get("tenant_id"),
+            language=state.get("language"),
+        )
 
         if cached:
             return {"ai_response": cached, "checkpoint": "cache_hit", "embedding": embedding}
@@ -719,6 +860,64 @@ def create_lead_processing_graph(
 
         return {"retrieved_properties": valid_properties, "status_msg": status_msg}
 
+    def _send_segment(phone: str, segment: str) -> str | None:
+        try:
+            return msg.send_message(phone, segment)
+        except Exception as e:
+            logger.error("STREAM_SEGMENT_SEND_FAILED", context={"phone": phone, "error": str(e)})
+            return None
+
+    def _stream_response(state: AgentState, llm: Any, messages: Any) -> dict[str, Any]:
+        """
+        Streams the reply instead of waiting for the full completion.
+
+        Tokens are pushed to the lead's dashboard room as they arrive, and complete
+        sentences go out on WhatsApp straight away so finalize_node doesn't resend them.
+        """
+        phone = state["phone"]
+        # finalize_node sends property matches as one interactive list, so only plain replies go early
+        send_early = not _sends_property_list(state)
+        segmenter = SentenceSegmenter()
+        parts: list[str] = []
+        sids: list[str | None] = []
+
+        try:
+            for chunk in llm.stream(messages):
+                delta = str(chunk.content)
+                if not delta:
+                    continue
+                _broadcast_to_room(
+                    {"type": "token", "phone": phone, "index": len(parts), "delta": delta},
+                    room_id=phone,
+                )
+                parts.append(delta)
+                if send_early:
+                    sids.extend(_send_segment(phone, s) for s in segmenter.feed(delta))
+        except Exception as e:
+            if not parts:
+                logger.warning("STREAM_FAILED_FALLBACK_INVOKE", context={"error": str(e)})
+                return {"ai_response": str(llm.invoke(messages).content)}
+            # Part of the reply may already be on WhatsApp; finish with what we have
+            logger.error("STREAM_INTERRUPTED", context={"phone": phone, "error": str(e)})
+
+        response = "".join(parts)
+        if send_early:
+            tail = segmenter.flush()
+            if tail:
+                sids.append(_send_segment(phone, tail))
+        _broadcast_to_room(
+            {"type": "token_end", "phone": phone, "content": response}, room_id=phone
+        )
+        logger.info(
+            "STREAMED_GENERATION",
+            context={"phone": phone, "chunks": len(parts), "segments": len(sids)},
+        )
+
+        update: dict[str, Any] = {"ai_response": response}
+        if send_early:
+            update["sent_sids"] = sids
+        return update
+
     def generation_node(state: AgentState) -> dict[str, Any]:
         """Call LLM to generate grounded response using templates."""
         lead = state["lead_data"]
@@ -840,6 +1039,8 @@ def create_lead_processing_graph(
                 input=final_input,
                 language=state["language"],
             )
+            if settings.STREAMING_GENERATION_ENABLED:
+                return _stream_response(state, llm, messages)
             response = llm.invoke(messages)
             return {"ai_response": str(response.content)}
         else:
@@ -872,22 +1073,26 @@ def create_lead_processing_graph(
         embedding = state["embedding"]
         lead = state["lead_data"]
 
-        # 1. Update History & Persist Messages
-        # We save messages one by one using the new save_message method
+        # 1. Update History
+        # The turn's writes are buffered and flushed together by db.save_turn below
         user_msg = {
             "role": "user",
             "content": text,
             "timestamp": datetime.now(UTC).isoformat(),
             "metadata": {"source": state["source"]},
         }
-        db.save_message(lead["id"], user_msg)
+        turn_messages = [user_msg]
 
         if response:
             # 1. Send Message via Messaging Port
             inter_msg = state.get("interactive_message")
             sid = None
+            sent_sids = state.get("sent_sids")
 
-            if inter_msg:
+            if sent_sids is not None:
+                # Already delivered segment by segment while streaming
+                sid = next((s for s in reversed(sent_sids) if s), None)
+            elif inter_msg:
                 # Send Interactive Message (Buttons/List)
                 try:
                     sid = msg.send_interactive_message(phone, inter_msg)
@@ -898,11 +1103,7 @@ def create_lead_processing_graph(
                     # Fallback to text if interactive fails
                     logger.error("INTERACTIVE_SEND_FAILED", context={"error": str(e)})
                     sid = msg.send_message(phone, response)
-            elif (
-                state["source"] == "WHATSAPP"
-                and state.get("retrieved_properties")
-                and "list" not in state["status_msg"]  # Avoid loops
-            ):
+            elif _sends_property_list(state):
                 rows = []
                 from domain.messages import Row, Section
 
@@ -927,7 +1128,11 @@ def create_lead_processing_graph(
                     # Fallback to text
                     sid = msg.send_message(phone, response)
             else:
-                sid = msg.send_message(phone, response)
+                try:
+                    sid = msg.send_message(phone, response)
+                except Exception as e:
+                    # Still persist the turn; the reply is recorded as failed
+                    logger.error("SEND_MESSAGE_FAILED", context={"phone": phone, "error": str(e)})
 
             # 2. Save Message to history with captured SID
             assistant_msg = {
@@ -938,7 +1143,7 @@ def create_lead_processing_graph(
                 "status": "sent" if sid else "failed",
                 "metadata": {"by": "ai", "graph": "langgraph"},
             }
-            db.save_message(lead["id"], assistant_msg)
+            turn_messages.append(assistant_msg)
 
             # Broadcast to WebSocket for real-time dashboard
             if WS_AVAILABLE:
@@ -984,7 +1189,13 @@ def create_lead_processing_graph(
 
         # 3. Update Cache (if not a hit)
         if state["checkpoint"] != "cache_hit" and embedding and response:
-            db.save_to_cache(text, embedding, response)
+            db.save_to_cache(
+                text,
+                embedding,
+                response,
+                tenant_id=state["lead_data"].get("tenant_id"),
+                language=state.get("language"),
+            )
 
         # 4. Persist Enriched Lead Metadata (Excluding full message history)
         metadata = {
@@ -999,17 +1210,17 @@ def create_lead_processing_graph(
         logger.info("FINALIZING_METADATA", context={"metadata": metadata})
 
         update_payload = {
-            "customer_phone": phone,
             "metadata": metadata,
             "journey_state": lead.get("journey_state"),
             "status": lead.get("status"),
-            # "messages" removal here is critical: save_message handled it
+            # "messages" removal here is critical: save_turn writes them
             # "last_message" removed - not in current schema
             "updated_at": datetime.now(UTC).isoformat(),
         }
-        db.update_lead(phone, update_payload)
+        # Flush the turn: messages in order plus the lead update, in one round trip
+        db.save_turn(phone, lead["id"], turn_messages, update_payload)
 
-        # 5. Sync to Google Sheets (Operational Visibility)
+        # 5. Sync to Google Sheets (Operational Visibility), off the reply path
         try:
             # Lazy import to avoid circular dependency
             from config.container import container
@@ -1018,7 +1229,8 @@ def create_lead_processing_graph(
             pref_zones = state["preferences"].zones if state.get("preferences") else []
 
             # Get message count from lead data (messages were already persisted)
-            message_count = len(lead.get("messages", [])) + 2  # +2 for the new user and AI messages
+            # +2 for the new user and AI messages (messages only holds the recent window)
+            message_count = lead.get("message_count", len(lead.get("messages", []))) + 2
 
             sync_data = {
                 "phone": phone,
@@ -1029,37 +1241,54 @@ def create_lead_processing_graph(
                 "zones": pref_zones,
                 "message_count": message_count,
             }
-            container.sheets.sync_lead(sync_data)
+            _SHEETS_SYNC_EXECUTOR.submit(_sync_lead_to_sheets, container.sheets, sync_data)
         except Exception as e:
             # Don't fail the flow for sheet sync
             logger.warning("SHEET_SYNC_TRIGGER_FAILED", context={"error": str(e)})
 
         return {"checkpoint": "done"}
 
+    def analysis_join_node(state: AgentState) -> dict[str, Any]:
+        """Barrier: waits for every analysis branch before routing."""
+        return {}
+
     # Define Graph
     workflow = StateGraph(AgentState)
 
-    workflow.add_node("ingest", ingest_node)
-    workflow.add_node("fifi_appraisal", fifi_appraisal_node)
-    workflow.add_node("intent", intent_node)
-    workflow.add_node("lead_qual", lead_qualification_node)
-    workflow.add_node("preferences", preference_extraction_node)
-    workflow.add_node("sentiment", sentiment_analysis_node)
-    workflow.add_node("market_analysis", market_analysis_node)
-    workflow.add_node("cache_check", cache_check_node)
-    workflow.add_node("retrieval", retrieval_node)
-    workflow.add_node("generation", generation_node)
-    workflow.add_node("finalize", finalize_node)
-    workflow.add_node("handoff", handoff_node)
+    nodes: dict[str, Callable[[AgentState], dict[str, Any]]] = {
+        "ingest": ingest_node,
+        "fifi_appraisal": fifi_appraisal_node,
+        "intent": intent_node,
+        "lead_qual": lead_qualification_node,
+        "preferences": preference_extraction_node,
+        "sentiment": sentiment_analysis_node,
+        "market_analysis": market_analysis_node,
+        "cache_check": cache_check_node,
+        "analysis_join": analysis_join_node,
+        "retrieval": retrieval_node,
+        "generation": generation_node,
+        "finalize": finalize_node,
+        "handoff": handoff_node,
+    }
+    for name, node in nodes.items():
+        workflow.add_node(name, _timed(name, node))
 
     workflow.add_edge(START, "ingest")
 
-    def route_after_ingest(state: AgentState) -> str:
+    def route_to_analysis(state: AgentState) -> str | list[str]:
+        """Handoff check first (sentiment if not extracted yet), then the analysis fan-out."""
+        if "sentiment" not in (state.get("extracted") or []):
+            return "sentiment"
+        if _handoff_requested(state):
+            return "handoff"
+        return ANALYSIS_BRANCHES
+
+    def route_after_ingest(state: AgentState) -> str | list[str]:
         if state["checkpoint"] == "human_mode":
             return str(END)
         # Agency Demos bypass intent/qualification and go straight to analysis flow
         if state["source"] == "AGENCY_DEMO":
-            return "preferences"
+            return route_to_analysis(state)
         if state["source"] == "FIFI_APPRAISAL":
             return "fifi_appraisal"
         # If in Qualification Mode, route to it
@@ -1078,39 +1307,35 @@ def create_lead_processing_graph(
 
     workflow.add_conditional_edges("fifi_appraisal", route_after_fifi)
 
-    # Intent -> Check if we switched to Qual
-    def route_after_intent(state: AgentState) -> str:
+    # Intent -> Check if we switched to Qual, otherwise check for handoff and analyse
+    def route_after_intent(state: AgentState) -> str | list[str]:
         status = state["lead_data"].get("journey_state")
         if status == LeadStatus.QUALIFICATION_IN_PROGRESS:
             return "lead_qual"
-        return "preferences"
+        return route_to_analysis(state)
 
     workflow.add_conditional_edges("intent", route_after_intent)
     workflow.add_edge("lead_qual", "finalize")
-    workflow.add_edge("preferences", "sentiment")
 
-    def route_after_sentiment(state: AgentState) -> str:
-        # Trigger Handoff if user is ANGRY or explicitly asking for human
-        if state["sentiment"].sentiment == "ANGRY":
+    def route_after_sentiment(state: AgentState) -> str | list[str]:
+        if _handoff_requested(state):
             return "handoff"
-        # Simple keyword check backup
-        if "human" in state["user_input"].lower() or "agent" in state["user_input"].lower():
-            return "handoff"
-        return "market_analysis"
+        return ANALYSIS_BRANCHES
 
     workflow.add_conditional_edges("sentiment", route_after_sentiment)
-    workflow.add_edge("market_analysis", "cache_check")
 
-    # Conditional edge from cache_check
-    def route_after_cache(state: AgentState) -> Literal["finalize", "retrieval"]:
+    # Preferences, market stats and the cache lookup only depend on
+    # ingest/intent output, so they run concurrently and join before routing
+    workflow.add_edge(ANALYSIS_BRANCHES, "analysis_join")
+
+    def route_after_analysis(state: AgentState) -> str:
         if state["checkpoint"] == "cache_hit":
             return "finalize"
         return "retrieval"
 
+    workflow.add_conditional_edges("analysis_join", route_after_analysis)
     workflow.add_edge("handoff", "finalize")
 
-    workflow.add_conditional_edges("cache_check", route_after_cache)
-
     workflow.add_edge("retrieval", "generation")
     workflow.add_edge("generation", "finalize")
     workflow.add_edge("finalize", END)
@@ -1118,7 +1343,57 @@ def create_lead_processing_graph(
     return cast(StateGraph[AgentState], workflow.compile())
 
 
+# Single worker keeps a lead's sheet rows updated in turn order
+_SHEETS_SYNC_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sheets-sync")
+
+
+def _sync_lead_to_sheets(sheets: Any, sync_data: dict[str, Any]) -> None:
+    try:
+        sheets.sync_lead(sync_data)
+    except Exception as e:
+        logger.warning(
+            "SHEET_SYNC_FAILED", context={"phone": sync_data.get("phone"), "error": str(e)}
+        )
+
+
+def _broadcast_to_room(message: dict[str, Any], room_id: str) -> None:
+    """Schedules a dashboard WebSocket broadcast on the API event loop from a graph thread."""
+    if not WS_AVAILABLE:
+        return
+    try:
+        from config.container import container
+
+        if container.main_loop and container.main_loop.is_running():
+            asyncio.run_coroutine_threadsafe(
+                ws_manager.broadcast_to_room(message, room_id=room_id), container.main_loop
+            )
+    except Exception as e:
+        logger.warning("WS_BROADCAST_FAILED", context={"error": str(e)})
+
+
+def _use_combined_extraction(phone: str) -> bool:
+    """A/B gate for the combined extraction call, bucketed by phone so a lead keeps its arm."""
+    if not settings.COMBINED_EXTRACTION_ENABLED:
+        return False
+    return zlib.crc32(phone.encode()) % 100 < settings.COMBINED_EXTRACTION_ROLLOUT_PERCENT
+
+
+def _validate_understanding_parts(raw: Any) -> dict[str, BaseModel]:
+    """Validates each part of a combined extraction separately from the raw tool-call args."""
+    tool_calls = getattr(raw, "tool_calls", None) or []
+    args = tool_calls[0].get("args", {}) if tool_calls else {}
+    parts: dict[str, BaseModel] = {}
+    for name, schema in UNDERSTANDING_PARTS.items():
+        try:
+            parts[name] = schema.model_validate(args.get(name))
+        except Exception:
+            continue
+    return parts
+
+
 # Helpers (Mirrored from LeadProcessor)
+
+
 def _extract_budget(text: str) -> int | None:
     budget_matches = re.findall(
         r"(\d+(?:\.\d+)?)[\s]?(m(?:ln|ilioni)?)|(\d+)[\s]?k|(\d{5,})", text.lower()
@@ -1147,19 +1422,14 @@ def _format_properties(properties: list[dict[str, Any]]) -> str:
     return res
 
 
-def _extract_qualification_field(field: str, text: str, api_key: SecretStr, model: str) -> Any:  # noqa: PLR0911, PLR0912
-    """Helper to extract specific fields for lead qualification."""
-    from langchain_core.prompts import ChatPromptTemplate
-    from langchain_mistralai import ChatMistralAI
-
+def _extract_qualification_field(field: str, text: str, llm: Any) -> Any:  # noqa: PLR0911, PLR0912
+    """Helper to extract specific fields for lead qualification using the graph's chat model."""
     from domain.qualification import FinancingStatus, Intent, Timeline
 
     if field == "budget":
         return _extract_budget(text)
 
     # Generic extraction using LLM for Enums and other fields
-    llm = ChatMistralAI(api_key=api_key, model_name=model)
-
     system_prompt = (
         f"You are a data extraction assistant. Extract the value for the field '{field}' from the user text.\n"
         "Return ONLY the extracted value. If strictly matching an Enum, return the Enum value.\n"
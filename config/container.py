@@ -2,6 +2,9 @@ from typing import TYPE_CHECKING, Any
 
 from application.services.appointment_service import AppointmentService
 from application.services.appraisal import AppraisalService
+from application.services.comparables_cache import ComparablesCache
+from application.services.comparables_index import ComparablesIndex
+from application.services.embedding_service import EmbeddingService
 from application.services.journey_manager import JourneyManager
 from application.services.lead_ingestion_service import LeadIngestionService
 from application.services.lead_processor import LeadProcessor, LeadScorer
@@ -10,6 +13,7 @@ from application.services.payment_service import PaymentService
 from application.services.routing_service import RoutingService
 from config.settings import settings
 from domain.ports import CachePort, CalendarPort, MessagingPort, ResearchPort
+from infrastructure.cache.semantic_index import SemanticCacheIndex
 
 if TYPE_CHECKING:
     pass
@@ -34,9 +38,34 @@ class Container:
         )
         from infrastructure.adapters.supabase_adapter import SupabaseAdapter  # noqa: PLC0415
         from infrastructure.adapters.twilio_adapter import TwilioAdapter  # noqa: PLC0415
+        from infrastructure.cache.lead_cache import LeadCache  # noqa: PLC0415
+        from infrastructure.cache.tiered_cache import TieredCache  # noqa: PLC0415
+
+        # Cache initialization: per-worker L1 in front of the shared Redis (when configured)
+        self.cache: CachePort = TieredCache(
+            l1=InMemoryCacheAdapter(
+                max_entries=settings.MEMORY_CACHE_MAX_ENTRIES,
+                max_bytes=settings.MEMORY_CACHE_MAX_MB * 1024 * 1024,
+            ),
+            l2=RedisAdapter(settings.REDIS_URL) if settings.REDIS_URL else None,
+            l1_ttl=settings.CACHE_L1_TTL_SECONDS,
+        )
 
         # Infrastructure Adapters
-        self.db: SupabaseAdapter = SupabaseAdapter()
+        self.db: SupabaseAdapter = SupabaseAdapter(
+            lead_cache=LeadCache(cache=self.cache, ttl=settings.LEAD_CACHE_TTL_SECONDS),
+            cache=self.cache,
+        )
+        self.semantic_index: SemanticCacheIndex | None = None
+        if settings.SEMANTIC_CACHE_INDEX_ENABLED:
+            self.semantic_index = SemanticCacheIndex(
+                db_client=self.db.client,
+                threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+                max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+                ttl_seconds=settings.SEMANTIC_CACHE_TTL_HOURS * 3600,
+                refresh_seconds=settings.SEMANTIC_CACHE_REFRESH_SECONDS,
+            )
+            self.db.semantic_index = self.semantic_index
         self.ai: LangChainAdapter = LangChainAdapter()
         self.msg: MessagingPort
         if settings.WHATSAPP_PROVIDER == "meta":
@@ -48,14 +77,6 @@ class Container:
         self.scraper: ImmobiliareScraperAdapter = ImmobiliareScraperAdapter()
         self.market: IdealistaMarketAdapter = IdealistaMarketAdapter()
 
-        # Cache initialization
-        cache: CachePort
-        if settings.REDIS_URL:
-            cache = RedisAdapter(settings.REDIS_URL)
-        else:
-            cache = InMemoryCacheAdapter()
-        self.cache = cache
-
         self.market_intel: MarketIntelligenceService = MarketIntelligenceService(
             db=self.db, ai=self.ai, cache=self.cache
         )
@@ -71,6 +92,8 @@ class Container:
         self.payment_service: PaymentService = PaymentService(db=self.db, msg=self.msg)
         self.routing_service: RoutingService = RoutingService(db=self.db)
 
+        self.embeddings: EmbeddingService = EmbeddingService(ai=self.ai, cache=self.cache)
+
         self.scorer: LeadScorer = LeadScorer()
         self.lead_processor: LeadProcessor = LeadProcessor(
             db=self.db,
@@ -84,20 +107,33 @@ class Container:
             email=self.email,
             validation=self.validation,
             routing=self.routing_service,
+            embeddings=self.embeddings,
         )
 
         # Local property search (for performance optimization)
         from application.services.local_property_search import LocalPropertySearchService
         from infrastructure.monitoring.performance_logger import PerformanceMetricLogger
 
+        self.comparables_index: ComparablesIndex | None = None
+        if settings.COMPARABLES_INDEX_ENABLED:
+            self.comparables_index = ComparablesIndex(
+                db_client=self.db.client,
+                refresh_seconds=settings.COMPARABLES_INDEX_REFRESH_SECONDS,
+            )
+
         # Use the Supabase client from the SupabaseAdapter
-        self.local_property_search = LocalPropertySearchService(db_client=self.db.client)
+        self.local_property_search = LocalPropertySearchService(
+            db_client=self.db.client, index=self.comparables_index
+        )
         self.performance_logger = PerformanceMetricLogger(db_client=self.db.client)
 
         self.appraisal_service: AppraisalService = AppraisalService(
             research_port=self.research,
             local_search=self.local_property_search,
             performance_logger=self.performance_logger,
+            comparables_cache=ComparablesCache(
+                cache=self.cache, ttl_hours=settings.COMPARABLES_CACHE_TTL_HOURS
+            ),
         )
 
         self.appointment_service: AppointmentService = AppointmentService(
@@ -161,7 +197,7 @@ class Container:
         )
         from infrastructure.cache import RedisPerplexityCache  # noqa: PLC0415
 
-        cache = RedisPerplexityCache(redis_url=settings.REDIS_URL, ttl_hours=24)
+        cache = RedisPerplexityCache(redis_url=settings.REDIS_URL, ttl_hours=24, cache=self.cache)
         return PerplexityAdapter(cache=cache)
 
     @property
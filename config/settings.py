@@ -8,6 +8,11 @@ class Settings(BaseSettings):
     SUPABASE_KEY: str = Field(default="")
     SUPABASE_SERVICE_ROLE_KEY: str | None = Field(default=None)
     SUPABASE_JWT_SECRET: str = Field(default="")
+    # Shared HTTP session borrowed by every Supabase client (infrastructure.supabase_pool)
+    SUPABASE_POOL_MAX_CONNECTIONS: int = Field(default=20)
+    SUPABASE_POOL_KEEPALIVE_SECONDS: float = Field(default=60.0)
+    SUPABASE_TIMEOUT_SECONDS: float = Field(default=30.0)
+    SUPABASE_HTTP2: bool = Field(default=True)
 
     # Mistral AI
     MISTRAL_API_KEY: str = Field(default="")
@@ -22,6 +27,11 @@ class Settings(BaseSettings):
 
     # Redis Cache (Optional)
     REDIS_URL: str = Field(default="")  # e.g., redis://localhost:6379/0
+    # Bounds for the in-process cache used when Redis is not configured
+    MEMORY_CACHE_MAX_ENTRIES: int = Field(default=10000)
+    MEMORY_CACHE_MAX_MB: int = Field(default=64)
+    # With Redis, each worker keeps hot keys in memory for at most this long
+    CACHE_L1_TTL_SECONDS: int = Field(default=60)
 
     # WhatsApp Messaging
     WHATSAPP_PROVIDER: str = Field(default="twilio")  # or "meta"
@@ -43,6 +53,8 @@ class Settings(BaseSettings):
 
     # LLM Context
     MAX_CONTEXT_MESSAGES: int = Field(default=10)
+    # Shared-tier lifetime of cached lead rows (writes through the adapter invalidate sooner)
+    LEAD_CACHE_TTL_SECONDS: int = Field(default=30)
 
     # Rate Limiting
     MESSAGE_RATE_LIMIT: int = Field(default=20)  # Max messages per window
@@ -86,6 +98,34 @@ class Settings(BaseSettings):
     STRIPE_CONNECT_CLIENT_ID: str = Field(default="")
     BASE_URL: str = Field(default="https://agenzia-ai.vercel.app")
 
+    # Appraisal
+    # Race local search against a speculative Perplexity call (costs an API call on local hits)
+    APPRAISAL_CONCURRENT_MODE: bool = Field(default=False)
+    APPRAISAL_DEADLINE_SECONDS: float = Field(default=8.0)
+    # Local search gets this long before the Perplexity call is sent (and again if it lands first)
+    APPRAISAL_HEDGE_SECONDS: float = Field(default=0.3)
+    # Serve comparable searches from an in-memory copy of available listings
+    COMPARABLES_INDEX_ENABLED: bool = Field(default=False)
+    COMPARABLES_INDEX_REFRESH_SECONDS: int = Field(default=60)
+    # Parsed research comparables are reused for this long (no Perplexity or LLM call)
+    COMPARABLES_CACHE_TTL_HOURS: int = Field(default=24)
+
+    # Semantic response cache
+    SEMANTIC_CACHE_THRESHOLD: float = Field(default=0.9)
+    # Match cached answers in memory per worker instead of a match_cache RPC per message
+    SEMANTIC_CACHE_INDEX_ENABLED: bool = Field(default=False)
+    SEMANTIC_CACHE_MAX_ENTRIES: int = Field(default=20000)
+    SEMANTIC_CACHE_TTL_HOURS: int = Field(default=168)
+    SEMANTIC_CACHE_REFRESH_SECONDS: int = Field(default=60)
+
+    # Conversation graph
+    # One structured LLM call for intent + preferences + sentiment instead of three
+    COMBINED_EXTRACTION_ENABLED: bool = Field(default=False)
+    # Share of leads (0-100, bucketed by phone) in the combined arm of the A/B test
+    COMBINED_EXTRACTION_ROLLOUT_PERCENT: int = Field(default=100, ge=0, le=100)
+    # Stream reply tokens to the dashboard and send WhatsApp segments as sentences complete
+    STREAMING_GENERATION_ENABLED: bool = Field(default=False)
+
     # External APIs
     RAPIDAPI_KEY: str | None = None
 
@@ -1,6 +1,19 @@
+import asyncio
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# Lead columns a conversation turn may update (see DatabasePort.save_turn)
+TURN_LEAD_FIELDS = frozenset({"metadata", "journey_state", "status", "updated_at"})
+
+
+def check_turn_update(lead_update: dict[str, Any]) -> None:
+    """Raises ValueError if `lead_update` sets columns outside TURN_LEAD_FIELDS."""
+    unsupported = set(lead_update) - TURN_LEAD_FIELDS
+    if unsupported:
+        raise ValueError(f"save_turn cannot update lead fields: {sorted(unsupported)}")
 
 
 class DatabasePort(ABC):
@@ -13,7 +26,8 @@ class DatabasePort(ABC):
         pass
 
     @abstractmethod
-    def get_lead(self, phone: str) -> dict[str, Any] | None:
+    def get_lead(self, phone: str, message_limit: int | None = None) -> dict[str, Any] | None:
+        """Returns the lead with its messages (only the newest `message_limit` if set)."""
         pass
 
     @abstractmethod
@@ -35,18 +49,80 @@ class DatabasePort(ABC):
     def update_lead_status(self, phone: str, status: str) -> None:
         pass
 
+    def save_turn(
+        self,
+        phone: str,
+        lead_id: str,
+        messages: list[dict[str, Any]],
+        lead_update: dict[str, Any],
+    ) -> None:
+        """
+        Persists one conversation turn: `messages` in order, then `lead_update`.
+
+        `lead_update` may only set TURN_LEAD_FIELDS. Adapters override this to
+        flush the whole turn in a single round trip.
+        """
+        check_turn_update(lead_update)
+        for message in messages:
+            self.save_message(lead_id, message)
+        if lead_update:
+            self.update_lead(phone, lead_update)
+
     @abstractmethod
-    def get_cached_response(self, embedding: list[float], threshold: float = 0.9) -> str | None:
+    def get_cached_response(
+        self,
+        embedding: list[float],
+        threshold: float = 0.9,
+        *,
+        tenant_id: str | None = None,
+        language: str | None = None,
+    ) -> str | None:
         pass
 
     @abstractmethod
-    def save_to_cache(self, query: str, embedding: list[float], response: str) -> None:
+    def save_to_cache(
+        self,
+        query: str,
+        embedding: list[float],
+        response: str,
+        *,
+        tenant_id: str | None = None,
+        language: str | None = None,
+    ) -> None:
         pass
 
     @abstractmethod
     def get_market_stats(self, zone: str) -> dict[str, Any]:
         pass
 
+    @abstractmethod
+    def get_market_aggregates(
+        self,
+        zone: str | None = None,
+        city: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> dict[str, Any]:
+        """
+        Price-per-sqm statistics for market listings matching the filters.
+
+        Returns listings_count, sample_size, avg/median/p25/p75/min/max_price_sqm
+        and avg_price, computed by the database rather than from fetched rows.
+        """
+        pass
+
+    @abstractmethod
+    def get_property_interest_stats(
+        self, property_id: str, hot_threshold: int = 50
+    ) -> dict[str, int]:
+        """
+        Counts of leads whose metadata lists `property_id` as an interest.
+
+        Returns total_leads, hot_leads (score >= hot_threshold) and
+        scheduled_viewings, without scanning leads that never asked about it.
+        """
+        pass
+
     @abstractmethod
     def update_message_status(self, sid: str, status: str) -> None:
         pass
@@ -95,6 +171,26 @@ class AIPort(ABC):
     def get_embedding(self, text: str) -> list[float]:
         pass
 
+    def get_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """Embeds several texts; adapters override this with a single batched request."""
+        return [self.get_embedding(text) for text in texts]
+
+    @abstractmethod
+    def generate_structured(self, prompt: str, schema: type[T]) -> T:
+        """Returns an instance of `schema` filled from the model's structured output."""
+        pass
+
+    # Async variants. Adapters with a native async client override these; the
+    # defaults run the blocking call on a worker thread.
+    async def agenerate_response(self, prompt: str) -> str:
+        return await asyncio.to_thread(self.generate_response, prompt)
+
+    async def aget_embedding(self, text: str) -> list[float]:
+        return await asyncio.to_thread(self.get_embedding, text)
+
+    async def agenerate_structured(self, prompt: str, schema: type[T]) -> T:
+        return await asyncio.to_thread(self.generate_structured, prompt, schema)
+
 
 class CalendarPort(ABC):
     @abstractmethod
@@ -0,0 +1,143 @@
+"""
+Normalized search keys for properties.
+
+Listings are stored with `city`, `zone_slug` and `property_type` computed by
+these helpers at ingest time, so comparable searches can filter on indexed
+equality instead of substring-matching the description.
+"""
+
+import math
+import re
+import unicodedata
+from typing import Any
+
+# City Normalization Mapping
+CITY_VARIANTS = {
+    "florence": "Firenze",
+    "firenze": "Firenze",
+    "siena": "Siena",
+    "pisa": "Pisa",
+    "lucca": "Lucca",
+    "arezzo": "Arezzo",
+    "grosseto": "Grosseto",
+    "livorno": "Livorno",
+    "milan": "Milano",
+    "milano": "Milano",
+    "rome": "Roma",
+    "roma": "Roma",
+    "naples": "Napoli",
+    "napoli": "Napoli",
+    "venice": "Venezia",
+    "venezia": "Venezia",
+}
+
+# Surface areas within about ±5% of each other share a comparables cache entry
+SURFACE_BUCKET_RATIO = 1.1
+
+# Listing vocabulary (Italian and English) -> canonical property type.
+# Order matters: the first keyword found in a title wins.
+PROPERTY_TYPE_KEYWORDS = {
+    "attico": "penthouse",
+    "penthouse": "penthouse",
+    "villa": "villa",
+    "villetta": "villa",
+    "casale": "house",
+    "rustico": "house",
+    "farmhouse": "house",
+    "podere": "house",
+    "casa indipendente": "house",
+    "house": "house",
+    "loft": "loft",
+    "monolocale": "apartment",
+    "studio": "apartment",
+    "bilocale": "apartment",
+    "trilocale": "apartment",
+    "quadrilocale": "apartment",
+    "appartamento": "apartment",
+    "apartment": "apartment",
+    "flat": "apartment",
+}
+
+
+def normalize_city(city: str | None) -> str | None:
+    """Canonical city name ("florence" -> "Firenze"), or None if empty."""
+    if not city or not city.strip():
+        return None
+    cleaned = city.strip()
+    return CITY_VARIANTS.get(cleaned.lower(), cleaned.title())
+
+
+def zone_slug(zone: str | None) -> str | None:
+    """Accent- and case-insensitive zone key ("Santo Spirito" -> "santo-spirito")."""
+    if not zone:
+        return None
+    ascii_zone = unicodedata.normalize("NFKD", zone).encode("ascii", "ignore").decode()
+    slug = re.sub(r"[^a-z0-9]+", "-", ascii_zone.lower()).strip("-")
+    return slug or None
+
+
+def normalize_property_type(text: str | None) -> str | None:
+    """Canonical property type mentioned in `text`, if any."""
+    if not text:
+        return None
+    lowered = text.lower()
+    for keyword, property_type in PROPERTY_TYPE_KEYWORDS.items():
+        if re.search(rf"\b{re.escape(keyword)}\b", lowered):
+            return property_type
+    return None
+
+
+def property_search_keys(prop: dict[str, Any]) -> dict[str, Any]:
+    """
+    Search columns for a property row about to be written.
+
+    Explicit `city`/`zone`/`property_type` fields win; otherwise the city and
+    type are inferred from the title and description.
+    """
+    text = f"{prop.get('title') or ''} {prop.get('description') or ''}"
+    city = normalize_city(prop.get("city"))
+    if not city:
+        lowered = text.lower()
+        city = next(
+            (
+                name
+                for variant, name in CITY_VARIANTS.items()
+                if re.search(rf"\b{variant}\b", lowered)
+            ),
+            None,
+        )
+    return {
+        "city": city,
+        "zone_slug": zone_slug(prop.get("zone")),
+        "property_type": normalize_property_type(prop.get("property_type"))
+        or normalize_property_type(prop.get("title")),
+    }
+
+
+def surface_bucket(surface_sqm: float | None) -> int | None:
+    """Representative size of the geometric band `surface_sqm` falls in (95 and 96 -> 97)."""
+    if not surface_sqm or surface_sqm <= 0:
+        return None
+    band = round(math.log(surface_sqm) / math.log(SURFACE_BUCKET_RATIO))
+    return round(SURFACE_BUCKET_RATIO**band)
+
+
+def comparables_query_key(
+    city: str | None, zone: str | None, property_type: str | None, surface_sqm: float | None
+) -> str:
+    """
+    Canonical key for a comparables research query.
+
+    Spelling variants of the same search ("florence"/"Firenze",
+    "Santo Spirito"/"santo-spirito", "appartamento"/"apartment") and nearby
+    sizes map to the same key, so their results can be shared.
+    """
+    canonical_type = normalize_property_type(property_type) or (property_type or "").strip().lower()
+    return "|".join(
+        [
+            (normalize_city(city) or "").lower(),
+            zone_slug(zone) or "",
+            canonical_type,
+            str(surface_bucket(surface_sqm) or ""),
+        ]
+    )
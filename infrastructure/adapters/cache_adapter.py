@@ -1,6 +1,14 @@
+from collections.abc import Callable
+from typing import Any, cast
+
 import redis  # type: ignore
 
 from domain.ports import CachePort
+from infrastructure.cache.memory_cache import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_ENTRIES,
+    BoundedTTLCache,
+)
 from infrastructure.logging import get_logger
 
 logger = get_logger(__name__)
@@ -10,6 +18,7 @@ class RedisAdapter(CachePort):
     def __init__(self, redis_url: str):
         self.url = redis_url
         self._client = None
+        self._pubsub_thread: Any = None
         if redis_url:
             try:
                 self._client = redis.from_url(redis_url, decode_responses=True)
@@ -47,20 +56,51 @@ class RedisAdapter(CachePort):
         except Exception as e:
             logger.error("REDIS_DELETE_FAILED", context={"key": key, "error": str(e)})
 
+    @property
+    def available(self) -> bool:
+        return self._client is not None
+
+    def publish(self, channel: str, message: str) -> None:
+        if not self._client:
+            return
+        try:
+            self._client.publish(channel, message)
+        except Exception as e:
+            logger.error("REDIS_PUBLISH_FAILED", context={"channel": channel, "error": str(e)})
+
+    def subscribe(self, channel: str, handler: Callable[[str], None]) -> bool:
+        """Calls `handler(message)` for each message on `channel`, from a daemon thread."""
+        if not self._client:
+            return False
+        try:
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{channel: lambda message: handler(message["data"])})
+            self._pubsub_thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+            return True
+        except Exception as e:
+            logger.error("REDIS_SUBSCRIBE_FAILED", context={"channel": channel, "error": str(e)})
+            return False
+
 
 class InMemoryCacheAdapter(CachePort):
-    """Fallback cache if Redis is not available."""
+    """Fallback cache if Redis is not available (bounded, TTL-aware, LRU eviction)."""
 
-    def __init__(self) -> None:
-        self._data: dict[str, str] = {}
-        logger.info("IN_MEMORY_CACHE_INITIALIZED")
+    def __init__(
+        self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        self._data = BoundedTTLCache(
+            max_entries=max_entries, max_bytes=max_bytes, cache_type="in_memory"
+        )
+        logger.info(
+            "IN_MEMORY_CACHE_INITIALIZED",
+            context={"max_entries": max_entries, "max_bytes": max_bytes},
+        )
 
     def get(self, key: str) -> str | None:
-        return self._data.get(key)
+        return cast(str | None, self._data.get(key))
 
     def set(self, key: str, value: str, ttl: int = 3600) -> None:
-        # Simplistic in-memory cache without TTL for demo/fallback
-        self._data[key] = value
+        self._data.set(key, value, ttl=ttl)
 
     def delete(self, key: str) -> None:
-        self._data.pop(key, None)
+        self._data.delete(key)
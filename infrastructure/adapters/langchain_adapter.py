@@ -1,4 +1,5 @@
-from typing import cast
+import threading
+from typing import Any, TypeVar, cast
 
 from langchain_mistralai import ChatMistralAI, MistralAIEmbeddings
 from pydantic import SecretStr
@@ -6,21 +7,43 @@ from pydantic import SecretStr
 from config.settings import settings
 from domain.errors import ExternalServiceError
 from domain.ports import AIPort
+from infrastructure.http_pool import MISTRAL_BASE_URL, http_pool
 from infrastructure.logging import get_logger
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+
+def create_chat_model() -> ChatMistralAI:
+    """ChatMistralAI bound to the shared keep-alive HTTP pool."""
+    return ChatMistralAI(
+        api_key=SecretStr(settings.MISTRAL_API_KEY),
+        model_name=settings.MISTRAL_MODEL,
+        endpoint=MISTRAL_BASE_URL,
+        client=http_pool.mistral_client(),
+        async_client=http_pool.mistral_async_client(),
+    )
+
 
 class LangChainAdapter(AIPort):
     def __init__(self) -> None:
-        self.llm = ChatMistralAI(
-            api_key=SecretStr(settings.MISTRAL_API_KEY),
-            model_name=settings.MISTRAL_MODEL,
-        )
+        self.llm = create_chat_model()
         self.embeddings = MistralAIEmbeddings(
             api_key=SecretStr(settings.MISTRAL_API_KEY),
             model=settings.MISTRAL_EMBEDDING_MODEL,
+            client=http_pool.mistral_client(),
+            async_client=http_pool.mistral_async_client(),
         )
+        self._structured: dict[type, Any] = {}
+        self._structured_lock = threading.Lock()
+
+    def structured_llm(self, schema: type[T]) -> Any:
+        """Returns the (cached) structured-output runnable for `schema`."""
+        with self._structured_lock:
+            if schema not in self._structured:
+                self._structured[schema] = self.llm.with_structured_output(schema)
+            return self._structured[schema]
 
     def generate_response(self, prompt: str) -> str:
         try:
@@ -41,3 +64,56 @@ class LangChainAdapter(AIPort):
             raise ExternalServiceError(
                 "Failed to generate embedding via LangChain", cause=str(e)
             ) from e
+
+    def get_embeddings(self, texts: list[str]) -> list[list[float]]:
+        try:
+            return cast(list[list[float]], self.embeddings.embed_documents(texts))
+        except Exception as e:
+            logger.error("LANGCHAIN_EMBED_FAILED", context={"error": str(e), "texts": len(texts)})
+            raise ExternalServiceError(
+                "Failed to generate embeddings via LangChain", cause=str(e)
+            ) from e
+
+    def generate_structured(self, prompt: str, schema: type[T]) -> T:
+        try:
+            return cast(T, self.structured_llm(schema).invoke(prompt))
+        except Exception as e:
+            logger.error(
+                "LANGCHAIN_STRUCTURED_FAILED",
+                context={"schema": schema.__name__, "error": str(e)},
+            )
+            raise ExternalServiceError(
+                "Failed to generate structured output via LangChain", cause=str(e)
+            ) from e
+
+    async def agenerate_response(self, prompt: str) -> str:
+        try:
+            response = await self.llm.ainvoke(prompt)
+            return str(response.content)
+        except Exception as e:
+            logger.error("LANGCHAIN_GENERATE_FAILED", context={"error": str(e)})
+            raise ExternalServiceError(
+                "Failed to generate AI response via LangChain", cause=str(e)
+            ) from e
+
+    async def aget_embedding(self, text: str) -> list[float]:
+        try:
+            embedding = await self.embeddings.aembed_query(text)
+            return cast(list[float], embedding)
+        except Exception as e:
+            logger.error("LANGCHAIN_EMBED_FAILED", context={"error": str(e)})
+            raise ExternalServiceError(
+                "Failed to generate embedding via LangChain", cause=str(e)
+            ) from e
+
+    async def agenerate_structured(self, prompt: str, schema: type[T]) -> T:
+        try:
+            return cast(T, await self.structured_llm(schema).ainvoke(prompt))
+        except Exception as e:
+            logger.error(
+                "LANGCHAIN_STRUCTURED_FAILED",
+                context={"schema": schema.__name__, "error": str(e)},
+            )
+            raise ExternalServiceError(
+                "Failed to generate structured output via LangChain", cause=str(e)
+            ) from e
@@ -1,4 +1,4 @@
-from typing import cast
+from typing import Any, TypeVar, cast
 
 from mistralai import Mistral
 from tenacity import retry, stop_after_attempt, wait_exponential
@@ -6,14 +6,28 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 from config.settings import settings
 from domain.errors import ExternalServiceError
 from domain.ports import AIPort
+from infrastructure.http_pool import http_pool
 from infrastructure.logging import get_logger
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
 
 class MistralAdapter(AIPort):
     def __init__(self) -> None:
-        self.client = Mistral(api_key=settings.MISTRAL_API_KEY)
+        self.client = Mistral(
+            api_key=settings.MISTRAL_API_KEY,
+            client=http_pool.mistral_client(),
+            async_client=http_pool.mistral_async_client(),
+        )
+
+    @staticmethod
+    def _content(chat_response: Any) -> str:
+        if chat_response and chat_response.choices:
+            content = chat_response.choices[0].message.content
+            return str(content) if content else ""
+        return ""
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def generate_response(self, prompt: str) -> str:
@@ -22,10 +36,7 @@ class MistralAdapter(AIPort):
                 model=settings.MISTRAL_MODEL,
                 messages=[{"role": "user", "content": prompt}],
             )
-            if chat_response and chat_response.choices:
-                content = chat_response.choices[0].message.content
-                return str(content) if content else ""
-            return ""
+            return self._content(chat_response)
         except Exception as e:
             logger.error("MISTRAL_GENERATE_FAILED", context={"error": str(e)})
             raise ExternalServiceError("Failed to generate AI response", cause=str(e)) from e
@@ -42,3 +53,67 @@ class MistralAdapter(AIPort):
         except Exception as e:
             logger.error("MISTRAL_EMBED_FAILED", context={"error": str(e)})
             raise ExternalServiceError("Failed to generate embedding", cause=str(e)) from e
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    def get_embeddings(self, texts: list[str]) -> list[list[float]]:
+        try:
+            response = self.client.embeddings.create(
+                model=settings.MISTRAL_EMBEDDING_MODEL, inputs=texts
+            )
+            if response and response.data:
+                return [cast(list[float], item.embedding) for item in response.data]
+            return []
+        except Exception as e:
+            logger.error("MISTRAL_EMBED_FAILED", context={"error": str(e), "texts": len(texts)})
+            raise ExternalServiceError("Failed to generate embeddings", cause=str(e)) from e
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    def generate_structured(self, prompt: str, schema: type[T]) -> T:
+        try:
+            chat_response = self.client.chat.parse(
+                response_format=cast(Any, schema),
+                model=settings.MISTRAL_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+            )
+            return cast(T, chat_response.choices[0].message.parsed)
+        except Exception as e:
+            logger.error("MISTRAL_STRUCTURED_FAILED", context={"error": str(e)})
+            raise ExternalServiceError("Failed to generate structured output", cause=str(e)) from e
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    async def agenerate_response(self, prompt: str) -> str:
+        try:
+            chat_response = await self.client.chat.complete_async(
+                model=settings.MISTRAL_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+            )
+            return self._content(chat_response)
+        except Exception as e:
+            logger.error("MISTRAL_GENERATE_FAILED", context={"error": str(e)})
+            raise ExternalServiceError("Failed to generate AI response", cause=str(e)) from e
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    async def aget_embedding(self, text: str) -> list[float]:
+        try:
+            response = await self.client.embeddings.create_async(
+                model=settings.MISTRAL_EMBEDDING_MODEL, inputs=[text]
+            )
+            if response and response.data:
+                return cast(list[float], response.data[0].embedding)
+            return []
+        except Exception as e:
+            logger.error("MISTRAL_EMBED_FAILED", context={"error": str(e)})
+            raise ExternalServiceError("Failed to generate embedding", cause=str(e)) from e
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    async def agenerate_structured(self, prompt: str, schema: type[T]) -> T:
+        try:
+            chat_response = await self.client.chat.parse_async(
+                response_format=cast(Any, schema),
+                model=settings.MISTRAL_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+            )
+            return cast(T, chat_response.choices[0].message.parsed)
+        except Exception as e:
+            logger.error("MISTRAL_STRUCTURED_FAILED", context={"error": str(e)})
+            raise ExternalServiceError("Failed to generate structured output", cause=str(e)) from e
@@ -6,11 +6,16 @@ from openai import OpenAI
 from config.settings import settings
 from domain.errors import ExternalServiceError
 from domain.ports import ResearchPort
+from domain.property_search import comparables_query_key
+from infrastructure.cache.single_flight import SingleFlight
 from infrastructure.logging import get_logger
 from infrastructure.metrics import perplexity_api_calls_total, perplexity_api_duration_seconds
 
 logger = get_logger(__name__)
 
+# Process-wide: concurrent appraisals for the same query share one API call
+_comparables_flight = SingleFlight("perplexity_comparables")
+
 
 class PerplexityAdapter(ResearchPort):
     """Perplexity Labs API adapter for real-time research."""
@@ -98,6 +103,14 @@ class PerplexityAdapter(ResearchPort):
             if cached:
                 return cast(str, cached)
 
+        return _comparables_flight.run(
+            comparables_query_key(city, zone, property_type, surface_sqm),
+            lambda: self._search_comparables(city, zone, property_type, surface_sqm),
+        )
+
+    def _search_comparables(
+        self, city: str, zone: str, property_type: str, surface_sqm: int
+    ) -> str:
         # Italian query for better local results
         query = (
             f"Cerca 3 annunci immobiliari IN VENDITA (non affitto) per {property_type} "
@@ -112,4 +125,7 @@ class PerplexityAdapter(ResearchPort):
             query, context="Sei un analista immobiliare esperto nel mercato italiano."
         )
 
+        if self.cache and result:
+            self.cache.set(city, zone, property_type, surface_sqm, result)
+
         return result
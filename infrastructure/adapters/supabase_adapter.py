@@ -1,29 +1,62 @@
+import json
+import statistics
 from datetime import UTC, datetime
 from typing import Any, cast
+from uuid import uuid4
 
-from supabase import create_client
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from domain.errors import DatabaseError
-from domain.ports import DatabasePort
+from domain.ports import CachePort, DatabasePort, check_turn_update
+from infrastructure.cache.lead_cache import LeadCache
+from infrastructure.cache.semantic_index import SemanticCacheIndex
+from infrastructure.cache.single_flight import SingleFlight
 from infrastructure.logging import get_logger
+from infrastructure.supabase_pool import supabase_pool
 
 logger = get_logger(__name__)
 
+# Columns returned by the market_zone_stats RPC
+MARKET_STAT_KEYS = (
+    "listings_count",
+    "sample_size",
+    "avg_price_sqm",
+    "median_price_sqm",
+    "p25_price_sqm",
+    "p75_price_sqm",
+    "min_price_sqm",
+    "max_price_sqm",
+    "avg_price",
+)
+
+INTEREST_STAT_KEYS = ("total_leads", "hot_leads", "scheduled_viewings")
+
+# Zone stats move slowly; appraisal bursts for one zone reuse a single aggregate
+MARKET_STATS_TTL_SECONDS = 900
+
 
 class SupabaseAdapter(DatabasePort):
-    def __init__(self) -> None:
-        from config.settings import settings
+    def __init__(
+        self,
+        lead_cache: LeadCache | None = None,
+        cache: CachePort | None = None,
+        semantic_index: SemanticCacheIndex | None = None,
+    ) -> None:
+        self.lead_cache = lead_cache
+        self.cache = cache
+        self.semantic_index = semantic_index
+        self._market_stats_flight = SingleFlight("market_stats")
 
         try:
-            key = settings.SUPABASE_SERVICE_ROLE_KEY or settings.SUPABASE_KEY
-            self.client = create_client(settings.SUPABASE_URL, key)
+            # Borrow the process-wide client: no new HTTP session per adapter
+            self.client = supabase_pool.client()
         except Exception as e:
             logger.error("FAILED_TO_INIT_SUPABASE", context={"error": str(e)})
             raise DatabaseError("Supabase client initialization failed", cause=str(e)) from e
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-    def save_lead(self, lead_data: dict[str, Any]) -> None:
+    def save_lead(self, lead_data: dict[str, Any]) -> dict[str, Any]:
+        """Upserts the lead profile and returns the stored row (without messages)."""
         try:
             # 1. Separate Lead Profile vs Messages
             # We must COPY lead_data to avoid modifying it in place
@@ -32,6 +65,7 @@ class SupabaseAdapter(DatabasePort):
 
             # Remove keys that shouldn't be in LEADS table if present
             lead_profile.pop("last_message", None)
+            lead_profile.pop("message_count", None)
 
             # 2. Upsert Lead Profile
             res = (
@@ -54,6 +88,12 @@ class SupabaseAdapter(DatabasePort):
                     if not msg.get("id"):
                         self.save_message(lead_id, msg)
 
+            if self.lead_cache:
+                self.lead_cache.invalidate(
+                    data[0].get("customer_phone") or lead_profile.get("customer_phone")
+                )
+            return data[0]
+
         except Exception as e:
             logger.error(
                 "SAVE_LEAD_FAILED",
@@ -61,55 +101,76 @@ class SupabaseAdapter(DatabasePort):
             )
             raise DatabaseError("Failed to save lead", cause=str(e)) from e
 
+    @staticmethod
+    def _message_row(lead_id: str, msg: dict[str, Any]) -> dict[str, Any]:
+        return {
+            # Generated here so retried inserts can be deduplicated on the primary key
+            "id": msg.get("id") or str(uuid4()),
+            "lead_id": lead_id,
+            "role": msg.get("role"),
+            "content": msg.get("content"),
+            "sid": msg.get("sid"),
+            "status": msg.get("status", "sent"),
+            "media_url": msg.get("media_url"),
+            "channel": msg.get("channel", "whatsapp"),
+            "created_at": msg.get("timestamp")
+            or msg.get("created_at")
+            or datetime.now(UTC).isoformat(),
+            "metadata": msg.get("metadata", {}),
+        }
+
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def save_message(self, lead_id: str, msg: dict[str, Any]) -> None:
         try:
-            msg_data = {
-                "lead_id": lead_id,
-                "role": msg.get("role"),
-                "content": msg.get("content"),
-                "sid": msg.get("sid"),
-                "status": msg.get("status", "sent"),
-                "media_url": msg.get("media_url"),
-                "channel": msg.get("channel", "whatsapp"),
-                "created_at": msg.get("timestamp")
-                or msg.get("created_at")
-                or datetime.now(UTC).isoformat(),
-                "metadata": msg.get("metadata", {}),
-            }
-            self.client.table("messages").insert(msg_data).execute()
+            row = self._message_row(lead_id, msg)
+            self.client.table("messages").insert(row).execute()
+            if self.lead_cache:
+                self.lead_cache.add_messages(lead_id, [row])
         except Exception as e:
             logger.error("SAVE_MESSAGE_FAILED", context={"lead_id": lead_id, "error": str(e)})
             raise DatabaseError("Failed to save message", cause=str(e)) from e
 
+    def get_lead(self, phone: str, message_limit: int | None = None) -> dict[str, Any] | None:
+        if self.lead_cache:
+            cached = self.lead_cache.get(phone, message_limit)
+            if cached is not None:
+                return cached
+
+        lead = self._fetch_lead(phone, message_limit)
+        if lead and self.lead_cache:
+            self.lead_cache.put(phone, lead, message_limit)
+        return lead
+
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-    def get_lead(self, phone: str) -> dict[str, Any] | None:
+    def _fetch_lead(self, phone: str, message_limit: int | None) -> dict[str, Any] | None:
         try:
-            # 1. Fetch Lead
-            res_lead = (
+            # Lead, its messages and the total message count in one PostgREST request
+            query = (
                 self.client.table("leads")
-                .select("*")
+                .select("*, messages(*), message_count:messages(count)")
                 .eq("customer_phone", phone)
-                .limit(1)
-                .execute()
             )
+            if message_limit is not None:
+                # Only the newest N messages; reversed below to keep chronological order
+                query = query.order("created_at", desc=True, foreign_table="messages").limit(
+                    message_limit, foreign_table="messages"
+                )
+            else:
+                query = query.order("created_at", foreign_table="messages")
+
+            res_lead = query.limit(1).execute()
             if not res_lead.data:
                 return None
 
             data = cast(list[dict[str, Any]], res_lead.data)
             lead = data[0]
 
-            # 2. Fetch Messages
-            res_msgs = (
-                self.client.table("messages")
-                .select("*")
-                .eq("lead_id", lead["id"])
-                .order("created_at")
-                .execute()
-            )
-
-            # 3. Assemble
-            lead["messages"] = res_msgs.data if res_msgs.data else []
+            messages = lead.get("messages") or []
+            if message_limit is not None:
+                messages.reverse()
+            lead["messages"] = messages
+            count = lead.pop("message_count", None)
+            lead["message_count"] = count[0]["count"] if count else len(messages)
             return lead
 
         except Exception as e:
@@ -167,6 +228,8 @@ class SupabaseAdapter(DatabasePort):
     def update_lead(self, phone: str, data: dict[str, Any]) -> None:
         try:
             self.client.table("leads").update(data).eq("customer_phone", phone).execute()
+            if self.lead_cache:
+                self.lead_cache.apply_update(phone, data)
         except Exception as e:
             logger.error("UPDATE_LEAD_FAILED", context={"phone": phone, "error": str(e)})
             raise DatabaseError("Failed to update lead", cause=str(e)) from e
@@ -174,6 +237,70 @@ class SupabaseAdapter(DatabasePort):
     def update_lead_status(self, phone: str, status: str) -> None:
         self.update_lead(phone, {"status": status})
 
+    def save_turn(
+        self,
+        phone: str,
+        lead_id: str,
+        messages: list[dict[str, Any]],
+        lead_update: dict[str, Any],
+    ) -> None:
+        check_turn_update(lead_update)
+        # Rows (and their ids) are built once, so every retry writes the same ids
+        rows = [self._message_row(lead_id, msg) for msg in messages]
+        self._write_turn(phone, lead_id, rows, lead_update)
+        self._record_turn(phone, lead_id, rows, lead_update)
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    def _write_turn(
+        self,
+        phone: str,
+        lead_id: str,
+        rows: list[dict[str, Any]],
+        lead_update: dict[str, Any],
+    ) -> None:
+        """Writes a turn; safe to retry because messages already stored are skipped."""
+        try:
+            # One transaction: ordered bulk insert of messages + lead update
+            self.client.rpc(
+                "save_conversation_turn",
+                {
+                    "p_lead_id": lead_id,
+                    "p_phone": phone,
+                    "p_messages": rows,
+                    "p_lead_update": lead_update,
+                },
+            ).execute()
+            return
+        except Exception as e:
+            # Only use the non-transactional two-statement path when the function
+            # isn't deployed yet
+            if "PGRST202" not in str(e):
+                logger.error("SAVE_TURN_FAILED", context={"phone": phone, "error": str(e)})
+                raise DatabaseError("Failed to save conversation turn", cause=str(e)) from e
+            logger.warning("SAVE_TURN_RPC_MISSING", context={"phone": phone})
+
+        try:
+            if rows:
+                self.client.table("messages").upsert(
+                    rows, on_conflict="id", ignore_duplicates=True
+                ).execute()
+            if lead_update:
+                self.client.table("leads").update(lead_update).eq("customer_phone", phone).execute()
+        except Exception as e:
+            logger.error("SAVE_TURN_FAILED", context={"phone": phone, "error": str(e)})
+            raise DatabaseError("Failed to save conversation turn", cause=str(e)) from e
+
+    def _record_turn(
+        self,
+        phone: str,
+        lead_id: str,
+        rows: list[dict[str, Any]],
+        lead_update: dict[str, Any],
+    ) -> None:
+        if self.lead_cache:
+            self.lead_cache.add_messages(lead_id, rows, phone=phone)
+            self.lead_cache.apply_update(phone, lead_update)
+
     def update_property(self, property_id: str, data: dict[str, Any]) -> None:
         try:
             self.client.table("properties").update(data).eq("id", property_id).execute()
@@ -181,7 +308,19 @@ class SupabaseAdapter(DatabasePort):
             logger.error("UPDATE_PROPERTY_FAILED", context={"id": property_id, "error": str(e)})
             raise DatabaseError("Failed to update property", cause=str(e)) from e
 
-    def get_cached_response(self, embedding: list[float], threshold: float = 0.9) -> str | None:
+    def get_cached_response(
+        self,
+        embedding: list[float],
+        threshold: float = 0.9,
+        *,
+        tenant_id: str | None = None,
+        language: str | None = None,
+    ) -> str | None:
+        # A loaded index answers locally; hits and misses both skip the RPC
+        if self.semantic_index is not None and self.semantic_index.ready:
+            return self.semantic_index.lookup(
+                embedding, tenant_id=tenant_id, language=language, threshold=threshold
+            )
         try:
             res = self.client.rpc(
                 "match_cache",
@@ -195,52 +334,160 @@ class SupabaseAdapter(DatabasePort):
             logger.error("GET_CACHE_FAILED", context={"error": str(e)})
             return None
 
-    def save_to_cache(self, query: str, embedding: list[float], response: str) -> None:
+    def save_to_cache(
+        self,
+        query: str,
+        embedding: list[float],
+        response: str,
+        *,
+        tenant_id: str | None = None,
+        language: str | None = None,
+    ) -> None:
+        if self.semantic_index is not None:
+            self.semantic_index.add(
+                query, embedding, response, tenant_id=tenant_id, language=language
+            )
+        row: dict[str, Any] = {
+            "query_text": query,
+            "query_embedding": embedding,
+            "response_text": response,
+            "updated_at": datetime.now(UTC).isoformat(),
+        }
+        if tenant_id:
+            row["tenant_id"] = tenant_id
+        if language:
+            row["language"] = language
         try:
-            self.client.table("semantic_cache").upsert(
-                {
-                    "query_text": query,
-                    "query_embedding": embedding,
-                    "response_text": response,
-                    "updated_at": datetime.now(UTC).isoformat(),
-                },
-                on_conflict="query_text",
-            ).execute()
+            self.client.table("semantic_cache").upsert(row, on_conflict="query_text").execute()
         except Exception as e:
             logger.error("SAVE_CACHE_FAILED", context={"error": str(e)})
 
     def get_market_stats(self, zone: str) -> dict[str, Any]:
         """
         Fetches competitive market stats for a given zone.
+
+        Results are cached for MARKET_STATS_TTL_SECONDS and concurrent misses
+        for the same zone share one aggregate query.
         """
+        cache_key = f"market_stats:{zone.strip().lower()}"
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            if cached:
+                return cast(dict[str, Any], json.loads(cached))
+
+        return self._market_stats_flight.run(
+            cache_key, lambda: self._load_market_stats(zone, cache_key)
+        )
+
+    def _load_market_stats(self, zone: str, cache_key: str) -> dict[str, Any]:
+        try:
+            stats = self.get_market_aggregates(zone=zone)
+        except Exception as e:
+            logger.error("GET_MARKET_STATS_FAILED", context={"zone": zone, "error": str(e)})
+            return {}
+        if not stats["listings_count"]:
+            return {}
+        result = {"zone": zone, **stats}
+        if self.cache:
+            self.cache.set(cache_key, json.dumps(result, default=str), ttl=MARKET_STATS_TTL_SECONDS)
+        return result
+
+    def get_market_aggregates(
+        self,
+        zone: str | None = None,
+        city: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> dict[str, Any]:
+        params = {
+            "p_zone": zone,
+            "p_city": city,
+            "p_since": since.isoformat() if since else None,
+            "p_until": until.isoformat() if until else None,
+        }
         try:
-            # We fetch all listings in the zone to calculate accurate stats
-            # In a larger DB, we'd use a postgres function (RPC) for this.
+            res = self.client.rpc("market_zone_stats", params).execute()
+            rows = cast(list[dict[str, Any]], res.data)
+            row = rows[0] if rows else {}
+            return {key: row.get(key) or 0 for key in MARKET_STAT_KEYS}
+        except Exception as e:
+            # Older databases without the function aggregate client-side
+            if "PGRST202" not in str(e):
+                logger.error("MARKET_AGGREGATES_FAILED", context={**params, "error": str(e)})
+                raise DatabaseError("Failed to aggregate market data", cause=str(e)) from e
+            logger.warning("MARKET_STATS_RPC_MISSING", context=params)
+            return self._aggregate_market_rows(zone, city, since, until)
+
+    def _aggregate_market_rows(
+        self,
+        zone: str | None,
+        city: str | None,
+        since: datetime | None,
+        until: datetime | None,
+    ) -> dict[str, Any]:
+        query = self.client.table("market_data").select("price, price_per_mq")
+        if zone:
+            query = query.ilike("zone", f"%{zone}%")
+        if city:
+            query = query.eq("city", city)
+        if since:
+            query = query.gte("created_at", since.isoformat())
+        if until:
+            query = query.lt("created_at", until.isoformat())
+        data = cast(list[dict[str, Any]], query.execute().data)
+
+        per_mq = sorted(float(d["price_per_mq"]) for d in data if (d.get("price_per_mq") or 0) > 0)
+        prices = [float(d["price"]) for d in data if (d.get("price") or 0) > 0]
+        stats: dict[str, Any] = dict.fromkeys(MARKET_STAT_KEYS, 0)
+        stats["listings_count"] = len(data)
+        stats["sample_size"] = len(per_mq)
+        if per_mq:
+            q1, median, q3 = (
+                statistics.quantiles(per_mq, n=4, method="inclusive")
+                if len(per_mq) > 1
+                else [per_mq[0]] * 3
+            )
+            stats.update(
+                avg_price_sqm=round(statistics.fmean(per_mq), 2),
+                median_price_sqm=round(median, 2),
+                p25_price_sqm=round(q1, 2),
+                p75_price_sqm=round(q3, 2),
+                min_price_sqm=round(per_mq[0], 2),
+                max_price_sqm=round(per_mq[-1], 2),
+            )
+        if prices:
+            stats["avg_price"] = round(statistics.fmean(prices), 2)
+        return stats
+
+    def get_property_interest_stats(
+        self, property_id: str, hot_threshold: int = 50
+    ) -> dict[str, int]:
+        params = {"p_property_id": property_id, "p_hot_threshold": hot_threshold}
+        try:
+            res = self.client.rpc("property_interest_stats", params).execute()
+            rows = cast(list[dict[str, Any]], res.data)
+            row = rows[0] if rows else {}
+            return {key: int(row.get(key) or 0) for key in INTEREST_STAT_KEYS}
+        except Exception as e:
+            if "PGRST202" not in str(e):
+                logger.error("PROPERTY_INTEREST_STATS_FAILED", context={**params, "error": str(e)})
+                raise DatabaseError("Failed to count interested leads", cause=str(e)) from e
+            # Older databases without the function: same containment filter, counted here
+            logger.warning("PROPERTY_INTEREST_RPC_MISSING", context=params)
             res = (
-                self.client.table("market_data")
-                .select("price, sqm, price_per_mq")
-                .ilike("zone", f"%{zone}%")
+                self.client.table("leads")
+                .select("score, journey_state")
+                .contains("metadata", {"interested_property_ids": [property_id]})
                 .execute()
             )
-            data = cast(list[dict[str, Any]], res.data)
-
-            if not data:
-                return {}
-
-            total_listings = len(data)
-            prices_per_mq = [d["price_per_mq"] for d in data if d.get("price_per_mq")]
-
-            avg_price_mq = sum(prices_per_mq) / len(prices_per_mq) if prices_per_mq else 0
-
+            leads = cast(list[dict[str, Any]], res.data or [])
             return {
-                "zone": zone,
-                "avg_price_sqm": round(avg_price_mq, 2),
-                "listings_count": total_listings,
-                "sample_size": len(prices_per_mq),
+                "total_leads": len(leads),
+                "hot_leads": sum(1 for lead in leads if (lead.get("score") or 0) >= hot_threshold),
+                "scheduled_viewings": sum(
+                    1 for lead in leads if lead.get("journey_state") == "SCHEDULED"
+                ),
             }
-        except Exception as e:
-            logger.error("GET_MARKET_STATS_FAILED", context={"zone": zone, "error": str(e)})
-            return {}
 
     def update_message_status(self, sid: str, status: str) -> None:
         try:
@@ -316,6 +563,8 @@ class SupabaseAdapter(DatabasePort):
             self.client.table("leads").update({"assigned_agent_id": agent_id}).eq(
                 "id", lead_id
             ).execute()
+            if self.lead_cache:
+                self.lead_cache.apply_update_by_id(lead_id, {"assigned_agent_id": agent_id})
             logger.info("LEAD_ASSIGNED", context={"lead_id": lead_id, "agent_id": agent_id})
         except Exception as e:
             logger.error(
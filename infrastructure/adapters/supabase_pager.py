@@ -0,0 +1,174 @@
+"""
+Supabase Pager
+Streams large table reads in keyset-paginated pages instead of one unbounded select.
+"""
+
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, cast
+
+from supabase import Client
+
+DEFAULT_PAGE_SIZE = 1000
+TIEBREAK_KEY = "id"
+# How far incremental scans re-read behind the newest `updated_at` already seen
+DEFAULT_OVERLAP_SECONDS = 120
+
+# Applies filters to a PostgREST query builder, e.g. `lambda q: q.gte("created_at", cutoff)`
+QueryFilter = Callable[[Any], Any]
+
+
+def _columns_with_keys(columns: str, key: str) -> str:
+    if columns.strip() == "*":
+        return columns
+    selected = [c.strip() for c in columns.split(",") if c.strip()]
+    for needed in (key, TIEBREAK_KEY):
+        if needed not in selected:
+            selected.append(needed)
+    return ", ".join(selected)
+
+
+def _after(query: Any, key: str, cursor: tuple[Any, Any], descending: bool) -> Any:
+    """Restricts `query` to rows strictly past `cursor` in (key, id) order."""
+    op = "lt" if descending else "gt"
+    last_key, last_id = cursor
+    if key == TIEBREAK_KEY:
+        return getattr(query, op)(key, last_id)
+    return query.or_(
+        f'{key}.{op}."{last_key}",and({key}.eq."{last_key}",{TIEBREAK_KEY}.{op}."{last_id}")'
+    )
+
+
+def iter_pages(
+    client: Client,
+    table: str,
+    columns: str,
+    *,
+    where: QueryFilter | None = None,
+    key: str = TIEBREAK_KEY,
+    descending: bool = False,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = False,
+) -> Iterator[list[dict[str, Any]]]:
+    """
+    Yields pages of `table` rows ordered by (`key`, id).
+
+    Each page resumes after the last row of the previous one, so every request
+    is an index range scan regardless of depth (no OFFSET). With `prefetch`,
+    the next page is fetched on a worker thread while the caller processes
+    the current one. Rows with a NULL `key` end the scan.
+    """
+    selected = _columns_with_keys(columns, key)
+
+    def fetch(cursor: tuple[Any, Any] | None) -> list[dict[str, Any]]:
+        query = client.table(table).select(selected)
+        if where:
+            query = where(query)
+        if cursor:
+            query = _after(query, key, cursor, descending)
+        if key != TIEBREAK_KEY:
+            query = query.order(key, desc=descending)
+        query = query.order(TIEBREAK_KEY, desc=descending).limit(page_size)
+        return cast(list[dict[str, Any]], query.execute().data or [])
+
+    def next_cursor(page: list[dict[str, Any]]) -> tuple[Any, Any] | None:
+        if len(page) < page_size:
+            return None
+        last = page[-1]
+        if last.get(key) is None or last.get(TIEBREAK_KEY) is None:
+            return None
+        return last[key], last[TIEBREAK_KEY]
+
+    if not prefetch:
+        cursor: tuple[Any, Any] | None = None
+        while True:
+            page = fetch(cursor)
+            if page:
+                yield page
+            cursor = next_cursor(page)
+            if cursor is None:
+                return
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"pager-{table}") as executor:
+        pending: Future[list[dict[str, Any]]] | None = executor.submit(fetch, None)
+        while pending is not None:
+            page = pending.result()
+            cursor = next_cursor(page)
+            pending = executor.submit(fetch, cursor) if cursor else None
+            if page:
+                yield page
+
+
+def iter_rows(
+    client: Client,
+    table: str,
+    columns: str,
+    *,
+    where: QueryFilter | None = None,
+    key: str = TIEBREAK_KEY,
+    descending: bool = False,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """Row-at-a-time view of `iter_pages`; memory stays bounded by one or two pages."""
+    for page in iter_pages(
+        client,
+        table,
+        columns,
+        where=where,
+        key=key,
+        descending=descending,
+        page_size=page_size,
+        prefetch=prefetch,
+    ):
+        yield from page
+
+
+def parse_timestamp(value: Any) -> datetime | None:
+    """PostgREST timestamptz values ("...Z" or "...+00:00") as aware datetimes."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+class ChangeWatermark:
+    """
+    Tracks how far an incremental `updated_at` scan has read.
+
+    `updated_at` is stamped when a transaction starts, so a row can commit
+    after rows with later timestamps were already read. Scans therefore start
+    `overlap_seconds` before the newest timestamp seen (`since`), and `accept`
+    drops rows whose (id, updated_at) were already applied.
+    """
+
+    def __init__(self, overlap_seconds: float = DEFAULT_OVERLAP_SECONDS):
+        self.overlap = timedelta(seconds=overlap_seconds)
+        self.latest: datetime | None = None
+        # id -> updated_at of rows applied inside the overlap window
+        self._seen: dict[Any, datetime] = {}
+
+    def since(self) -> str | None:
+        """Lower bound (inclusive) for the next scan, or None before the first row."""
+        return (self.latest - self.overlap).isoformat() if self.latest else None
+
+    def accept(self, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Returns the rows not applied yet and advances the watermark past them."""
+        fresh = []
+        for row in rows:
+            updated_at = parse_timestamp(row.get("updated_at"))
+            if updated_at is None:
+                fresh.append(row)
+                continue
+            if self._seen.get(row.get(TIEBREAK_KEY)) == updated_at:
+                continue
+            self._seen[row.get(TIEBREAK_KEY)] = updated_at
+            if self.latest is None or updated_at > self.latest:
+                self.latest = updated_at
+            fresh.append(row)
+        if self.latest is not None:
+            cutoff = self.latest - self.overlap
+            self._seen = {k: v for k, v in self._seen.items() if v >= cutoff}
+        return fresh
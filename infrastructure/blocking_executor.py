@@ -0,0 +1,104 @@
+"""
+Execution layer for blocking service calls made from async API routes.
+
+Runs synchronous work (Supabase, Perplexity, Mistral, PDF rendering) on a
+bounded thread pool so a slow call never stalls the event loop, and caps how
+many calls each route may run at once.
+"""
+
+import asyncio
+import contextvars
+import functools
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from infrastructure.logging import get_logger
+from infrastructure.metrics.prometheus import (
+    blocking_calls_in_flight,
+    blocking_calls_queue_depth,
+)
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 16
+DEFAULT_ROUTE_LIMIT = 4
+
+# Max concurrent calls per route (the rest wait in the queue)
+ROUTE_LIMITS = {
+    "appraisal": 8,
+    "appraisal_pdf": 2,
+    "sales_report": 2,
+    "outreach": 4,
+}
+
+
+class BlockingCallExecutor:
+    """Bounded thread pool with per-route concurrency limits."""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        route_limits: dict[str, int] | None = None,
+    ) -> None:
+        self.max_workers = max_workers
+        self.route_limits = {**ROUTE_LIMITS, **(route_limits or {})}
+        self._pool: ThreadPoolExecutor | None = None
+        # Semaphores are bound to an event loop, so keep one set per loop
+        self._semaphores: dict[tuple[int, str], asyncio.Semaphore] = {}
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="blocking"
+            )
+        return self._pool
+
+    def _semaphore(self, route: str) -> asyncio.Semaphore:
+        key = (id(asyncio.get_running_loop()), route)
+        if key not in self._semaphores:
+            limit = self.route_limits.get(route, DEFAULT_ROUTE_LIMIT)
+            self._semaphores[key] = asyncio.Semaphore(limit)
+        return self._semaphores[key]
+
+    async def run(self, route: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Runs `func(*args, **kwargs)` on the pool without blocking the event loop.
+
+        Args:
+            route: Route name used for the concurrency limit and metrics
+            func: Blocking callable
+        """
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()
+        call = functools.partial(ctx.run, func, *args, **kwargs)
+
+        blocking_calls_queue_depth.labels(route=route).inc()
+        queued = True
+        try:
+            async with self._semaphore(route):
+                blocking_calls_queue_depth.labels(route=route).dec()
+                queued = False
+                blocking_calls_in_flight.labels(route=route).inc()
+                try:
+                    return await loop.run_in_executor(self.pool, call)
+                finally:
+                    blocking_calls_in_flight.labels(route=route).dec()
+        finally:
+            if queued:
+                blocking_calls_queue_depth.labels(route=route).dec()
+
+    def shutdown(self) -> None:
+        """Stops the pool (called from the API lifespan on shutdown)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self._semaphores.clear()
+        logger.info("BLOCKING_EXECUTOR_SHUTDOWN")
+
+
+# Global singleton instance
+blocking_executor = BlockingCallExecutor()
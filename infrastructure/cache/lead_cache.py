@@ -0,0 +1,157 @@
+"""Read-through cache for lead rows, keyed by phone."""
+
+import copy
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from domain.ports import CachePort
+from infrastructure.logging import get_logger
+from infrastructure.metrics import cache_hits_total, cache_misses_total
+
+logger = get_logger(__name__)
+
+DEFAULT_TTL_SECONDS = 30
+
+# Identity map for the message currently being processed: phone -> entry
+_request_leads: ContextVar[dict[str, dict[str, Any]] | None] = ContextVar(
+    "request_leads", default=None
+)
+
+
+@contextmanager
+def lead_request_scope() -> Iterator[None]:
+    """Gives the enclosed block its own identity map, dropped on exit."""
+    token = _request_leads.set({})
+    try:
+        yield
+    finally:
+        _request_leads.reset(token)
+
+
+def _serve(entry: dict[str, Any], message_limit: int | None) -> dict[str, Any] | None:
+    """Returns a copy of the cached lead if it holds enough messages for `message_limit`."""
+    lead: dict[str, Any] = entry["lead"]
+    cached_limit = entry["message_limit"]
+    messages = lead.get("messages") or []
+    complete = len(messages) >= (lead.get("message_count") or 0)
+    if cached_limit is not None and not complete:
+        if message_limit is None or message_limit > cached_limit:
+            return None
+
+    lead = copy.deepcopy(lead)
+    if message_limit is not None:
+        lead["messages"] = lead["messages"][-message_limit:] if message_limit else []
+    return lead
+
+
+class LeadCache:
+    """
+    Two-level cache in front of the leads table.
+
+    Inside `lead_request_scope()` a lead is fetched at most once per inbound
+    message and kept current by the adapter's own writes. A short-TTL entry in
+    the shared cache lets consecutive requests (the webhook, then the
+    background graph run) reuse one fetch; any write for the lead drops it.
+    """
+
+    def __init__(self, cache: CachePort | None = None, ttl: int = DEFAULT_TTL_SECONDS):
+        self.cache = cache
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(phone: str) -> str:
+        return f"lead:{phone}"
+
+    @staticmethod
+    def _id_key(lead_id: str) -> str:
+        return f"lead-id:{lead_id}"
+
+    def get(self, phone: str, message_limit: int | None = None) -> dict[str, Any] | None:
+        local = _request_leads.get()
+        if local is not None and phone in local:
+            lead = _serve(local[phone], message_limit)
+            if lead is not None:
+                cache_hits_total.labels(cache_type="lead_request").inc()
+                return lead
+
+        if self.cache:
+            raw = self.cache.get(self._key(phone))
+            if raw:
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    entry = None
+                lead = _serve(entry, message_limit) if entry else None
+                if lead is not None:
+                    if local is not None:
+                        local[phone] = entry
+                    cache_hits_total.labels(cache_type="lead_shared").inc()
+                    return lead
+
+        cache_misses_total.labels(cache_type="lead").inc()
+        return None
+
+    def put(self, phone: str, lead: dict[str, Any], message_limit: int | None = None) -> None:
+        entry = {"lead": copy.deepcopy(lead), "message_limit": message_limit}
+        local = _request_leads.get()
+        if local is not None:
+            local[phone] = entry
+        if self.cache:
+            try:
+                self.cache.set(self._key(phone), json.dumps(entry, default=str), ttl=self.ttl)
+                if lead.get("id"):
+                    self.cache.set(self._id_key(str(lead["id"])), phone, ttl=self.ttl)
+            except Exception as e:
+                logger.warning("LEAD_CACHE_SET_FAILED", context={"phone": phone, "error": str(e)})
+
+    def _phone_for(self, lead_id: str) -> str | None:
+        local = _request_leads.get() or {}
+        for phone, entry in local.items():
+            if str(entry["lead"].get("id")) == str(lead_id):
+                return phone
+        return self.cache.get(self._id_key(lead_id)) if self.cache else None
+
+    def _drop_shared(self, phone: str) -> None:
+        if self.cache:
+            try:
+                self.cache.delete(self._key(phone))
+            except Exception as e:
+                logger.warning(
+                    "LEAD_CACHE_DELETE_FAILED", context={"phone": phone, "error": str(e)}
+                )
+
+    def invalidate(self, phone: str) -> None:
+        """Forgets the lead in both tiers."""
+        local = _request_leads.get()
+        if local is not None:
+            local.pop(phone, None)
+        self._drop_shared(phone)
+
+    def apply_update(self, phone: str, data: dict[str, Any]) -> None:
+        """Records a column update: patches this request's copy, drops the shared one."""
+        local = _request_leads.get()
+        if local is not None and phone in local:
+            local[phone]["lead"].update(copy.deepcopy(data))
+        self._drop_shared(phone)
+
+    def apply_update_by_id(self, lead_id: str, data: dict[str, Any]) -> None:
+        phone = self._phone_for(lead_id)
+        if phone:
+            self.apply_update(phone, data)
+
+    def add_messages(
+        self, lead_id: str, rows: list[dict[str, Any]], phone: str | None = None
+    ) -> None:
+        """Records inserted message rows for the lead."""
+        phone = phone or self._phone_for(lead_id)
+        if not phone:
+            return
+        local = _request_leads.get()
+        if local is not None and phone in local:
+            lead = local[phone]["lead"]
+            lead["messages"] = [*(lead.get("messages") or []), *copy.deepcopy(rows)]
+            lead["message_count"] = (lead.get("message_count") or 0) + len(rows)
+        self._drop_shared(phone)
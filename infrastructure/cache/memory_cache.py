@@ -0,0 +1,141 @@
+"""
+Bounded in-process cache with TTL expiry and LRU eviction.
+
+Backs InMemoryCacheAdapter and PerplexityCache so a worker running without
+Redis keeps a fixed memory ceiling instead of growing a dict forever.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from infrastructure.logging import get_logger
+from infrastructure.metrics import cache_evictions_total, cache_hits_total, cache_misses_total
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 3600
+SWEEP_INTERVAL_SECONDS = 60
+
+
+def _sizeof(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value.encode())
+    if isinstance(value, tuple):
+        return sum(_sizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class BoundedTTLCache:
+    """
+    Thread-safe LRU cache bounded by entry count and approximate value bytes.
+
+    Expired entries are dropped when read and by a full sweep at most every
+    `sweep_interval` seconds (run inline by whichever call notices it is due),
+    so idle keys don't hold memory until they happen to be read again. When a
+    write would exceed either bound, least recently used entries are evicted.
+    With `cache_type` set, hits, misses and evictions are counted under that
+    label.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        default_ttl: float = DEFAULT_TTL_SECONDS,
+        *,
+        cache_type: str | None = None,
+        sweep_interval: float = SWEEP_INTERVAL_SECONDS,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.cache_type = cache_type
+        self.sweep_interval = sweep_interval
+        # key -> (value, expires_at, size)
+        self._entries: OrderedDict[str, tuple[Any, float, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + sweep_interval
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _sweep_if_due(self, now: float) -> None:
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + self.sweep_interval
+        expired = [key for key, (_, expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            self._remove(key)
+        if expired:
+            logger.info(
+                "CACHE_SWEPT",
+                context={"cache_type": self.cache_type, "expired": len(expired)},
+            )
+
+    def _count(self, metric: Any, amount: int = 1) -> None:
+        if self.cache_type and amount:
+            metric.labels(cache_type=self.cache_type).inc(amount)
+
+    def get(self, key: str) -> Any | None:
+        now = time.monotonic()
+        with self._lock:
+            self._sweep_if_due(now)
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= now:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self._count(cache_misses_total)
+                return None
+            self._entries.move_to_end(key)
+            self._count(cache_hits_total)
+            return entry[0]
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        now = time.monotonic()
+        size = _sizeof(value)
+        if size > self.max_bytes:
+            logger.warning(
+                "CACHE_VALUE_TOO_LARGE",
+                context={"cache_type": self.cache_type, "key": key[:32], "bytes": size},
+            )
+            return
+        with self._lock:
+            self._sweep_if_due(now)
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, now + (self.default_ttl if ttl is None else ttl), size)
+            self._bytes += size
+
+            evicted = 0
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                evicted += 1
+            self._count(cache_evictions_total, evicted)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            return count
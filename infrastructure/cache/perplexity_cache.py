@@ -1,10 +1,10 @@
 import hashlib
-import json
 from datetime import datetime, timedelta
 from typing import Any
 
+from domain.property_search import comparables_query_key
+from infrastructure.cache.memory_cache import BoundedTTLCache
 from infrastructure.logging import get_logger
-from infrastructure.metrics import cache_hits_total, cache_misses_total
 
 logger = get_logger(__name__)
 
@@ -15,27 +15,28 @@ class PerplexityCache:
     Reduces API costs and improves response time for repeated queries.
     """
 
-    def __init__(self, ttl_hours: int = 24):
+    def __init__(self, ttl_hours: int = 24, max_entries: int = 1000):
         """
         Initialize cache with specified TTL.
 
         Args:
             ttl_hours: Time-to-live in hours (default: 24)
+            max_entries: Least recently used responses are evicted beyond this
         """
-        self._cache: dict[str, tuple[str, datetime]] = {}
         self._ttl = timedelta(hours=ttl_hours)
-        logger.info("CACHE_INITIALIZED", context={"ttl_hours": ttl_hours})
+        # (response, stored_at) per key; expiry, sweeping and hit/miss metrics live here
+        self._cache = BoundedTTLCache(
+            max_entries=max_entries,
+            default_ttl=self._ttl.total_seconds(),
+            cache_type="memory",
+        )
+        logger.info(
+            "CACHE_INITIALIZED", context={"ttl_hours": ttl_hours, "max_entries": max_entries}
+        )
 
     def _generate_key(self, city: str, zone: str, property_type: str, surface_sqm: int) -> str:
-        """Generate cache key from query parameters."""
-        # Normalize inputs for consistent caching
-        key_data = {
-            "city": city.lower().strip(),
-            "zone": zone.strip(),
-            "property_type": property_type.lower().strip(),
-            "surface_sqm": surface_sqm,
-        }
-        key_string = json.dumps(key_data, sort_keys=True)
+        """Cache key shared by equivalent queries (normalized city/zone/type, size band)."""
+        key_string = comparables_query_key(city, zone, property_type, surface_sqm)
         return hashlib.md5(key_string.encode()).hexdigest()
 
     def get(self, city: str, zone: str, property_type: str, surface_sqm: int) -> str | None:
@@ -47,33 +48,26 @@ class PerplexityCache:
         """
         key = self._generate_key(city, zone, property_type, surface_sqm)
 
-        if key in self._cache:
-            value, timestamp = self._cache[key]
+        entry = self._cache.get(key)
+        if entry is not None:
+            value, timestamp = entry
             age = datetime.now() - timestamp
+            logger.info(
+                "CACHE_HIT",
+                context={
+                    "key": key[:8],
+                    "age_minutes": int(age.total_seconds() / 60),
+                },
+            )
+            return str(value)
 
-            if age < self._ttl:
-                cache_hits_total.labels(cache_type="memory").inc()
-                logger.info(
-                    "CACHE_HIT",
-                    context={
-                        "key": key[:8],
-                        "age_minutes": int(age.total_seconds() / 60),
-                    },
-                )
-                return value
-            else:
-                # Expired - remove from cache
-                del self._cache[key]
-                logger.info("CACHE_EXPIRED", context={"key": key[:8]})
-
-        cache_misses_total.labels(cache_type="memory").inc()
         logger.info("CACHE_MISS", context={"key": key[:8]})
         return None
 
     def set(self, city: str, zone: str, property_type: str, surface_sqm: int, value: str) -> None:
         """Store response in cache with current timestamp."""
         key = self._generate_key(city, zone, property_type, surface_sqm)
-        self._cache[key] = (value, datetime.now())
+        self._cache.set(key, (value, datetime.now()))
         logger.info(
             "CACHE_SET",
             context={"key": key[:8], "value_length": len(value), "cache_size": len(self._cache)},
@@ -81,13 +75,13 @@ class PerplexityCache:
 
     def clear(self) -> None:
         """Clear all cached entries."""
-        count = len(self._cache)
-        self._cache.clear()
+        count = self._cache.clear()
         logger.info("CACHE_CLEARED", context={"entries_removed": count})
 
     def get_stats(self) -> dict[str, Any]:
         """Get cache statistics."""
         return {
             "total_entries": len(self._cache),
+            "size_bytes": self._cache.size_bytes,
             "ttl_hours": self._ttl.total_seconds() / 3600,
         }
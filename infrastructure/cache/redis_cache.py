@@ -1,6 +1,6 @@
 """Redis-backed cache with fallback to in-memory cache."""
 import hashlib
-import json
+import uuid
 from datetime import timedelta
 from typing import Any, cast
 
@@ -11,29 +11,45 @@ try:
 except ImportError:
     REDIS_AVAILABLE = False
 
-from infrastructure.cache.perplexity_cache import PerplexityCache
+from config.settings import settings
+from domain.ports import CachePort
+from domain.property_search import comparables_query_key
 from infrastructure.logging import get_logger
 from infrastructure.metrics import cache_hits_total, cache_misses_total
 
 logger = get_logger(__name__)
 
+KEY_PREFIX = "perplexity:"
+# clear() swaps this namespace, which every worker's L1 drops via the invalidation channel
+GENERATION_KEY = f"{KEY_PREFIX}generation"
+GENERATION_TTL_SECONDS = int(timedelta(days=365).total_seconds())
+INITIAL_GENERATION = "0"
+
 
 class RedisPerplexityCache:
     """
-    Redis-backed cache with automatic fallback to in-memory cache.
-    Provides production-ready caching with persistence.
+    Perplexity responses on a TieredCache: a capped per-worker L1 in front of Redis.
+
+    Pass the container's shared cache to reuse its connection and invalidation
+    channel; otherwise one is built from `redis_url`. Without Redis the L1 is
+    the only tier.
     """
 
-    def __init__(self, redis_url: str | None = None, ttl_hours: int = 24):
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        ttl_hours: int = 24,
+        cache: CachePort | None = None,
+    ):
         """
         Initialize Redis cache with fallback.
 
         Args:
             redis_url: Redis connection URL (e.g., redis://localhost:6379/0)
             ttl_hours: Time-to-live in hours
+            cache: Tiered cache to store responses in (built from redis_url if omitted)
         """
         self._ttl_seconds = int(timedelta(hours=ttl_hours).total_seconds())
-        self._fallback = PerplexityCache(ttl_hours=ttl_hours)
         self._use_redis = False
 
         if redis_url and REDIS_AVAILABLE:
@@ -57,70 +73,74 @@ class RedisPerplexityCache:
                 logger.warning("REDIS_NOT_INSTALLED", context={"fallback": "in-memory"})
             logger.info("CACHE_INITIALIZED", context={"type": "in-memory", "ttl_hours": ttl_hours})
 
+        if cache is None:
+            # cache_adapter imports this package, so import it only when needed
+            from infrastructure.adapters.cache_adapter import (  # noqa: PLC0415
+                InMemoryCacheAdapter,
+                RedisAdapter,
+            )
+            from infrastructure.cache.tiered_cache import TieredCache  # noqa: PLC0415
+
+            cache = TieredCache(
+                l1=InMemoryCacheAdapter(),
+                l2=RedisAdapter(redis_url) if self._use_redis and redis_url else None,
+                l1_ttl=settings.CACHE_L1_TTL_SECONDS,
+            )
+        self._cache = cache
+
     def _generate_key(self, city: str, zone: str, property_type: str, surface_sqm: int) -> str:
-        """Generate cache key from query parameters."""
-        key_data = {
-            "city": city.lower().strip(),
-            "zone": zone.strip(),
-            "property_type": property_type.lower().strip(),
-            "surface_sqm": surface_sqm,
-        }
-        key_string = json.dumps(key_data, sort_keys=True)
+        """Cache key shared by equivalent queries (normalized city/zone/type, size band)."""
+        key_string = comparables_query_key(city, zone, property_type, surface_sqm)
         hash_key = hashlib.md5(key_string.encode()).hexdigest()
-        return f"perplexity:{hash_key}"
+        generation = self._cache.get(GENERATION_KEY) or self._seed_generation()
+        return f"{KEY_PREFIX}{generation}:{hash_key}"
+
+    def _seed_generation(self) -> str:
+        """Stores the initial generation unless a worker set one first (so L1 can hold it)."""
+        if not self._use_redis:
+            return INITIAL_GENERATION
+        try:
+            self._redis.set(GENERATION_KEY, INITIAL_GENERATION, nx=True, ex=GENERATION_TTL_SECONDS)
+        except Exception as e:
+            logger.error("REDIS_SET_ERROR", context={"error": str(e)})
+            return INITIAL_GENERATION
+        return self._cache.get(GENERATION_KEY) or INITIAL_GENERATION
 
     def get(self, city: str, zone: str, property_type: str, surface_sqm: int) -> str | None:
         """Retrieve cached response if available."""
         key = self._generate_key(city, zone, property_type, surface_sqm)
+        cache_type = "redis" if self._use_redis else "memory"
 
-        if self._use_redis:
-            try:
-                value = self._redis.get(key)
-                if value:
-                    cache_hits_total.labels(cache_type="redis").inc()
-                    logger.info("REDIS_CACHE_HIT", context={"key": key[:20]})
-                    return cast(str, value)
-                else:
-                    cache_misses_total.labels(cache_type="redis").inc()
-                    logger.info("REDIS_CACHE_MISS", context={"key": key[:20]})
-                    return None
-            except Exception as e:
-                logger.error("REDIS_GET_ERROR", context={"error": str(e)})
-                # Fallback to in-memory
-                return self._fallback.get(city, zone, property_type, surface_sqm)
-        else:
-            return self._fallback.get(city, zone, property_type, surface_sqm)
+        value = self._cache.get(key)
+        if value:
+            cache_hits_total.labels(cache_type=cache_type).inc()
+            logger.info("REDIS_CACHE_HIT", context={"key": key[:20]})
+            return cast(str, value)
+        cache_misses_total.labels(cache_type=cache_type).inc()
+        logger.info("REDIS_CACHE_MISS", context={"key": key[:20]})
+        return None
 
     def set(self, city: str, zone: str, property_type: str, surface_sqm: int, value: str) -> None:
         """Store response in cache."""
         key = self._generate_key(city, zone, property_type, surface_sqm)
-
-        if self._use_redis:
-            try:
-                self._redis.setex(key, self._ttl_seconds, value)
-                logger.info(
-                    "REDIS_CACHE_SET", context={"key": key[:20], "value_length": len(value)}
-                )
-            except Exception as e:
-                logger.error("REDIS_SET_ERROR", context={"error": str(e)})
-                # Fallback to in-memory
-                self._fallback.set(city, zone, property_type, surface_sqm, value)
-        else:
-            self._fallback.set(city, zone, property_type, surface_sqm, value)
+        self._cache.set(key, value, ttl=self._ttl_seconds)
+        logger.info("REDIS_CACHE_SET", context={"key": key[:20], "value_length": len(value)})
 
     def clear(self) -> None:
-        """Clear all cached entries."""
+        """Clear all cached entries, on every worker."""
+        # A new generation orphans every key; peers drop their L1 copy of the old one
+        self._cache.set(GENERATION_KEY, uuid.uuid4().hex, ttl=GENERATION_TTL_SECONDS)
+        keys_removed = 0
         if self._use_redis:
             try:
-                # Delete all keys matching pattern
-                keys = self._redis.keys("perplexity:*")
+                # Reclaim the orphaned entries now instead of waiting for their TTL
+                keys = [k for k in self._redis.keys(f"{KEY_PREFIX}*") if k != GENERATION_KEY]
                 if keys:
                     self._redis.delete(*keys)
-                logger.info("REDIS_CACHE_CLEARED", context={"keys_removed": len(keys)})
+                keys_removed = len(keys)
             except Exception as e:
                 logger.error("REDIS_CLEAR_ERROR", context={"error": str(e)})
-        else:
-            self._fallback.clear()
+        logger.info("REDIS_CACHE_CLEARED", context={"keys_removed": keys_removed})
 
     def get_stats(self) -> dict[str, Any]:
         """Get cache statistics."""
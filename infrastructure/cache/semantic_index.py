@@ -0,0 +1,381 @@
+"""
+Semantic Cache Index
+In-process nearest-neighbour lookup over `semantic_cache`, so cache checks
+don't need a `match_cache` round trip per message.
+"""
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import numpy as np
+from supabase import Client
+
+from infrastructure.adapters.supabase_pager import ChangeWatermark, iter_rows
+from infrastructure.logging import get_logger
+from infrastructure.metrics import (
+    cache_evictions_total,
+    cache_hit_rate,
+    cache_hits_total,
+    cache_misses_total,
+    semantic_cache_entries,
+)
+
+logger = get_logger(__name__)
+
+CACHE_TYPE = "semantic"
+INDEX_COLUMNS = "id, query_text, query_embedding, response_text, tenant_id, language, updated_at"
+PAGE_SIZE = 500
+DEFAULT_THRESHOLD = 0.9
+DEFAULT_MAX_ENTRIES = 20_000
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_REFRESH_SECONDS = 60
+INITIAL_CAPACITY = 64
+# Share of evicted slots that triggers rebuilding a partition's matrix
+COMPACT_RATIO = 0.25
+# Evict this share of entries at once so a full cache doesn't scan on every write
+EVICT_BATCH_RATIO = 0.05
+
+Scope = tuple[str | None, str | None]
+
+
+@dataclass
+class _Entry:
+    query: str
+    response: str
+    stored_at: float
+    last_used: float
+
+
+def _parse_embedding(value: Any) -> np.ndarray | None:
+    """PostgREST returns pgvector columns as "[0.1,0.2,...]" strings."""
+    if isinstance(value, str):
+        value = json.loads(value)
+    if not value:
+        return None
+    return np.asarray(value, dtype=np.float32)
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray | None:
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else None
+
+
+def _timestamp(value: Any) -> float:
+    if not value:
+        return time.time()
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+
+
+class _Partition:
+    """
+    Unit vectors of one (tenant, language) scope in a growable float32 matrix.
+
+    Readers take `view` (matrix, stored_at, entries, size) without locking:
+    rows below `size` are only ever overwritten in place or zeroed, and
+    compaction swaps in new arrays, so a reader always sees a consistent
+    snapshot. `stored_at` mirrors each entry's timestamp (-inf once removed)
+    so lookups can skip expired rows without touching the entries.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._lock = threading.Lock()
+        self._slots: dict[str, int] = {}
+        self._dead = 0
+        self.view: tuple[np.ndarray, np.ndarray, list[_Entry | None], int] = (
+            np.zeros((INITIAL_CAPACITY, dim), dtype=np.float32),
+            np.full(INITIAL_CAPACITY, -np.inf),
+            [],
+            0,
+        )
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.view[0].nbytes)
+
+    def put(self, vector: np.ndarray, entry: _Entry) -> None:
+        with self._lock:
+            matrix, stored_at, entries, size = self.view
+            slot = self._slots.get(entry.query)
+            if slot is not None:
+                matrix[slot] = vector
+                stored_at[slot] = entry.stored_at
+                entries[slot] = entry
+                return
+            if size == len(matrix):
+                grown = np.zeros((len(matrix) * 2, self.dim), dtype=np.float32)
+                grown[:size] = matrix[:size]
+                matrix = grown
+                stored_at = np.concatenate([stored_at, np.full(len(stored_at), -np.inf)])
+            matrix[size] = vector
+            stored_at[size] = entry.stored_at
+            entries.append(entry)
+            self._slots[entry.query] = size
+            self.view = (matrix, stored_at, entries, size + 1)
+
+    def remove(self, query: str) -> bool:
+        with self._lock:
+            slot = self._slots.pop(query, None)
+            if slot is None:
+                return False
+            matrix, stored_at, entries, size = self.view
+            matrix[slot] = 0.0
+            stored_at[slot] = -np.inf
+            entries[slot] = None
+            self._dead += 1
+            if self._dead > COMPACT_RATIO * size:
+                self._compact()
+            return True
+
+    def _compact(self) -> None:
+        matrix, stored_at, entries, size = self.view
+        live = [i for i in range(size) if entries[i] is not None]
+        capacity = max(INITIAL_CAPACITY, len(live) * 2)
+        compacted = np.zeros((capacity, self.dim), dtype=np.float32)
+        compacted[: len(live)] = matrix[live]
+        compacted_stored_at = np.full(capacity, -np.inf)
+        compacted_stored_at[: len(live)] = stored_at[live]
+        kept = [entries[i] for i in live]
+        self._slots = {entry.query: i for i, entry in enumerate(kept) if entry is not None}
+        self._dead = 0
+        self.view = (compacted, compacted_stored_at, kept, len(live))
+
+    def nearest(self, query: np.ndarray, stored_after: float) -> tuple[_Entry | None, float]:
+        """Best match among entries stored after `stored_after` (older ones never match)."""
+        matrix, stored_at, entries, size = self.view
+        if not size:
+            return None, 0.0
+        scores = np.where(stored_at[:size] > stored_after, matrix[:size] @ query, -np.inf)
+        best = int(np.argmax(scores))
+        if scores[best] == -np.inf:
+            return None, 0.0
+        return entries[best], float(scores[best])
+
+    def entries(self) -> list[_Entry]:
+        _, _, entries, size = self.view
+        return [e for e in entries[:size] if e is not None]
+
+
+class SemanticCacheIndex:
+    """
+    Answers semantic cache lookups from memory.
+
+    Entries are partitioned by (tenant_id, language) and matched by cosine
+    similarity (dot product of unit vectors) against `threshold`. Entries
+    older than `ttl_seconds` never match, and past `max_entries` the least
+    recently used ones are evicted. `refresh()` loads recent rows once, then
+    only rows whose `updated_at` changed since (see ChangeWatermark), so
+    answers cached by other workers show up within `refresh_seconds`. Until the first
+    load completes `ready` is False and callers should use `match_cache`.
+    """
+
+    def __init__(
+        self,
+        db_client: Client,
+        threshold: float = DEFAULT_THRESHOLD,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        refresh_seconds: int = DEFAULT_REFRESH_SECONDS,
+    ):
+        self.db = db_client
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.refresh_seconds = refresh_seconds
+        self._partitions: dict[Scope, _Partition] = {}
+        self._partitions_lock = threading.Lock()
+        # semantic_cache.query_text is unique across scopes: a rewrite may move a query
+        self._scope_of: dict[str, Scope] = {}
+        self._watermark = ChangeWatermark()
+        self._refreshed_at: float | None = None
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+        self._lookups = 0
+        self._hits = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._refreshed_at is not None
+
+    def __len__(self) -> int:
+        return sum(len(p) for p in list(self._partitions.values()))
+
+    def _partition(self, scope: Scope, dim: int) -> _Partition | None:
+        partition = self._partitions.get(scope)
+        if partition is None:
+            with self._partitions_lock:
+                partition = self._partitions.setdefault(scope, _Partition(dim))
+        if partition.dim != dim:
+            logger.warning(
+                "SEMANTIC_CACHE_DIMENSION_MISMATCH", context={"expected": partition.dim, "got": dim}
+            )
+            return None
+        return partition
+
+    def lookup(
+        self,
+        embedding: list[float],
+        *,
+        tenant_id: str | None = None,
+        language: str | None = None,
+        threshold: float | None = None,
+    ) -> str | None:
+        """Cached response for the closest query in scope, if similar enough."""
+        self._maybe_refresh()
+        partition = self._partitions.get((tenant_id, language))
+        vector = _normalize(np.asarray(embedding, dtype=np.float32))
+        now = time.time()
+        entry, score = None, 0.0
+        if partition is not None and vector is not None and len(vector) == partition.dim:
+            entry, score = partition.nearest(vector, stored_after=now - self.ttl_seconds)
+        hit = entry is not None and score >= (threshold or self.threshold)
+
+        self._lookups += 1
+        if hit:
+            self._hits += 1
+            entry.last_used = now  # type: ignore[union-attr]
+            cache_hits_total.labels(cache_type=CACHE_TYPE).inc()
+        else:
+            cache_misses_total.labels(cache_type=CACHE_TYPE).inc()
+        cache_hit_rate.labels(cache_type=CACHE_TYPE).set(100 * self._hits / self._lookups)
+        return entry.response if hit else None  # type: ignore[union-attr]
+
+    def add(
+        self,
+        query: str,
+        embedding: list[float] | np.ndarray,
+        response: str,
+        *,
+        tenant_id: str | None = None,
+        language: str | None = None,
+        stored_at: float | None = None,
+    ) -> None:
+        vector = _normalize(np.asarray(embedding, dtype=np.float32))
+        if vector is None:
+            return
+        scope = (tenant_id, language)
+        partition = self._partition(scope, len(vector))
+        if partition is None:
+            return
+        previous = self._scope_of.get(query)
+        if previous is not None and previous != scope:
+            self._partitions[previous].remove(query)
+        self._scope_of[query] = scope
+        stored_at = stored_at or time.time()
+        partition.put(vector, _Entry(query, response, stored_at, stored_at))
+        if len(self) > self.max_entries:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drops expired entries, then the least recently used until under the bound."""
+        now = time.time()
+        candidates = [
+            (entry.last_used, entry.stored_at, scope, entry.query)
+            for scope, partition in list(self._partitions.items())
+            for entry in partition.entries()
+        ]
+        overflow = len(candidates) - self.max_entries
+        if overflow > 0:
+            overflow = max(overflow, int(self.max_entries * EVICT_BATCH_RATIO))
+        candidates.sort()
+        evicted = 0
+        for i, (_, stored_at, scope, query) in enumerate(candidates):
+            if i >= overflow and now - stored_at <= self.ttl_seconds:
+                continue
+            if self._partitions[scope].remove(query):
+                self._scope_of.pop(query, None)
+                evicted += 1
+        if evicted:
+            cache_evictions_total.labels(cache_type=CACHE_TYPE).inc(evicted)
+        semantic_cache_entries.set(len(self))
+
+    def _fetch_changes(self) -> list[dict[str, Any]]:
+        since = (
+            self._watermark.since()
+            or (datetime.now(UTC) - timedelta(seconds=self.ttl_seconds)).isoformat()
+        )
+
+        def where(query: Any) -> Any:
+            return query.gte("updated_at", since)
+
+        return list(
+            iter_rows(
+                self.db,
+                "semantic_cache",
+                INDEX_COLUMNS,
+                where=where,
+                key="updated_at",
+                page_size=PAGE_SIZE,
+            )
+        )
+
+    def refresh(self) -> int:
+        """Applies `semantic_cache` rows written since the last refresh; returns rows applied."""
+        with self._refresh_lock:
+            started = time.perf_counter()
+            changes = self._watermark.accept(self._fetch_changes())
+            for row in changes:
+                embedding = _parse_embedding(row.get("query_embedding"))
+                if embedding is not None and row.get("query_text") and row.get("response_text"):
+                    self.add(
+                        row["query_text"],
+                        embedding,
+                        row["response_text"],
+                        tenant_id=row.get("tenant_id"),
+                        language=row.get("language"),
+                        stored_at=_timestamp(row.get("updated_at")),
+                    )
+            # Expired entries never match; drop them so they don't hold memory
+            self._evict()
+            self._refreshed_at = time.time()
+
+            stats = self.stats()
+            semantic_cache_entries.set(stats["entries"])
+            logger.info(
+                "SEMANTIC_CACHE_INDEX_REFRESHED",
+                context={
+                    "changes": len(changes),
+                    "refresh_seconds": round(time.perf_counter() - started, 3),
+                    **stats,
+                },
+            )
+            return len(changes)
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning("SEMANTIC_CACHE_INDEX_REFRESH_FAILED", context={"error": str(e)})
+        finally:
+            self._refreshing = False
+
+    def _maybe_refresh(self) -> None:
+        refreshed_at = self._refreshed_at
+        if (
+            refreshed_at is not None
+            and time.time() - refreshed_at > self.refresh_seconds
+            and not self._refreshing
+        ):
+            self._refreshing = True
+            threading.Thread(
+                target=self._refresh_in_background, name="semantic-cache-index", daemon=True
+            ).start()
+
+    def stats(self) -> dict[str, Any]:
+        partitions = list(self._partitions.values())
+        latest = self._watermark.latest
+        return {
+            "ready": self.ready,
+            "partitions": len(partitions),
+            "entries": sum(len(p) for p in partitions),
+            "memory_bytes": sum(p.nbytes for p in partitions),
+            "hit_rate": round(self._hits / self._lookups, 3) if self._lookups else None,
+            "watermark": latest.isoformat() if latest else None,
+        }
@@ -0,0 +1,56 @@
+"""
+Single-flight execution of cache misses.
+
+When many callers miss the same key at once (a burst of appraisals for one
+hot zone), only the first runs the expensive computation; the rest block
+until it finishes and share its result or exception.
+"""
+
+import threading
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from infrastructure.metrics import cache_coalesced_total
+
+T = TypeVar("T")
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Coalesces concurrent `run(key, fn)` calls in this process into one `fn()`."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+
+    def run(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            cache_coalesced_total.labels(cache_type=self.name).inc()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[no-any-return]
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result  # type: ignore[no-any-return]
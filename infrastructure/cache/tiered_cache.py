@@ -0,0 +1,73 @@
+"""
+Two-tier cache: a bounded in-process L1 in front of Redis (L2).
+
+Reads are served from L1 when possible, so hot keys skip the network. Every
+write or delete is published on a Redis channel and other workers drop their
+L1 copy, which keeps L1 coherent without a short TTL; L1 entries are still
+capped at `l1_ttl` in case an invalidation message is lost.
+"""
+
+import uuid
+
+from domain.ports import CachePort
+from infrastructure.adapters.cache_adapter import RedisAdapter
+from infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+INVALIDATION_CHANNEL = "cache-invalidate"
+DEFAULT_L1_TTL_SECONDS = 60
+
+
+class TieredCache(CachePort):
+    def __init__(
+        self,
+        l1: CachePort,
+        l2: RedisAdapter | None = None,
+        l1_ttl: int = DEFAULT_L1_TTL_SECONDS,
+    ) -> None:
+        self.l1 = l1
+        self.l2 = l2 if l2 is not None and l2.available else None
+        self.l1_ttl = l1_ttl
+        # Identifies this worker's own invalidations so it doesn't drop what it just wrote
+        self._origin = uuid.uuid4().hex
+        subscribed = self.l2 is not None and self.l2.subscribe(
+            INVALIDATION_CHANNEL, self._on_invalidation
+        )
+        logger.info(
+            "TIERED_CACHE_INITIALIZED",
+            context={"l2": self.l2 is not None, "invalidation": subscribed, "l1_ttl": l1_ttl},
+        )
+
+    def _on_invalidation(self, message: str) -> None:
+        origin, _, key = message.partition(":")
+        if key and origin != self._origin:
+            self.l1.delete(key)
+
+    def _invalidate_peers(self, key: str) -> None:
+        if self.l2 is not None:
+            self.l2.publish(INVALIDATION_CHANNEL, f"{self._origin}:{key}")
+
+    def get(self, key: str) -> str | None:
+        value = self.l1.get(key)
+        if value is not None or self.l2 is None:
+            return value
+        value = self.l2.get(key)
+        if value is not None:
+            self.l1.set(key, value, ttl=self.l1_ttl)
+        return value
+
+    def set(self, key: str, value: str, ttl: int = 3600) -> None:
+        if self.l2 is None:
+            # L1 is the only tier: keep the caller's TTL
+            self.l1.set(key, value, ttl=ttl)
+            return
+        self.l2.set(key, value, ttl=ttl)
+        self.l1.set(key, value, ttl=min(ttl, self.l1_ttl))
+        self._invalidate_peers(key)
+
+    def delete(self, key: str) -> None:
+        self.l1.delete(key)
+        if self.l2 is not None:
+            self.l2.delete(key)
+            self._invalidate_peers(key)
@@ -0,0 +1,100 @@
+"""
+Shared, pooled HTTP clients for outbound AI API calls.
+
+Every ChatMistralAI / Mistral SDK instance used to open its own httpx client,
+so each graph node paid a fresh TCP + TLS handshake. This module owns one
+keep-alive client pair (sync + async) per base URL that all adapters reuse.
+"""
+
+import threading
+
+import httpx
+
+from config.settings import settings
+from infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+MISTRAL_BASE_URL = "https://api.mistral.ai/v1"
+DEFAULT_TIMEOUT_SECONDS = 120.0
+
+# Keep-alive pool sized for the API workers plus the concurrent graph branches
+POOL_LIMITS = httpx.Limits(
+    max_connections=32,
+    max_keepalive_connections=16,
+    keepalive_expiry=60.0,
+)
+
+
+class HTTPClientPool:
+    """Lazily creates and caches one sync and one async client per base URL."""
+
+    def __init__(
+        self,
+        limits: httpx.Limits = POOL_LIMITS,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    ) -> None:
+        self.limits = limits
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._clients: dict[str, httpx.Client] = {}
+        self._async_clients: dict[str, httpx.AsyncClient] = {}
+
+    @staticmethod
+    def _headers(api_key: str) -> dict[str, str]:
+        return {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "Authorization": f"Bearer {api_key}",
+        }
+
+    def client(self, base_url: str, api_key: str) -> httpx.Client:
+        with self._lock:
+            if base_url not in self._clients:
+                self._clients[base_url] = httpx.Client(
+                    base_url=base_url,
+                    headers=self._headers(api_key),
+                    limits=self.limits,
+                    timeout=self.timeout,
+                )
+            return self._clients[base_url]
+
+    def async_client(self, base_url: str, api_key: str) -> httpx.AsyncClient:
+        """
+        Async client for `base_url`.
+
+        Note: connections are bound to the event loop that opened them, so this
+        is meant for the API's single long-lived loop.
+        """
+        with self._lock:
+            if base_url not in self._async_clients:
+                self._async_clients[base_url] = httpx.AsyncClient(
+                    base_url=base_url,
+                    headers=self._headers(api_key),
+                    limits=self.limits,
+                    timeout=self.timeout,
+                )
+            return self._async_clients[base_url]
+
+    def mistral_client(self) -> httpx.Client:
+        return self.client(MISTRAL_BASE_URL, settings.MISTRAL_API_KEY)
+
+    def mistral_async_client(self) -> httpx.AsyncClient:
+        return self.async_client(MISTRAL_BASE_URL, settings.MISTRAL_API_KEY)
+
+    async def aclose(self) -> None:
+        """Closes every pooled client (called from the API lifespan on shutdown)."""
+        with self._lock:
+            clients = list(self._clients.values())
+            async_clients = list(self._async_clients.values())
+            self._clients.clear()
+            self._async_clients.clear()
+        for client in clients:
+            client.close()
+        for async_client in async_clients:
+            await async_client.aclose()
+        logger.info("HTTP_POOL_CLOSED", context={"clients": len(clients) + len(async_clients)})
+
+
+# Global singleton instance
+http_pool = HTTPClientPool()
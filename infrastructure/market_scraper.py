@@ -6,9 +6,11 @@ from typing import Any
 
 import requests
 from bs4 import BeautifulSoup
-from supabase import Client, create_client
+from supabase import Client
 
 from config.settings import settings
+from domain.property_search import property_search_keys
+from infrastructure.supabase_pool import supabase_pool
 
 logger = logging.getLogger(__name__)
 
@@ -155,14 +157,15 @@ class ImmobiliareScraper(Scraper):
 
 class MarketDataManager:
     def __init__(self, db_client: Client | None = None):
-        self.db = db_client or create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+        self.db = db_client or supabase_pool.client(key=settings.SUPABASE_KEY)
 
     def save_to_db(self, data: dict[str, Any]) -> Any:
         try:
             # We are now saving to the main inventory
             # Remove any fields that might not match if strict scheme,
             # but generally upsert is fine if the schema matches.
-            return self.db.table("properties").upsert(data, on_conflict="portal_url").execute()
+            row = {**data, **property_search_keys(data)}
+            return self.db.table("properties").upsert(row, on_conflict="portal_url").execute()
         except Exception as e:
             logger.error(f"DB Error: {e}")
             return None
@@ -2,21 +2,43 @@
 from infrastructure.metrics.prometheus import (
     appraisal_duration_seconds,
     appraisal_requests_total,
+    blocking_calls_in_flight,
+    blocking_calls_queue_depth,
+    cache_coalesced_total,
+    cache_evictions_total,
     cache_hit_rate,
     cache_hits_total,
     cache_misses_total,
+    comparables_index_memory_bytes,
+    comparables_index_refresh_lag_seconds,
+    comparables_index_rows,
+    graph_node_duration_seconds,
     lead_creation_total,
     perplexity_api_calls_total,
     perplexity_api_duration_seconds,
+    semantic_cache_entries,
+    supabase_requests_in_flight,
+    supabase_requests_queued,
 )
 
 __all__ = [
     "cache_hits_total",
     "cache_misses_total",
+    "cache_evictions_total",
+    "cache_coalesced_total",
     "cache_hit_rate",
     "perplexity_api_calls_total",
     "perplexity_api_duration_seconds",
     "appraisal_requests_total",
     "appraisal_duration_seconds",
     "lead_creation_total",
+    "blocking_calls_queue_depth",
+    "blocking_calls_in_flight",
+    "graph_node_duration_seconds",
+    "comparables_index_rows",
+    "comparables_index_memory_bytes",
+    "comparables_index_refresh_lag_seconds",
+    "semantic_cache_entries",
+    "supabase_requests_in_flight",
+    "supabase_requests_queued",
 ]
@@ -1,4 +1,5 @@
 """Prometheus metrics for monitoring application performance."""
+
 from prometheus_client import Counter, Gauge, Histogram
 
 # Cache metrics
@@ -6,6 +7,16 @@ cache_hits_total = Counter("cache_hits_total", "Total number of cache hits", ["c
 
 cache_misses_total = Counter("cache_misses_total", "Total number of cache misses", ["cache_type"])
 
+cache_evictions_total = Counter(
+    "cache_evictions_total", "Entries evicted to stay within cache bounds", ["cache_type"]
+)
+
+cache_coalesced_total = Counter(
+    "cache_coalesced_total",
+    "Cache misses that waited for a concurrent computation instead of repeating it",
+    ["cache_type"],
+)
+
 cache_hit_rate = Gauge("cache_hit_rate", "Cache hit rate percentage", ["cache_type"])
 
 # Perplexity API metrics
@@ -30,3 +41,45 @@ appraisal_duration_seconds = Histogram(
 
 # Lead creation metrics
 lead_creation_total = Counter("lead_creation_total", "Total leads created", ["source"])
+
+# Blocking call executor metrics (sync work offloaded from async routes)
+blocking_calls_queue_depth = Gauge(
+    "blocking_calls_queue_depth", "Blocking calls waiting for a worker slot", ["route"]
+)
+
+blocking_calls_in_flight = Gauge(
+    "blocking_calls_in_flight", "Blocking calls currently running", ["route"]
+)
+
+# Conversation graph metrics
+graph_node_duration_seconds = Histogram(
+    "graph_node_duration_seconds",
+    "Lead processing graph node duration in seconds",
+    ["node"],
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0],
+)
+
+# In-memory comparables index metrics
+comparables_index_rows = Gauge("comparables_index_rows", "Listings held in the comparables index")
+
+comparables_index_memory_bytes = Gauge(
+    "comparables_index_memory_bytes", "Approximate memory held by the comparables index"
+)
+
+comparables_index_refresh_lag_seconds = Gauge(
+    "comparables_index_refresh_lag_seconds", "Seconds since the comparables index last refreshed"
+)
+
+# In-memory semantic cache index metrics
+semantic_cache_entries = Gauge(
+    "semantic_cache_entries", "Responses held in the semantic cache index"
+)
+
+# Shared Supabase HTTP session metrics
+supabase_requests_in_flight = Gauge(
+    "supabase_requests_in_flight", "Supabase HTTP requests currently running"
+)
+
+supabase_requests_queued = Gauge(
+    "supabase_requests_queued", "Supabase HTTP requests waiting for a pool slot"
+)
@@ -0,0 +1,145 @@
+"""Compiled feature encoder shared by AVM training and inference.
+
+The encoder is built once from a model's `feature_names` (or fitted on training
+data) and maps every property straight into a float32 row using a precomputed
+column-index map, so serving never rebuilds category lists per request.
+"""
+
+import threading
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+from infrastructure.logging import get_logger
+
+if TYPE_CHECKING:
+    from .feature_engineering import PropertyFeatures
+
+logger = get_logger(__name__)
+
+NUMERIC_FEATURES = ["sqm", "bedrooms", "bathrooms", "floor", "property_age_years"]
+BOOLEAN_FEATURES = ["has_elevator", "has_balcony", "has_garden"]
+CATEGORICAL_FEATURES = ["zone_slug", "condition", "energy_class", "cadastral_category"]
+
+# Used when a value is missing (mirrors PropertyFeatures defaults)
+DEFAULT_VALUES: dict[str, float] = {
+    "sqm": 0.0,
+    "bedrooms": 1.0,
+    "bathrooms": 1.0,
+    "floor": 0.0,
+    "property_age_years": 30.0,
+    "has_elevator": 0.0,
+    "has_balcony": 0.0,
+    "has_garden": 0.0,
+}
+
+
+class FeatureEncoder:
+    """
+    Encodes PropertyFeatures into the column order a model was trained on.
+    One-hot levels come from `feature_names`, so retrained models with new
+    zones are picked up without code changes.
+    """
+
+    def __init__(self, feature_names: list[str], defaults: dict[str, float] | None = None) -> None:
+        self.feature_names = list(feature_names)
+        self.defaults = {**DEFAULT_VALUES, **(defaults or {})}
+        self.n_features = len(self.feature_names)
+
+        # Precomputed column-index maps
+        self._numeric_index: list[tuple[int, str, float]] = []
+        self._categorical_index: dict[str, dict[str, int]] = {c: {} for c in CATEGORICAL_FEATURES}
+        for idx, name in enumerate(self.feature_names):
+            if name in self.defaults:
+                self._numeric_index.append((idx, name, self.defaults[name]))
+                continue
+            for cat in CATEGORICAL_FEATURES:
+                prefix = f"{cat}_"
+                if name.startswith(prefix):
+                    self._categorical_index[cat][name[len(prefix) :]] = idx
+                    break
+            else:
+                logger.warning("UNKNOWN_MODEL_FEATURE", context={"feature": name})
+
+        self._local = threading.local()
+
+    @classmethod
+    def fit(cls, df: pd.DataFrame) -> "FeatureEncoder":
+        """Derives feature names and imputation values from training data.
+
+        Categorical levels are sorted with the first level dropped, matching
+        `pd.get_dummies(drop_first=True)`.
+        """
+        feature_names = [c for c in NUMERIC_FEATURES + BOOLEAN_FEATURES if c in df.columns]
+        for cat in CATEGORICAL_FEATURES:
+            if cat in df.columns:
+                levels = sorted(str(v) for v in df[cat].dropna().unique())
+                feature_names.extend(f"{cat}_{level}" for level in levels[1:])
+
+        defaults: dict[str, float] = {}
+        for col in NUMERIC_FEATURES:
+            if col in df.columns:
+                median = pd.to_numeric(df[col], errors="coerce").median()
+                if pd.notna(median):
+                    defaults[col] = float(median)
+
+        return cls(feature_names, defaults=defaults)
+
+    @classmethod
+    def from_metadata(cls, metadata: dict[str, Any]) -> "FeatureEncoder":
+        """Builds the encoder from a saved model's metadata."""
+        return cls(metadata.get("feature_names", []), defaults=metadata.get("feature_defaults"))
+
+    def to_metadata(self) -> dict[str, Any]:
+        """Serializable description persisted next to the model."""
+        return {
+            "feature_names": self.feature_names,
+            "n_features": self.n_features,
+            "feature_defaults": {k: self.defaults[k] for _, k, _ in self._numeric_index},
+        }
+
+    def _buffer(self) -> np.ndarray:
+        buf: np.ndarray | None = getattr(self._local, "buffer", None)
+        if buf is None:
+            buf = np.zeros((1, self.n_features), dtype=np.float32)
+            self._local.buffer = buf
+        return buf
+
+    def encode(self, features: "PropertyFeatures") -> np.ndarray:
+        """Encodes one property into a per-thread preallocated (1, n) buffer.
+
+        The returned array is reused by the next call on the same thread, so
+        consume (predict on) it before encoding again.
+        """
+        buf = self._buffer()
+        row = buf[0]
+        row.fill(0.0)
+        for idx, name, default in self._numeric_index:
+            value = getattr(features, name, None)
+            row[idx] = default if value is None else float(value)
+        for cat, index in self._categorical_index.items():
+            value = getattr(features, cat, None)
+            if value is not None:
+                col = index.get(value)
+                if col is not None:
+                    row[col] = 1.0
+        return buf
+
+    def encode_frame(self, df: pd.DataFrame) -> np.ndarray:
+        """Encodes a frame of raw property rows into an (n_rows, n_features) matrix."""
+        n_rows = len(df)
+        x = np.zeros((n_rows, self.n_features), dtype=np.float32)
+        for idx, name, default in self._numeric_index:
+            if name in df.columns:
+                col = pd.to_numeric(df[name], errors="coerce").astype(float)
+                x[:, idx] = col.fillna(default).to_numpy(np.float32)
+            else:
+                x[:, idx] = default
+        for cat, index in self._categorical_index.items():
+            if cat not in df.columns or not index:
+                continue
+            cols = df[cat].map(index).to_numpy(dtype=float, na_value=np.nan)
+            hit = ~np.isnan(cols)
+            x[np.flatnonzero(hit), cols[hit].astype(np.intp)] = 1.0
+        return x
@@ -22,6 +22,8 @@ class ModelMetadata(BaseModel):
     metrics: dict[str, float | None] = Field(default_factory=dict)
     description: str = Field(default="")
     parameters: dict[str, Any] = Field(default_factory=dict)
+    feature_names: list[str] = Field(default_factory=list)
+    feature_defaults: dict[str, float] = Field(default_factory=dict)
 
 
 class ModelRegistry:
@@ -70,9 +72,11 @@ class ModelRegistry:
         metrics: dict[str, float],
         description: str = "",
         author: str = "system",
+        feature_encoder: Any = None,
     ) -> str:
         """
         Saves a model to the registry.
+        Pass the training FeatureEncoder so inference encodes features identically.
         Returns the version string (timestamp-based).
         """
         timestamp = time.time()
@@ -99,6 +103,7 @@ class ModelRegistry:
             metrics=cast(dict[str, float | None], metrics),
             description=description,
             parameters=model.get_params(),
+            **(feature_encoder.to_metadata() if feature_encoder else {}),
         )
 
         meta_path = os.path.join(version_path, "metadata.json")
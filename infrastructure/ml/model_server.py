@@ -0,0 +1,169 @@
+"""Process-wide model server for Fifi AVM inference.
+
+Keeps a single warm XGBoostAdapter per worker so graph nodes never pay the
+cost of reading the model from disk on the request path. Supports hot-swapping
+to a ModelRegistry version without restarting the process.
+"""
+
+import os
+import threading
+import time
+from datetime import UTC, datetime
+from typing import Any
+
+import pandas as pd
+
+from infrastructure.logging import get_logger
+
+from .feature_engineering import PropertyFeatures
+from .xgboost_adapter import BatchPrediction, XGBoostAdapter
+
+logger = get_logger(__name__)
+
+DEFAULT_MODEL_PATH = "models/fifi_xgboost_v1.json"
+
+
+class ModelServer:
+    """
+    Thread-safe holder for the active AVM model.
+    The adapter is loaded lazily on first use and then reused for every prediction.
+    """
+
+    def __init__(self, model_path: str = DEFAULT_MODEL_PATH, registry: Any = None) -> None:
+        self.model_path = model_path
+        self._registry = registry
+        self._adapter: XGBoostAdapter | None = None
+        self._lock = threading.Lock()
+        # Per loaded version: {version: {"load_seconds", "loaded_at", "predictions"}}
+        self._stats: dict[str, dict[str, Any]] = {}
+
+    @property
+    def registry(self) -> Any:
+        """Lazy load the ModelRegistry (only needed for hot-swaps)."""
+        if self._registry is None:
+            from infrastructure.ml.model_registry import ModelRegistry
+
+            self._registry = ModelRegistry()
+        return self._registry
+
+    @property
+    def adapter(self) -> XGBoostAdapter:
+        """Returns the warm adapter, loading the default model on first access."""
+        adapter = self._adapter
+        if adapter is None:
+            with self._lock:
+                if self._adapter is None:
+                    loaded, load_stats = self._load(self.model_path)
+                    self._record_load(loaded.model_version, load_stats)
+                    self._adapter = loaded
+                adapter = self._adapter
+        return adapter
+
+    @property
+    def model_version(self) -> str:
+        return self.adapter.model_version
+
+    def _load(
+        self, model_path: str, metadata_path: str | None = None
+    ) -> tuple[XGBoostAdapter, dict[str, Any]]:
+        """Builds an adapter; returns it with its load stats (recorded by the caller)."""
+        start = time.perf_counter()
+        adapter = XGBoostAdapter(model_path=model_path, metadata_path=metadata_path)
+        load_seconds = time.perf_counter() - start
+
+        logger.info(
+            "MODEL_SERVER_LOADED",
+            context={
+                "path": model_path,
+                "version": adapter.model_version,
+                "load_seconds": round(load_seconds, 4),
+                "fallback": adapter.model is None,
+            },
+        )
+        return adapter, {
+            "model_path": model_path,
+            "load_seconds": round(load_seconds, 4),
+            "loaded_at": datetime.now(UTC).isoformat(),
+            "predictions": 0,
+        }
+
+    def _record_load(self, version: str, load_stats: dict[str, Any]) -> None:
+        """Stores load stats for `version`, keeping its prediction count. Hold `_lock`."""
+        previous = self._stats.get(version)
+        if previous:
+            load_stats["predictions"] = previous["predictions"]
+        self._stats[version] = load_stats
+
+    def warm_up(self) -> None:
+        """Forces the model to load (e.g. from the API lifespan hook)."""
+        _ = self.adapter
+
+    def reload(self, version: str | None = None, metric: str = "mape") -> str:
+        """
+        Hot-swaps the active model to a registry version.
+
+        Args:
+            version: Registry version to load. Defaults to the best model by `metric`.
+            metric: Metric used to pick the best model when no version is given.
+
+        Returns:
+            The version now being served.
+        """
+        if version is None:
+            candidates = [
+                m for m in self.registry.list_models() if m.metrics.get(metric) is not None
+            ]
+            if not candidates:
+                raise ValueError(f"No registry models with metric '{metric}'")
+            version = min(candidates, key=lambda m: m.metrics[metric]).version
+
+        version_path = os.path.join(self.registry.storage_path, version)
+        new_adapter, load_stats = self._load(
+            os.path.join(version_path, "model.ubj"),
+            metadata_path=os.path.join(version_path, "metadata.json"),
+        )
+        if new_adapter.model is None:
+            raise RuntimeError(f"Failed to load model version {version}")
+
+        # Swap atomically; in-flight predictions keep using the old adapter
+        with self._lock:
+            previous = self._adapter.model_version if self._adapter else None
+            self._record_load(new_adapter.model_version, load_stats)
+            self._adapter = new_adapter
+
+        logger.info(
+            "MODEL_SERVER_SWAPPED",
+            context={"previous": previous, "current": new_adapter.model_version},
+        )
+        return new_adapter.model_version
+
+    def predict(self, features: PropertyFeatures) -> float:
+        """Predicts property value using the warm model."""
+        adapter = self.adapter
+        prediction = adapter.predict(features)
+        self._record_predictions(adapter.model_version, 1)
+        return prediction
+
+    def predict_many(self, features: list[PropertyFeatures] | pd.DataFrame) -> BatchPrediction:
+        """Vectorized prediction for portfolios, backtests and shadow mode."""
+        adapter = self.adapter
+        result = adapter.predict_many(features)
+        self._record_predictions(adapter.model_version, len(result))
+        return result
+
+    def _record_predictions(self, version: str, count: int) -> None:
+        with self._lock:
+            if version in self._stats:
+                self._stats[version]["predictions"] += count
+
+    def stats(self) -> dict[str, Any]:
+        """Returns load time and prediction counts per loaded model version."""
+        with self._lock:
+            return {
+                "active_version": self._adapter.model_version if self._adapter else None,
+                "versions": {v: dict(s) for v, s in self._stats.items()},
+            }
+
+
+# Global singleton instance (model loads lazily on first use)
+model_server = ModelServer()
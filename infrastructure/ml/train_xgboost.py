@@ -20,6 +20,7 @@ from sklearn.preprocessing import StandardScaler
 from xgboost import XGBRegressor
 
 from infrastructure.logging import get_logger
+from infrastructure.ml.feature_encoder import FeatureEncoder
 from infrastructure.ml.model_registry import ModelRegistry
 
 logger = get_logger(__name__)
@@ -34,6 +35,7 @@ class XGBoostTrainer:
         self.model: XGBRegressor | None = None
         self.scaler = StandardScaler()
         self.feature_names: list[str] = []
+        self.encoder: FeatureEncoder | None = None
         self.metrics: dict[str, Any] = {}
         self.train_metrics: dict[str, Any] = {}
 
@@ -41,31 +43,17 @@ class XGBoostTrainer:
         """Prepare feature matrix and target vector."""
         logger.info("FEATURE_PREPARATION_START", context={"n_rows": len(df)})
 
-        # Define features to use
-        numeric_features = ["sqm", "bedrooms", "bathrooms", "floor", "property_age_years"]
-        boolean_features = ["has_elevator", "has_balcony", "has_garden"]
-        categorical_features = ["zone_slug", "condition", "energy_class", "cadastral_category"]
-
-        # Create feature matrix (using lowercase x for ruff)
-        x = df[numeric_features + boolean_features].copy()
-
-        # Convert booleans to int
-        for col in boolean_features:
-            x[col] = x[col].astype(int)
-
-        # One-hot encode categoricals
-        for col in categorical_features:
-            if col in df.columns:
-                dummies = pd.get_dummies(df[col], prefix=col, drop_first=True)
-                x = pd.concat([x, dummies], axis=1)
-
-        # Handle missing values
-        x = x.fillna(x.median())
+        # Same encoder is persisted with the model and used at inference time,
+        # so one-hot levels and missing-value imputation can't drift apart
+        self.encoder = FeatureEncoder.fit(df)
+        x = pd.DataFrame(
+            self.encoder.encode_frame(df), columns=self.encoder.feature_names, index=df.index
+        )
 
         # Target variable
         y = df["sale_price_eur"]
 
-        self.feature_names = x.columns.tolist()
+        self.feature_names = self.encoder.feature_names
         logger.info("FEATURE_PREPARATION_COMPLETE", context={"n_features": len(self.feature_names)})
 
         return x, y
@@ -180,6 +168,7 @@ class XGBoostTrainer:
             "model_path": output_path,
             "feature_names": self.feature_names,
             "n_features": len(self.feature_names),
+            **(self.encoder.to_metadata() if self.encoder else {}),
             "metrics": self.metrics,
             **(metadata or {}),
         }
@@ -262,6 +251,7 @@ def main() -> None:
         metrics=metrics,
         description=f"XGBoost AVM trained on {len(df)} samples",
         author="system_training_script",
+        feature_encoder=trainer.encoder,
     )
 
     print(f"\n✅ Model saved to registry: {version}")
@@ -1,16 +1,42 @@
 import json
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 import numpy as np
+import pandas as pd
 from xgboost import Booster
 
 from infrastructure.logging import get_logger
 
+from .feature_encoder import BOOLEAN_FEATURES, NUMERIC_FEATURES, FeatureEncoder
 from .feature_engineering import PropertyFeatures
 
 logger = get_logger(__name__)
 
+HEURISTIC_BASE_PRICE_SQM = 5000
+HEURISTIC_CONDITION_MULTIPLIERS = {
+    "luxury": 1.4,
+    "excellent": 1.2,
+    "good": 1.0,
+    "fair": 0.8,
+    "poor": 0.6,
+}
+
+
+@dataclass
+class BatchPrediction:
+    """Result of a vectorized AVM prediction."""
+
+    predictions: np.ndarray
+    # True where the row was valued with the heuristic instead of the model
+    fallback: np.ndarray
+    model_version: str = "v1.0"
+    errors: dict[int, str] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.predictions)
+
 
 class XGBoostAdapter:
     """
@@ -18,12 +44,25 @@ class XGBoostAdapter:
     Loads trained XGBoost model and provides prediction with uncertainty estimation.
     """
 
-    def __init__(self, model_path: str = "models/fifi_xgboost_v1.json") -> None:
-        """Initialize adapter and load trained model."""
+    def __init__(
+        self, model_path: str = "models/fifi_xgboost_v1.json", metadata_path: str | None = None
+    ) -> None:
+        """Initialize adapter and load trained model.
+
+        Args:
+            model_path: Path to the saved Booster (JSON or UBJ)
+            metadata_path: Optional metadata file; defaults to `<model>_metadata.json`
+        """
         self.model_path = model_path
+        self.metadata_path = metadata_path or model_path.replace(".json", "_metadata.json")
         self.model_version = "v1.0"
         self.feature_names: list[str] = []
+        self.feature_defaults: dict[str, float] | None = None
         self.model = self._load_model()
+        if not self.feature_names:
+            # No metadata: encode the base numeric features only (not recommended)
+            self.feature_names = NUMERIC_FEATURES + BOOLEAN_FEATURES
+        self.encoder = FeatureEncoder(self.feature_names, defaults=self.feature_defaults)
 
     def _load_model(self) -> Booster | None:
         """Load XGBoost model from disk.
@@ -44,12 +83,13 @@ class XGBoostAdapter:
             booster.load_model(self.model_path)
 
             # Load metadata
-            metadata_path = self.model_path.replace(".json", "_metadata.json")
+            metadata_path = self.metadata_path
             if Path(metadata_path).exists():
                 with open(metadata_path) as f:
                     metadata = json.load(f)
                     self.model_version = metadata.get("version", "v1.0")
                     self.feature_names = metadata.get("feature_names", [])
+                    self.feature_defaults = metadata.get("feature_defaults")
                     logger.info(
                         "MODEL_LOADED",
                         context={
@@ -61,6 +101,10 @@ class XGBoostAdapter:
             else:
                 logger.warning("MODEL_METADATA_NOT_FOUND", context={"metadata_path": metadata_path})
 
+            # Registry artifacts don't store feature names in metadata; the Booster does
+            if not self.feature_names and booster.feature_names:
+                self.feature_names = list(booster.feature_names)
+
             return booster
         except Exception as e:
             logger.error(
@@ -71,81 +115,15 @@ class XGBoostAdapter:
             return None
 
     def _prepare_features_for_inference(self, features: PropertyFeatures) -> np.ndarray:
-        """Convert PropertyFeatures to model input format using numpy.
+        """Convert PropertyFeatures to model input format using the compiled encoder.
 
         Args:
             features: Pydantic model with property characteristics
 
         Returns:
-            2D Numpy array with features in correct order and encoding
+            2D float32 array (1, n_features) in the model's column order
         """
-        # Create base feature dict
-        feature_dict = {
-            "sqm": features.sqm,
-            "bedrooms": features.bedrooms,
-            "bathrooms": features.bathrooms,
-            "floor": features.floor,
-            "has_elevator": int(features.has_elevator),
-            "has_balcony": int(features.has_balcony),
-            "has_garden": int(features.has_garden),
-        }
-
-        # Add optional fields with defaults
-        if features.property_age_years:
-            feature_dict["property_age_years"] = features.property_age_years
-        else:
-            feature_dict["property_age_years"] = 30  # Default age
-
-        # One-hot encode categoricals (must match training)
-        # Zone slugs
-        zones = [
-            "brera-milano",
-            "centro-bologna",
-            "centro-lucca",
-            "centro-milano",
-            "centro-pisa",
-            "centro-storico-roma",
-            "duomo-firenze",
-            "lambrate-milano",
-            "navigli-milano",
-            "novoli-firenze",
-            "oltrarno-firenze",
-            "porta-romana-milano",
-            "prati-roma",
-            "rifredi-firenze",
-            "san-lorenzo-roma",
-            "santa-croce-firenze",
-            "testaccio-roma",
-            "trastevere-roma",
-        ]
-        for zone in zones:
-            feature_dict[f"zone_slug_{zone}"] = 1 if features.zone_slug == zone else 0
-
-        # Condition
-        for cond in ["fair", "good", "luxury", "poor"]:
-            feature_dict[f"condition_{cond}"] = 1 if features.condition == cond else 0
-
-        # Energy class
-        for ec in ["B", "C", "D", "E", "F", "G"]:
-            feature_dict[f"energy_class_{ec}"] = 1 if features.energy_class == ec else 0
-
-        # Cadastral category
-        for cat in ["A/3", "A/4", "A/7"]:
-            feature_dict[f"cadastral_category_{cat}"] = (
-                1 if features.cadastral_category == cat else 0
-            )
-
-        # Prepare list in correct order
-        values = []
-        if self.feature_names:
-            for fname in self.feature_names:
-                values.append(feature_dict.get(fname, 0))
-        else:
-            # Fallback if no metadata: just take everything in the dict (not recommended)
-            values = list(feature_dict.values())
-
-        # Convert to 2D numpy array (1, n_features)
-        return np.array([values], dtype=float)
+        return self.encoder.encode(features)
 
     def predict(self, features: PropertyFeatures) -> float:
         """Predicts property value based on features.
@@ -168,16 +146,8 @@ class XGBoostAdapter:
         # Fallback to heuristic if model not loaded
         if self.model is None:
             logger.warning("USING_HEURISTIC_FALLBACK")
-            base_price_sqm = 5000
-            condition_multipliers = {
-                "luxury": 1.4,
-                "excellent": 1.2,
-                "good": 1.0,
-                "fair": 0.8,
-                "poor": 0.6,
-            }
-            multiplier = condition_multipliers.get(features.condition, 1.0)
-            predicted_value = features.sqm * base_price_sqm * multiplier
+            multiplier = HEURISTIC_CONDITION_MULTIPLIERS.get(features.condition, 1.0)
+            predicted_value = features.sqm * HEURISTIC_BASE_PRICE_SQM * multiplier
             logger.info(
                 "HEURISTIC_PREDICTION_COMPLETE", context={"predicted_value": predicted_value}
             )
@@ -190,7 +160,7 @@ class XGBoostAdapter:
             # Convert to DMatrix and predict
             from xgboost import DMatrix
 
-            dmatrix = DMatrix(x)
+            dmatrix = DMatrix(x, feature_names=self.feature_names or None)
             prediction = self.model.predict(dmatrix)[0]
 
             logger.info(
@@ -201,8 +171,74 @@ class XGBoostAdapter:
         except Exception as e:
             logger.error("PREDICTION_ERROR", context={"error": str(e)}, exc_info=True)
             # Fallback to heuristic on error
-            base_price_sqm = 5000
-            return float(features.sqm * base_price_sqm)
+            return float(features.sqm * HEURISTIC_BASE_PRICE_SQM)
+
+    def _heuristic_values(self, df: pd.DataFrame) -> np.ndarray:
+        """Vectorized heuristic used for rows the model can't value."""
+        sqm = pd.to_numeric(df.get("sqm"), errors="coerce").fillna(0).to_numpy(float)
+        if "condition" in df.columns:
+            multipliers = df["condition"].map(HEURISTIC_CONDITION_MULTIPLIERS).fillna(1.0)
+            return sqm * HEURISTIC_BASE_PRICE_SQM * multipliers.to_numpy(float)
+        return sqm * HEURISTIC_BASE_PRICE_SQM
+
+    def predict_many(self, features: list[PropertyFeatures] | pd.DataFrame) -> BatchPrediction:
+        """Predicts values for many properties with a single model call.
+
+        Args:
+            features: PropertyFeatures list or DataFrame with the same columns
+
+        Returns:
+            BatchPrediction with one value per row and a per-row fallback mask
+        """
+        if isinstance(features, pd.DataFrame):
+            df = features.reset_index(drop=True)
+        else:
+            df = pd.DataFrame([f.model_dump() for f in features])
+
+        n_rows = len(df)
+        if n_rows == 0:
+            return BatchPrediction(
+                predictions=np.empty(0),
+                fallback=np.empty(0, dtype=bool),
+                model_version=self.model_version,
+            )
+
+        heuristic = self._heuristic_values(df)
+        if self.model is None:
+            logger.warning("USING_HEURISTIC_FALLBACK", context={"n_rows": n_rows})
+            return BatchPrediction(
+                predictions=heuristic,
+                fallback=np.ones(n_rows, dtype=bool),
+                model_version=self.model_version,
+            )
+
+        try:
+            x = self.encoder.encode_frame(df)
+            predictions = self.model.inplace_predict(x).astype(float)
+        except Exception as e:
+            logger.error("BATCH_PREDICTION_ERROR", context={"error": str(e)}, exc_info=True)
+            return BatchPrediction(
+                predictions=heuristic,
+                fallback=np.ones(n_rows, dtype=bool),
+                model_version=self.model_version,
+                errors={i: str(e) for i in range(n_rows)},
+            )
+
+        # Rows with no usable size or a non-finite/non-positive output fall back per row
+        fallback = ~np.isfinite(predictions) | (predictions <= 0) | (heuristic <= 0)
+        predictions = np.where(fallback, heuristic, predictions)
+
+        logger.info(
+            "AVM_BATCH_PREDICTION_COMPLETE",
+            context={
+                "n_rows": n_rows,
+                "n_fallback": int(fallback.sum()),
+                "model_version": self.model_version,
+            },
+        )
+        return BatchPrediction(
+            predictions=predictions, fallback=fallback, model_version=self.model_version
+        )
 
     def calculate_uncertainty(self, prediction: float, comps: list[dict[str, Any]]) -> float:
         """
@@ -0,0 +1,137 @@
+"""
+Shared, pooled HTTP session for Supabase.
+
+Every SupabaseAdapter (the container's, the validation adapter, per-request
+feedback handlers, scripts) used to call `create_client`, each opening its own
+httpx session. This module owns one keep-alive, HTTP/2 httpx client that all
+Supabase clients borrow, and caches one Supabase client per URL/key pair.
+"""
+
+import importlib.util
+import threading
+import time
+
+import httpx
+from supabase import Client, ClientOptions, create_client
+
+from config.settings import settings
+from infrastructure.logging import get_logger
+from infrastructure.metrics import supabase_requests_in_flight, supabase_requests_queued
+
+logger = get_logger(__name__)
+
+CONNECT_TIMEOUT_SECONDS = 5.0
+
+
+class _MeteredTransport(httpx.BaseTransport):
+    """
+    Caps concurrent requests at the pool size and reports in-flight/queued counts.
+
+    Responses are read before the slot is released; PostgREST bodies are
+    small JSON documents that the client reads immediately anyway.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport, max_concurrent: int) -> None:
+        self._transport = transport
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        supabase_requests_queued.inc()
+        try:
+            self._slots.acquire()
+        finally:
+            supabase_requests_queued.dec()
+        supabase_requests_in_flight.inc()
+        try:
+            response = self._transport.handle_request(request)
+            response.read()
+            return response
+        finally:
+            supabase_requests_in_flight.dec()
+            self._slots.release()
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class SupabaseClientPool:
+    """Lazily creates the shared httpx session and one Supabase client per (url, key)."""
+
+    def __init__(
+        self,
+        max_connections: int,
+        keepalive_seconds: float,
+        timeout: float,
+        http2: bool,
+    ) -> None:
+        self.max_connections = max_connections
+        self.keepalive_seconds = keepalive_seconds
+        self.timeout = timeout
+        # HTTP/2 needs the optional `h2` package (httpx[http2])
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        if http2 and not self.http2:
+            logger.warning("SUPABASE_HTTP2_UNAVAILABLE", context={"reason": "h2 not installed"})
+        self._lock = threading.Lock()
+        self._http: httpx.Client | None = None
+        self._clients: dict[tuple[str, str], Client] = {}
+
+    def http_client(self) -> httpx.Client:
+        with self._lock:
+            if self._http is None:
+                transport = httpx.HTTPTransport(
+                    http2=self.http2,
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                        keepalive_expiry=self.keepalive_seconds,
+                    ),
+                )
+                self._http = httpx.Client(
+                    transport=_MeteredTransport(transport, self.max_connections),
+                    timeout=httpx.Timeout(self.timeout, connect=CONNECT_TIMEOUT_SECONDS),
+                )
+            return self._http
+
+    def client(self, key: str | None = None, url: str | None = None) -> Client:
+        """
+        Supabase client on the shared session.
+
+        Defaults to the service role key (falling back to the anon key), as
+        SupabaseAdapter always has.
+        """
+        url = url or settings.SUPABASE_URL
+        key = key or settings.SUPABASE_SERVICE_ROLE_KEY or settings.SUPABASE_KEY
+        http = self.http_client()
+        with self._lock:
+            if (url, key) not in self._clients:
+                started = time.perf_counter()
+                self._clients[(url, key)] = create_client(
+                    url, key, options=ClientOptions(httpx_client=http)
+                )
+                logger.info(
+                    "SUPABASE_CLIENT_CREATED",
+                    context={
+                        "http2": self.http2,
+                        "pool_size": self.max_connections,
+                        "init_ms": round((time.perf_counter() - started) * 1000, 1),
+                    },
+                )
+            return self._clients[(url, key)]
+
+    def close(self) -> None:
+        """Closes the shared session (called from the API lifespan on shutdown)."""
+        with self._lock:
+            http, self._http = self._http, None
+            self._clients.clear()
+        if http is not None:
+            http.close()
+            logger.info("SUPABASE_POOL_CLOSED")
+
+
+# Global singleton instance
+supabase_pool = SupabaseClientPool(
+    max_connections=settings.SUPABASE_POOL_MAX_CONNECTIONS,
+    keepalive_seconds=settings.SUPABASE_POOL_KEEPALIVE_SECONDS,
+    timeout=settings.SUPABASE_TIMEOUT_SECONDS,
+    http2=settings.SUPABASE_HTTP2,
+)
@@ -33,8 +33,11 @@ from domain.appraisal import AppraisalRequest, AppraisalResult
 from domain.enums import LeadStatus
 from domain.errors import BaseAppError
 from domain.qualification import LeadCategory, LeadScore, QualificationData
+from infrastructure.blocking_executor import blocking_executor
+from infrastructure.http_pool import http_pool
 from infrastructure.logging import get_logger
 from infrastructure.monitoring.sentry import init_sentry
+from infrastructure.supabase_pool import supabase_pool
 from infrastructure.websocket import manager as ws_manager
 from presentation.api import feedback
 from presentation.api.webhooks import calcom_webhook, lead_sources, portal_webhook, voice_webhook
@@ -69,9 +72,31 @@ async def lifespan(app: FastAPI) -> Any:
     else:
         logger.warning("SENTRY_DISABLED", context={"reason": "No DSN configured"})
 
+    # Warm the AVM model once per worker so appraisals never load it on the request path
+    try:
+        from infrastructure.ml.model_server import model_server
+
+        model_server.warm_up()
+    except Exception as e:
+        logger.warning("MODEL_WARM_UP_FAILED", context={"error": str(e)})
+
     # Background task for email polling
     import asyncio
 
+    # Load the comparables index before serving; until then searches hit the DB
+    if container.comparables_index:
+        try:
+            await asyncio.to_thread(container.comparables_index.refresh)
+        except Exception as e:
+            logger.warning("COMPARABLES_INDEX_WARM_UP_FAILED", context={"error": str(e)})
+
+    # Same for the semantic cache: match_cache serves lookups until it is loaded
+    if container.semantic_index is not None:
+        try:
+            await asyncio.to_thread(container.semantic_index.refresh)
+        except Exception as e:
+            logger.warning("SEMANTIC_CACHE_INDEX_WARM_UP_FAILED", context={"error": str(e)})
+
     async def poll_emails() -> None:
         while True:
             try:
@@ -96,6 +121,9 @@ async def lifespan(app: FastAPI) -> Any:
 
     # Shutdown
     polling_task.cancel()
+    blocking_executor.shutdown()
+    await http_pool.aclose()
+    supabase_pool.close()
     logger.info("API_SHUTDOWN")
 
 
@@ -354,7 +382,9 @@ async def generate_appraisal_pdf(request: AppraisalPDFRequest) -> dict[str, Any]
         filename = f"appraisal_{timestamp}.pdf"
         output_path = f"temp/documents/{filename}"
 
-        pdf_path = generator.generate_appraisal_report(appraisal_data, output_path)
+        pdf_path = await blocking_executor.run(
+            "appraisal_pdf", generator.generate_appraisal_report, appraisal_data, output_path
+        )
 
         logger.info("PDF_GENERATED", context={"path": pdf_path, "address": request.address})
 
@@ -403,7 +433,8 @@ async def twilio_webhook(
 
     logger.info("WEBHOOK_RECEIVED", context={"from": from_phone, "body": body, "media": media_url})
 
-    # Get lead info for WebSocket broadcast
+    # Get lead info for WebSocket broadcast (id and name only: the graph run
+    # loads the lead with its messages itself)
     try:
         lead_response = (
             container.db.client.table("leads")
@@ -515,6 +546,11 @@ def readiness_check() -> JSONResponse:
         checks["cache"] = {"status": "down", "error": str(e)}
         all_ready = False
 
+    # AVM model server (informational: heuristic fallback keeps appraisals working)
+    from infrastructure.ml.model_server import model_server
+
+    checks["avm_model"] = {"status": "up", **model_server.stats()}
+
     status_code = 200 if all_ready else 503
     return JSONResponse(
         status_code=status_code,
@@ -740,11 +776,15 @@ async def generate_appraisal(req: AppraisalRequest) -> AppraisalResult:
     Public endpoint for Fifi appraisal tool.
     """
     try:
-        result = container.appraisal_service.estimate_value(req)
+        result = await blocking_executor.run(
+            "appraisal", container.appraisal_service.estimate_value, req
+        )
 
         # Link appraisal to lead if phone is provided
         if req.phone:
-            container.lead_processor.process_appraisal_signal(
+            await blocking_executor.run(
+                "appraisal",
+                container.lead_processor.process_appraisal_signal,
                 phone=req.phone,
                 estimated_value=result.estimated_value,
                 comparables_count=len(result.comparables),
@@ -849,27 +889,31 @@ async def generate_outreach_targets(req: OutreachGenerateRequest) -> dict[str, A
         # Import late to avoid circular dependencies if any
         from scripts.agency_outreach import search_agencies  # noqa: PLC0415
 
-        agencies = search_agencies(city=req.city)
-        count = 0
-        for agency in agencies:
-            # Prepare data for upsert
-            message = (
-                f"Ciao {agency['name']}! Ho visto la vostra vetrina in {agency['address']}. "
-                f"Ricevete lead notturni? La nostra AI li qualifica in 15 secondi su WhatsApp. "
-                f"Vuoi vedere una demo?"
-            )
-            target = {
-                "name": agency["name"],
-                "phone": agency["phone"],
-                "address": agency["address"],
-                "city": agency["city"],
-                "outreach_message": message,
-                "status": "PENDING",
-            }
-            container.db.client.table("outreach_targets").upsert(
-                target, on_conflict="phone"
-            ).execute()
-            count += 1
+        def _generate() -> int:
+            agencies = search_agencies(city=req.city)
+            count = 0
+            for agency in agencies:
+                # Prepare data for upsert
+                message = (
+                    f"Ciao {agency['name']}! Ho visto la vostra vetrina in {agency['address']}. "
+                    f"Ricevete lead notturni? La nostra AI li qualifica in 15 secondi su WhatsApp. "
+                    f"Vuoi vedere una demo?"
+                )
+                target = {
+                    "name": agency["name"],
+                    "phone": agency["phone"],
+                    "address": agency["address"],
+                    "city": agency["city"],
+                    "outreach_message": message,
+                    "status": "PENDING",
+                }
+                container.db.client.table("outreach_targets").upsert(
+                    target, on_conflict="phone"
+                ).execute()
+                count += 1
+            return count
+
+        count = await blocking_executor.run("outreach", _generate)
 
         return {"status": "success", "message": f"Generated {count} targets for {req.city}"}
     except Exception as e:
@@ -882,7 +926,8 @@ async def send_outreach_message(req: OutreachSendRequest) -> dict[str, Any]:
     """
     Sends the outreach message to a specific target and updates status.
     """
-    try:
+
+    def _send() -> str | None:
         # 1. Fetch target from DB
         res = (
             container.db.client.table("outreach_targets")
@@ -893,7 +938,7 @@ async def send_outreach_message(req: OutreachSendRequest) -> dict[str, Any]:
         )
         target = cast(dict[str, Any], res.data)
         if not target:
-            raise HTTPException(status_code=404, detail="Outreach target not found")
+            return None
 
         # 2. Send message via container messaging port
         sid = container.msg.send_message(to=target["phone"], body=target["outreach_message"])
@@ -902,6 +947,12 @@ async def send_outreach_message(req: OutreachSendRequest) -> dict[str, Any]:
         container.db.client.table("outreach_targets").update(
             {"status": "CONTACTED", "last_contacted_at": datetime.now().isoformat()}
         ).eq("id", req.target_id).execute()
+        return cast(str, sid)
+
+    try:
+        sid = await blocking_executor.run("outreach", _send)
+        if sid is None:
+            raise HTTPException(status_code=404, detail="Outreach target not found")
 
         logger.info("OUTREACH_MESSAGE_SENT", context={"target_id": req.target_id, "sid": sid})
 
@@ -918,7 +969,8 @@ async def generate_sales_report_endpoint(req: SalesReportRequest) -> dict[str, A
     """
     Generates a PDF sales report for a specific property.
     """
-    try:
+
+    def _build_report() -> str:
         # 1. Fetch property and lead activity
         # This is a bit complex, we'll mock some parts for now or use DB queries
         res = (
@@ -932,44 +984,18 @@ async def generate_sales_report_endpoint(req: SalesReportRequest) -> dict[str, A
         if not prop:
             raise HTTPException(status_code=404, detail="Property not found")
 
-        # 2. Fetch leads interested in this property
-        # Query leads where metadata->interested_property_ids contains req.property_id
-        leads_res = (
-            container.db.client.table("leads")
-            .select("id, status, score, journey_state, metadata")
-            .execute()
-        )
-
-        # Filter in Python if complex JSONB query is tricky via client,
-        # but let's try to be efficient if possible.
-        # Actually, let's filter in Python for now to be safe with the metadata structure
         # Constants for lead analysis
         hot_lead_threshold = 50
         min_leads_for_optimal_price = 10
         min_hot_leads_for_quick_close = 3
 
-        all_leads = cast(list[dict[str, Any]], leads_res.data or [])
-        interested_leads = []
-        for lead_data in all_leads:
-            meta = lead_data.get("metadata") or {}
-            if req.property_id in meta.get("interested_property_ids", []):
-                interested_leads.append(lead_data)
-
-        total_leads = len(interested_leads)
-        hot_leads = len(
-            [
-                lead_data
-                for lead_data in interested_leads
-                if (lead_data.get("score") or 0) >= hot_lead_threshold
-            ]
-        )
-        scheduled_viewings = len(
-            [
-                lead_data
-                for lead_data in interested_leads
-                if lead_data.get("journey_state") == "SCHEDULED"
-            ]
+        # 2. Interested leads, counted by the database (containment on the GIN index)
+        interest = container.db.get_property_interest_stats(
+            req.property_id, hot_threshold=hot_lead_threshold
         )
+        total_leads = interest["total_leads"]
+        hot_leads = interest["hot_leads"]
+        scheduled_viewings = interest["scheduled_viewings"]
 
         # 3. Dynamic Analysis/Advice based on data
         zone_name = prop.get("zone", "N/A")
@@ -1004,6 +1030,10 @@ async def generate_sales_report_endpoint(req: SalesReportRequest) -> dict[str, A
 
         # 4. Generate PDF
         pdf_path = container.doc_gen.generate_pdf("sales_report", report_data)
+        return cast(str, pdf_path)
+
+    try:
+        pdf_path = await blocking_executor.run("sales_report", _build_report)
 
         return {
             "status": "success",
@@ -23,6 +23,8 @@ from supabase import create_client
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from infrastructure.adapters.supabase_pager import iter_rows
+
 load_dotenv()
 
 supabase = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
@@ -37,62 +39,59 @@ def get_analytics(days=30):
     print("=" * 50)
 
     try:
-        # Fetch all records from the period
-        response = (
-            supabase.table("lead_conversations")
-            .select("*")
-            .gte("created_at", cutoff_date)
-            .execute()
-        )
-
-        records = response.data
-        total_records = len(records)
+        # Stream the period's records and aggregate as they arrive (bounded memory)
+        property_keywords = ["villa", "attico", "trilocale", "bilocale", "appartamento", "casa"]
+        property_mentions = Counter()
+        statuses = Counter()
+        unique_phones = set()
+        total_records = hot_leads = warm_leads = 0
+
+        for record in iter_rows(
+            supabase,
+            "lead_conversations",
+            "customer_phone, customer_name, ai_summary, last_message, status, created_at",
+            where=lambda q: q.gte("created_at", cutoff_date),
+            key="created_at",
+            prefetch=True,
+        ):
+            total_records += 1
+            # Unique leads (by phone number)
+            if record.get("customer_name") != "System":
+                unique_phones.add(record["customer_phone"])
+            # Hot leads (from ai_summary containing score indicators)
+            summary = record.get("ai_summary") or ""
+            hot_leads += "🔥 HOT LEAD" in summary
+            warm_leads += "⭐ Warm Lead" in summary
+            statuses[record.get("status", "Unknown")] += 1
+            # Most mentioned property types (extract from last_message)
+            msg = (record.get("last_message") or "").lower()
+            for prop in property_keywords:
+                if prop in msg:
+                    property_mentions[prop] += 1
 
         print("\n📈 VOLUME METRICS")
         print(f"   Total Conversations: {total_records}")
-
-        # Unique leads (by phone number)
-        unique_phones = set(
-            r["customer_phone"] for r in records if r.get("customer_name") != "System"
-        )
         print(f"   Unique Leads: {len(unique_phones)}")
-
-        # Hot leads (from ai_summary containing score indicators)
-        hot_leads = [r for r in records if "🔥 HOT LEAD" in r.get("ai_summary", "")]
-        warm_leads = [r for r in records if "⭐ Warm Lead" in r.get("ai_summary", "")]
         print(
-            f"   🔥 Hot Leads: {len(hot_leads)} ({len(hot_leads) / total_records * 100:.1f}%)"
+            f"   🔥 Hot Leads: {hot_leads} ({hot_leads / total_records * 100:.1f}%)"
             if total_records
             else "   Hot Leads: 0"
         )
-        print(f"   ⭐ Warm Leads: {len(warm_leads)}")
+        print(f"   ⭐ Warm Leads: {warm_leads}")
 
         # Takeover events
-        takeovers = [r for r in records if r.get("status") == "TAKEOVER"]
-        takeover_rate = (len(takeovers) / total_records * 100) if total_records else 0
+        takeover_rate = (statuses["TAKEOVER"] / total_records * 100) if total_records else 0
         print(f"   🚨 Takeover Rate: {takeover_rate:.1f}%")
 
-        # Most mentioned property types (extract from last_message)
         print("\n🏠 PROPERTY INTERESTS")
-        property_keywords = ["villa", "attico", "trilocale", "bilocale", "appartamento", "casa"]
-        property_mentions = Counter()
-
-        for record in records:
-            msg = record.get("last_message", "").lower()
-            for prop in property_keywords:
-                if prop in msg:
-                    property_mentions[prop] += 1
-
         for prop, count in property_mentions.most_common(5):
             print(f"   {prop.capitalize()}: {count} mentions")
 
         # Engagement metrics
         print("\n💬 ENGAGEMENT")
-        follow_ups = [r for r in records if r.get("status") == "FOLLOW_UP"]
-        print(f"   Follow-up Messages Sent: {len(follow_ups)}")
+        print(f"   Follow-up Messages Sent: {statuses['FOLLOW_UP']}")
 
         # Status breakdown
-        statuses = Counter(r.get("status", "Unknown") for r in records)
         print("\n📋 STATUS BREAKDOWN")
         for status, count in statuses.most_common():
             print(f"   {status}: {count}")
@@ -115,21 +114,25 @@ def export_to_csv():
         import csv
         from datetime import datetime
 
-        response = supabase.table("lead_conversations").select("*").limit(1000).execute()
-        records = response.data
+        records = iter_rows(supabase, "lead_conversations", "*", key="created_at", prefetch=True)
+        first = next(records, None)
 
-        if not records:
+        if first is None:
             print("No data to export")
             return
 
         filename = f"analytics_export_{datetime.now().strftime('%Y%m%d')}.csv"
 
         with open(filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=records[0].keys())
+            writer = csv.DictWriter(f, fieldnames=first.keys())
             writer.writeheader()
-            writer.writerows(records)
+            writer.writerow(first)
+            count = 1
+            for record in records:
+                writer.writerow(record)
+                count += 1
 
-        print(f"✅ Exported {len(records)} records to {filename}")
+        print(f"✅ Exported {count} records to {filename}")
 
     except Exception as e:
         print(f"❌ Export failed: {e}")
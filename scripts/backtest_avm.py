@@ -34,7 +34,7 @@ def calculate_metrics(y_true, y_pred):
     return {"mape": float(mape), "rmse": float(rmse), "mdape": float(mdape)}
 
 
-from infrastructure.ml.train_xgboost import XGBoostTrainer
+from infrastructure.ml.feature_encoder import FeatureEncoder
 
 # ... (rest of imports)
 
@@ -76,29 +76,17 @@ def run_backtest():
         logger.error("BACKTEST_FAILED", context={"reason": "Data load error", "detail": str(e)})
         return
 
-    # Prepare features using the Trainer's logic
-    trainer = XGBoostTrainer()
-    x_data, y_data = trainer.prepare_features(df)
-
-    # Align columns with model expectation
-    # The saved metadata has 'feature_names' in 'parameters' or explicit field?
-    # ModelMetadata has 'parameters' which stores model.get_params().
-    # train_xgboost.py saved 'feature_names' in the *metadata.json file* but ALSO registry saves ModelMetadata.
-    # Wait, registry.save_model receives 'parameters' from model.get_params(), but train_xgboost.py tried to save extra metadata...
-    # In train_xgboost.py I didn't pass feature_names to registry.save_model!
-    # I only passed metrics and description.
-    # CRITICAL MISS: I need the feature names to align validation data.
-    # I can try to get them from the booster if saved? model.get_booster().feature_names
-
+    # Encode with the model's own feature layout (shared with training and serving)
     model_feature_names = best_model.get_booster().feature_names
 
     if not model_feature_names:
         logger.warning("MODEL_HAS_NO_FEATURE_NAMES_SAVED", context={"version": best_version})
-        # Fallback to current x_data columns and hope?
-        model_feature_names = x_data.columns.tolist()
+        encoder = FeatureEncoder.fit(df)
+    else:
+        encoder = FeatureEncoder(model_feature_names, defaults=best_meta.feature_defaults)
 
-    # Reindex X to match model features (adds 0 for missing, drops extra)
-    x_aligned = x_data.reindex(columns=model_feature_names, fill_value=0)
+    x_aligned = pd.DataFrame(encoder.encode_frame(df), columns=encoder.feature_names)
+    y_data = df["sale_price_eur"]
 
     # Split
     x_train, x_test, y_train, y_test = train_test_split(
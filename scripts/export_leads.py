@@ -8,6 +8,8 @@ from supabase import create_client
 # Add parent directory to path to allow importing from root if needed
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from infrastructure.adapters.supabase_pager import iter_rows
+
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
@@ -24,30 +26,29 @@ def export_leads():
     print("📊 Exporting Leads to 'leads_export.csv'...")
 
     try:
-        # Fetch all leads (limit 1000 for safety)
-        response = (
-            supabase.table("lead_conversations")
-            .select("*")
-            .order("created_at", desc=True)
-            .limit(1000)
-            .execute()
+        # Stream all leads, newest first, straight to the CSV (bounded memory)
+        leads = iter_rows(
+            supabase, "lead_conversations", "*", key="created_at", descending=True, prefetch=True
         )
-        leads = response.data
+        first = next(leads, None)
 
-        if not leads:
+        if first is None:
             print("⚠️ No leads found in database.")
             return
 
         # Write to CSV
         with open("leads_export.csv", "w", newline="", encoding="utf-8") as csvfile:
-            fieldnames = leads[0].keys()
+            fieldnames = first.keys()
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
 
             writer.writeheader()
+            writer.writerow(first)
+            count = 1
             for lead in leads:
                 writer.writerow(lead)
+                count += 1
 
-        print(f"✅ Success! Exported {len(leads)} rows to leads_export.csv")
+        print(f"✅ Success! Exported {count} rows to leads_export.csv")
 
     except Exception as e:
         print(f"❌ Export Failed: {e}")
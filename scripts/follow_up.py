@@ -14,7 +14,7 @@ Follow-up schedule:
 
 import os
 import sys
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 
 from dotenv import load_dotenv
 from supabase import create_client
@@ -23,6 +23,8 @@ from twilio.rest import Client
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from infrastructure.adapters.supabase_pager import iter_rows
+
 load_dotenv()
 
 # Initialize clients
@@ -48,18 +50,24 @@ def get_leads_needing_followup():
     now = datetime.now(UTC)
     leads_to_contact = []
 
+    # A lead whose latest interaction is older than the last tier can't qualify,
+    # so only that window is read.
+    window_start = (now - timedelta(days=max(FOLLOW_UP_TEMPLATES) + 1)).isoformat()
+
     try:
-        # Get all unique phone numbers with their last interaction
-        response = (
-            supabase.table("lead_conversations")
-            .select("customer_phone,customer_name,created_at,status")
-            .order("created_at", desc=True)
-            .execute()
+        # Stream the window newest first: the first record seen per phone is its latest
+        records = iter_rows(
+            supabase,
+            "lead_conversations",
+            "customer_phone, customer_name, created_at, status",
+            where=lambda q: q.gte("created_at", window_start),
+            key="created_at",
+            descending=True,
         )
 
         # Group by phone, get latest record per phone
         latest_by_phone = {}
-        for record in response.data:
+        for record in records:
             phone = record["customer_phone"]
             if phone not in latest_by_phone:
                 latest_by_phone[phone] = record
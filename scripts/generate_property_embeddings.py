@@ -6,6 +6,7 @@ import sys
 sys.path.append(os.getcwd())
 
 from config.container import container
+from infrastructure.adapters.supabase_pager import iter_pages
 from infrastructure.logging import get_logger
 
 logger = get_logger(__name__)
@@ -14,23 +15,25 @@ logger = get_logger(__name__)
 def generate_embeddings(table_name="properties"):
     print(f"🚀 Generating embeddings for {table_name}...")
 
-    # 1. Fetch all properties without embeddings or all of them
+    # 1. Stream properties page by page (bounded memory on large tables)
     try:
-        res = container.db.client.table(table_name).select("id, title, description").execute()
-        properties = res.data
-        print(f"Found {len(properties)} properties.")
-
-        for p in properties:
-            text = f"{p['title']}. {p['description']}"
-            print(f"  Processing: {p['title']}...")
-
-            embedding = container.ai.get_embedding(text)
-
-            container.db.client.table(table_name).update({"embedding": embedding}).eq(
-                "id", p["id"]
-            ).execute()
-
-        print(f"✅ Successfully updated {len(properties)} properties in {table_name}.")
+        updated = 0
+        for properties in iter_pages(
+            container.db.client, table_name, "id, title, description", prefetch=True
+        ):
+            # One batched, cached embedding request per page instead of a call per property
+            texts = [f"{p['title']}. {p['description']}" for p in properties]
+            embeddings = container.embeddings.embed_many(texts)
+
+            for p, embedding in zip(properties, embeddings, strict=True):
+                print(f"  Processing: {p['title']}...")
+
+                container.db.client.table(table_name).update({"embedding": embedding}).eq(
+                    "id", p["id"]
+                ).execute()
+            updated += len(properties)
+
+        print(f"✅ Successfully updated {updated} properties in {table_name}.")
 
     except Exception as e:
         print(f"❌ Error: {e}")
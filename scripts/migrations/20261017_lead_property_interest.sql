@@ -0,0 +1,32 @@
+-- Migration: indexed lookup of leads interested in a property
+-- JourneyManager.send_property_brochure records interest in
+-- leads.metadata.interested_property_ids. Called by
+-- SupabaseAdapter.get_property_interest_stats (sales reports): a containment
+-- filter on the GIN index reads only the interested leads, and the counts come
+-- back as a single row.
+-- Run this in the Supabase SQL Editor
+
+CREATE INDEX IF NOT EXISTS idx_leads_metadata_path
+ON public.leads USING GIN (metadata jsonb_path_ops);
+
+CREATE OR REPLACE FUNCTION public.property_interest_stats(
+    p_property_id TEXT,
+    p_hot_threshold INT DEFAULT 50
+)
+RETURNS TABLE (
+    total_leads BIGINT,
+    hot_leads BIGINT,
+    scheduled_viewings BIGINT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        COUNT(*),
+        COUNT(*) FILTER (WHERE COALESCE(l.score, 0) >= p_hot_threshold),
+        COUNT(*) FILTER (WHERE l.journey_state = 'SCHEDULED')
+    FROM public.leads AS l
+    WHERE l.metadata @> jsonb_build_object(
+        'interested_property_ids', jsonb_build_array(p_property_id)
+    );
+$$;
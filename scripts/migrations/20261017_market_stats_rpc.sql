@@ -0,0 +1,56 @@
+-- Migration: server-side market statistics
+-- Called by SupabaseAdapter.get_market_aggregates (get_market_stats, market
+-- analysis and trend prediction). Aggregates run next to the data, so only one
+-- row of statistics crosses the wire however large market_data grows.
+-- Run this in the Supabase SQL Editor
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Zone filters are substring matches (ILIKE '%zone%'): trigram index
+CREATE INDEX IF NOT EXISTS idx_market_data_zone_trgm
+ON public.market_data USING GIN (zone gin_trgm_ops);
+
+-- City + time window filters
+CREATE INDEX IF NOT EXISTS idx_market_data_city_created_at
+ON public.market_data(city, created_at DESC);
+
+CREATE OR REPLACE FUNCTION public.market_zone_stats(
+    p_zone TEXT DEFAULT NULL,
+    p_city TEXT DEFAULT NULL,
+    p_since TIMESTAMPTZ DEFAULT NULL,
+    p_until TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS TABLE (
+    listings_count BIGINT,
+    sample_size BIGINT,
+    avg_price_sqm NUMERIC,
+    median_price_sqm NUMERIC,
+    p25_price_sqm NUMERIC,
+    p75_price_sqm NUMERIC,
+    min_price_sqm NUMERIC,
+    max_price_sqm NUMERIC,
+    avg_price NUMERIC
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        COUNT(*),
+        COUNT(m.price_per_mq) FILTER (WHERE m.price_per_mq > 0),
+        ROUND(AVG(m.price_per_mq) FILTER (WHERE m.price_per_mq > 0)::NUMERIC, 2),
+        ROUND((PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY m.price_per_mq)
+            FILTER (WHERE m.price_per_mq > 0))::NUMERIC, 2),
+        ROUND((PERCENTILE_CONT(0.25) WITHIN GROUP (ORDER BY m.price_per_mq)
+            FILTER (WHERE m.price_per_mq > 0))::NUMERIC, 2),
+        ROUND((PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY m.price_per_mq)
+            FILTER (WHERE m.price_per_mq > 0))::NUMERIC, 2),
+        ROUND(MIN(m.price_per_mq) FILTER (WHERE m.price_per_mq > 0)::NUMERIC, 2),
+        ROUND(MAX(m.price_per_mq) FILTER (WHERE m.price_per_mq > 0)::NUMERIC, 2),
+        ROUND(AVG(m.price) FILTER (WHERE m.price > 0)::NUMERIC, 2)
+    FROM public.market_data AS m
+    WHERE (p_zone IS NULL OR m.zone ILIKE '%' || p_zone || '%')
+      AND (p_city IS NULL OR m.city = p_city)
+      AND (p_since IS NULL OR m.created_at >= p_since)
+      AND (p_until IS NULL OR m.created_at < p_until);
+$$;
+
@@ -0,0 +1,7 @@
+-- Migration: index for fetching a lead's most recent messages
+-- get_lead embeds messages ordered by created_at DESC with a limit, so the
+-- history window is read straight from the index instead of sorting all rows.
+-- Run this in the Supabase SQL Editor
+
+CREATE INDEX IF NOT EXISTS idx_messages_lead_created_at
+ON public.messages(lead_id, created_at DESC);
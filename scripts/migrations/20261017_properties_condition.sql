@@ -0,0 +1,7 @@
+-- Migration: listing condition and freshness for comparable ranking
+-- LocalPropertySearchService ranks candidates on condition and listing age.
+-- The scraper already writes `condition`; this makes sure the column exists.
+-- Run this in the Supabase SQL Editor
+
+ALTER TABLE public.properties ADD COLUMN IF NOT EXISTS condition TEXT;
+ALTER TABLE public.properties ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
@@ -0,0 +1,77 @@
+-- Migration: normalized, indexed search columns on properties
+-- LocalPropertySearchService filters comparables with equality on city,
+-- zone_slug and property_type plus a sqm range, instead of leading-wildcard
+-- ILIKE on the description. Ingest paths fill the columns via
+-- domain.property_search.property_search_keys; this script backfills
+-- existing rows with the same rules.
+-- Run this in the Supabase SQL Editor
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+ALTER TABLE public.properties ADD COLUMN IF NOT EXISTS city TEXT;
+ALTER TABLE public.properties ADD COLUMN IF NOT EXISTS zone TEXT;
+ALTER TABLE public.properties ADD COLUMN IF NOT EXISTS zone_slug TEXT;
+ALTER TABLE public.properties ADD COLUMN IF NOT EXISTS property_type TEXT;
+
+-- Lower-cased listing text for the trigram fallback (zone only named in the text)
+ALTER TABLE public.properties ADD COLUMN IF NOT EXISTS search_text TEXT
+GENERATED ALWAYS AS (lower(coalesce(title, '') || ' ' || coalesce(description, ''))) STORED;
+
+-- Backfill: city (explicit column first, else a known city named in the text)
+UPDATE public.properties AS p
+SET city = CASE lower(trim(p.city))
+        WHEN 'florence' THEN 'Firenze'
+        WHEN 'milan' THEN 'Milano'
+        WHEN 'rome' THEN 'Roma'
+        WHEN 'naples' THEN 'Napoli'
+        WHEN 'venice' THEN 'Venezia'
+        ELSE initcap(trim(p.city))
+    END
+WHERE p.city IS NOT NULL AND trim(p.city) <> '';
+
+UPDATE public.properties AS p
+SET city = v.name
+FROM (
+    VALUES
+        ('florence', 'Firenze'), ('firenze', 'Firenze'),
+        ('siena', 'Siena'), ('pisa', 'Pisa'), ('lucca', 'Lucca'),
+        ('arezzo', 'Arezzo'), ('grosseto', 'Grosseto'), ('livorno', 'Livorno'),
+        ('milan', 'Milano'), ('milano', 'Milano'),
+        ('rome', 'Roma'), ('roma', 'Roma'),
+        ('naples', 'Napoli'), ('napoli', 'Napoli'),
+        ('venice', 'Venezia'), ('venezia', 'Venezia')
+) AS v(variant, name)
+WHERE (p.city IS NULL OR trim(p.city) = '')
+  AND p.search_text ~ ('\m' || v.variant || '\M');
+
+-- Backfill: zone slug ("Santo Spirito" -> "santo-spirito")
+UPDATE public.properties
+SET zone_slug = NULLIF(
+    trim(BOTH '-' FROM regexp_replace(lower(unaccent(zone)), '[^a-z0-9]+', '-', 'g')),
+    ''
+)
+WHERE zone IS NOT NULL AND zone_slug IS NULL;
+
+-- Backfill: property type from the title (first matching keyword wins)
+UPDATE public.properties
+SET property_type = CASE
+        WHEN lower(title) ~ '\m(attico|penthouse)\M' THEN 'penthouse'
+        WHEN lower(title) ~ '\m(villa|villetta)\M' THEN 'villa'
+        WHEN lower(title) ~ '\m(casale|rustico|farmhouse|podere|casa indipendente|house)\M' THEN 'house'
+        WHEN lower(title) ~ '\mloft\M' THEN 'loft'
+        WHEN lower(title) ~ '\m(monolocale|studio|bilocale|trilocale|quadrilocale|appartamento|apartment|flat)\M' THEN 'apartment'
+    END
+WHERE property_type IS NULL;
+
+-- Equality prefix + sqm range, for the rows appraisals can use
+CREATE INDEX IF NOT EXISTS idx_properties_search
+ON public.properties(city, zone_slug, property_type, sqm)
+WHERE status = 'available';
+
+CREATE INDEX IF NOT EXISTS idx_properties_city_type_sqm
+ON public.properties(city, property_type, sqm)
+WHERE status = 'available';
+
+CREATE INDEX IF NOT EXISTS idx_properties_search_text_trgm
+ON public.properties USING GIN (search_text gin_trgm_ops);
@@ -0,0 +1,28 @@
+-- Migration: reliable updated_at on properties
+-- ComparablesIndex refreshes incrementally with `updated_at > last seen`, so
+-- every write (including status changes to sold/withdrawn) must bump it.
+-- Run this in the Supabase SQL Editor
+
+ALTER TABLE public.properties ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'update_properties_updated_at') THEN
+        CREATE TRIGGER update_properties_updated_at
+        BEFORE UPDATE ON public.properties
+        FOR EACH ROW
+        EXECUTE FUNCTION update_updated_at_column();
+    END IF;
+END $$;
+
+-- Incremental refresh reads rows in updated_at order past the watermark
+CREATE INDEX IF NOT EXISTS idx_properties_updated_at
+ON public.properties(updated_at, id);
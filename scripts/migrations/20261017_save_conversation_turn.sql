@@ -0,0 +1,48 @@
+-- Migration: persist a whole conversation turn in one round trip
+-- Called by SupabaseAdapter.save_turn from finalize_node. Inserts the turn's
+-- messages in array order and applies the lead update in a single transaction.
+-- Message ids are generated by the client and messages.id is the primary key,
+-- so a retried call whose first attempt already committed inserts nothing.
+-- p_lead_update may only set metadata, journey_state, status and updated_at
+-- (TURN_LEAD_FIELDS in domain/ports.py).
+-- Run this in the Supabase SQL Editor
+
+CREATE OR REPLACE FUNCTION public.save_conversation_turn(
+    p_lead_id UUID,
+    p_phone TEXT,
+    p_messages JSONB,
+    p_lead_update JSONB
+)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO public.messages (
+        id, lead_id, role, content, sid, status, media_url, channel, created_at, metadata
+    )
+    SELECT
+        COALESCE((m.value->>'id')::UUID, gen_random_uuid()),
+        p_lead_id,
+        m.value->>'role',
+        m.value->>'content',
+        m.value->>'sid',
+        COALESCE(m.value->>'status', 'sent'),
+        m.value->>'media_url',
+        COALESCE(m.value->>'channel', 'whatsapp'),
+        COALESCE((m.value->>'created_at')::TIMESTAMPTZ, NOW()),
+        COALESCE(m.value->'metadata', '{}'::JSONB)
+    FROM jsonb_array_elements(COALESCE(p_messages, '[]'::JSONB)) WITH ORDINALITY AS m(value, ord)
+    ORDER BY m.ord
+    ON CONFLICT (id) DO NOTHING;
+
+    IF p_lead_update IS NOT NULL AND p_lead_update <> '{}'::JSONB THEN
+        -- Keys missing from p_lead_update keep the row's current value
+        UPDATE public.leads AS l
+        SET (metadata, journey_state, status, updated_at) = (
+            SELECT r.metadata, r.journey_state, r.status, COALESCE(r.updated_at, NOW())
+            FROM jsonb_populate_record(l, p_lead_update) AS r
+        )
+        WHERE l.customer_phone = p_phone;
+    END IF;
+END;
+$$;
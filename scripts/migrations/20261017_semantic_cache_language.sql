@@ -0,0 +1,10 @@
+-- Migration: language scope and incremental sync for semantic_cache
+-- SemanticCacheIndex partitions cached answers by (tenant_id, language) and
+-- refreshes with `updated_at > last seen`; save_to_cache always sets updated_at.
+-- Run this in the Supabase SQL Editor
+
+ALTER TABLE public.semantic_cache ADD COLUMN IF NOT EXISTS language TEXT;
+
+-- Incremental refresh reads rows in updated_at order past the watermark
+CREATE INDEX IF NOT EXISTS idx_semantic_cache_updated_at
+ON public.semantic_cache(updated_at, id);
@@ -51,35 +51,43 @@ async def main():  # noqa: PLR0912, PLR0915
 
     print(f"Found {len(transactions)} listings to process.")
 
-    # 3. Process Logic
-    success_count = 0
-    drift_alerts = 0
-
+    # 3. Map rows to features (handle different schemas: historical vs properties)
+    rows = []
+    batch = []
     for tx in transactions:
         try:
-            # Map DB row to PropertyFeatures
-            # Handle different schemas (historical vs properties)
             price = tx.get("sale_price_eur") or tx.get("price")
             sqm = tx.get("sqm") or tx.get("surface")
 
             if not price or not sqm:
                 continue
 
-            features = PropertyFeatures(
-                sqm=int(sqm),
-                bedrooms=tx.get("bedrooms", 2),
-                bathrooms=tx.get("bathrooms", 1),
-                floor=tx.get("floor", 1),
-                has_elevator=tx.get("has_elevator", False),
-                condition=tx.get("condition", "good"),  # type: ignore
-                zone_slug=(tx.get("zone") or "unknown").lower().replace(" ", "-"),
-                property_age_years=tx.get("property_age_years", 30),
+            batch.append(
+                PropertyFeatures(
+                    sqm=int(sqm),
+                    bedrooms=tx.get("bedrooms", 2),
+                    bathrooms=tx.get("bathrooms", 1),
+                    floor=tx.get("floor", 1),
+                    has_elevator=tx.get("has_elevator", False),
+                    condition=tx.get("condition", "good"),  # type: ignore
+                    zone_slug=(tx.get("zone") or "unknown").lower().replace(" ", "-"),
+                    property_age_years=tx.get("property_age_years", 30),
+                )
             )
+            rows.append((tx, price))
+        except Exception as e:
+            logger.error("SHADOW_PROCESS_FAILED", context={"id": tx.get("id"), "error": str(e)})
 
-            # Predict
-            predicted_value = ml.predict(features)
+    # 4. Predict the whole batch with a single model call
+    result = ml.predict_many(batch)
 
-            # Validate
+    success_count = 0
+    drift_alerts = 0
+
+    for (tx, price), features, predicted_value, used_fallback in zip(
+        rows, batch, result.predictions, result.fallback, strict=True
+    ):
+        try:
             # We treat the DB price as "Actual" (Sale or Listing)
             price_type = "sale" if "sale_price_eur" in tx else "listing"
 
@@ -95,6 +103,7 @@ async def main():  # noqa: PLR0912, PLR0915
                 "city": tx.get("city", "Unknown"),
                 "price_type": price_type,
                 "fifi_status": "SHADOW_MODE",
+                "heuristic_fallback": bool(used_fallback),
             }
 
             db.log_validation(
@@ -20,6 +20,7 @@ from typing import Any
 # Add root to path
 sys.path.append(os.getcwd())
 
+from domain.property_search import property_search_keys
 from infrastructure.adapters.supabase_adapter import SupabaseAdapter
 from infrastructure.logging import get_logger
 
@@ -93,6 +94,12 @@ def main():
                 "image_url": row.get("image_url"),
                 # is_mock removed as it's no longer a column
             }
+            if not is_mock:
+                # Normalized columns used by the comparables search (properties only;
+                # mock_properties keeps the original schema)
+                data.update(property_search_keys({**row, **data}))
+                if row.get("zone"):
+                    data["zone"] = row["zone"]
 
             # Remove keys that might not exist in target schema if CSV is messy
             # (Assuming supabase_adapter handles upsert logic or we use raw client here)
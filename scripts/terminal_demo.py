@@ -12,6 +12,7 @@ Usage:
 
 import os
 import sys
+from datetime import datetime
 from typing import Any
 from unittest.mock import MagicMock
 
@@ -80,7 +81,7 @@ class TerminalDatabaseAdapter(DatabasePort):
         ]
         self.cache: dict[str, str] = {}
 
-    def get_lead(self, phone: str) -> dict[str, Any] | None:
+    def get_lead(self, phone: str, message_limit: int | None = None) -> dict[str, Any] | None:
         return self.leads.get(phone)
 
     def save_lead(self, lead_data: dict[str, Any]) -> None:
@@ -119,12 +120,16 @@ class TerminalDatabaseAdapter(DatabasePort):
 
         return results[:limit]
 
-    def get_cached_response(self, embedding: list[float]) -> str | None:
+    def get_cached_response(
+        self, embedding: list[float], threshold: float = 0.9, **kwargs: Any
+    ) -> str | None:
         # Simple cache key based on first few embedding values
         cache_key = str(embedding[:5])
         return self.cache.get(cache_key)
 
-    def save_to_cache(self, query: str, embedding: list[float], response: str) -> None:
+    def save_to_cache(
+        self, query: str, embedding: list[float], response: str, **kwargs: Any
+    ) -> None:
         cache_key = str(embedding[:5])
         self.cache[cache_key] = response
 
@@ -135,6 +140,41 @@ class TerminalDatabaseAdapter(DatabasePort):
             "zone": zone,
         }
 
+    def get_market_aggregates(
+        self,
+        zone: str | None = None,
+        city: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> dict[str, Any]:
+        return {
+            "listings_count": 42,
+            "sample_size": 42,
+            "avg_price_sqm": 3500,
+            "median_price_sqm": 3400,
+            "p25_price_sqm": 2900,
+            "p75_price_sqm": 4100,
+            "min_price_sqm": 2100,
+            "max_price_sqm": 5600,
+            "avg_price": 420000,
+        }
+
+    def get_property_interest_stats(
+        self, property_id: str, hot_threshold: int = 50
+    ) -> dict[str, int]:
+        leads = [
+            lead
+            for lead in self.leads.values()
+            if property_id in (lead.get("metadata") or {}).get("interested_property_ids", [])
+        ]
+        return {
+            "total_leads": len(leads),
+            "hot_leads": sum(1 for lead in leads if (lead.get("score") or 0) >= hot_threshold),
+            "scheduled_viewings": sum(
+                1 for lead in leads if lead.get("journey_state") == "SCHEDULED"
+            ),
+        }
+
 
 def print_banner():
     """Print welcome banner."""
@@ -1,7 +1,8 @@
 import asyncio
 import os
 import sys
-from typing import Any
+from datetime import datetime
+from typing import Any, TypeVar
 
 # Ensure project root is in path
 sys.path.append(os.getcwd())
@@ -10,6 +11,8 @@ from application.services.lead_processor import LeadProcessor
 from application.services.lead_scoring_service import LeadScoringService
 from domain.ports import AIPort, DatabasePort, MessagingPort
 
+T = TypeVar("T")
+
 
 # Inline Mocks
 class RequestMock:
@@ -18,7 +21,7 @@ class RequestMock:
 
 
 class MockDatabaseAdapter(DatabasePort):
-    def get_lead(self, phone: str) -> dict[str, Any] | None:
+    def get_lead(self, phone: str, message_limit: int | None = None) -> dict[str, Any] | None:
         return {"id": "test-id", "customer_phone": phone, "status": "active", "messages": []}
 
     def save_lead(self, lead_data: dict[str, Any]) -> None:
@@ -30,6 +33,20 @@ class MockDatabaseAdapter(DatabasePort):
     def get_market_stats(self, zone: str) -> dict[str, Any]:
         return {}
 
+    def get_market_aggregates(
+        self,
+        zone: str | None = None,
+        city: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> dict[str, Any]:
+        return {"listings_count": 0, "sample_size": 0}
+
+    def get_property_interest_stats(
+        self, property_id: str, hot_threshold: int = 50
+    ) -> dict[str, int]:
+        return {"total_leads": 0, "hot_leads": 0, "scheduled_viewings": 0}
+
     def get_properties(
         self,
         query: str = "",
@@ -40,10 +57,14 @@ class MockDatabaseAdapter(DatabasePort):
     ) -> list[dict[str, Any]]:
         return []
 
-    def get_cached_response(self, embedding: list[float], threshold: float = 0.9) -> str | None:
+    def get_cached_response(
+        self, embedding: list[float], threshold: float = 0.9, **kwargs: Any
+    ) -> str | None:
         return None
 
-    def save_to_cache(self, query: str, embedding: list[float], response: str) -> None:
+    def save_to_cache(
+        self, query: str, embedding: list[float], response: str, **kwargs: Any
+    ) -> None:
         pass
 
     # Missing methods implemented
@@ -72,6 +93,9 @@ class InteractiveMockAI(AIPort):
     def get_embedding(self, text: str) -> list[float]:
         return [0.1] * 1536
 
+    def generate_structured(self, prompt: str, schema: type[T]) -> T:
+        return schema()
+
 
 class MockMessagingAdapter(MessagingPort):
     def send_message(self, to: str, content: str) -> bool:
@@ -1,10 +1,16 @@
 import argparse
 import csv
 import os
+import sys
 
 from dotenv import load_dotenv
 from supabase import Client, create_client
 
+# Add root to path
+sys.path.append(os.getcwd())
+
+from domain.property_search import property_search_keys
+
 # Load environment variables
 load_dotenv()
 
@@ -110,7 +116,8 @@ def upload_portfolio(portfolio_data):
     for property_data in portfolio_data:
         try:
             print(f"   - Uploading: {property_data['title']}...")
-            supabase.table("properties").insert(property_data).execute()
+            row = {**property_data, **property_search_keys(property_data)}
+            supabase.table("properties").insert(row).execute()
         except Exception as e:
             print(f"   ⚠️ Could not upload {property_data['title']}: {e}")
 
@@ -78,9 +78,28 @@ def mock_settings():
         mock_set.CALCOM_WEBHOOK_SECRET = "mock_secret"
         mock_set.SUPABASE_URL = "https://mock.supabase.co"
         mock_set.SUPABASE_KEY = "mock_key"
+        mock_set.SUPABASE_SERVICE_ROLE_KEY = None
+        mock_set.SUPABASE_POOL_MAX_CONNECTIONS = 20
+        mock_set.SUPABASE_POOL_KEEPALIVE_SECONDS = 60.0
+        mock_set.SUPABASE_TIMEOUT_SECONDS = 30.0
+        mock_set.SUPABASE_HTTP2 = False
+        mock_set.MEMORY_CACHE_MAX_ENTRIES = 10000
+        mock_set.MEMORY_CACHE_MAX_MB = 64
+        mock_set.CACHE_L1_TTL_SECONDS = 60
         mock_set.RAPIDAPI_KEY = None  # Crucial for triggering fallbacks in MarketDataService tests
         mock_set.AGENCY_OWNER_PHONE = "3912345678"
         mock_set.AGENCY_OWNER_EMAIL = "test@example.com"
+        # Feature flags must be real values: a MagicMock attribute is truthy
+        mock_set.COMBINED_EXTRACTION_ENABLED = False
+        mock_set.APPRAISAL_CONCURRENT_MODE = False
+        mock_set.APPRAISAL_DEADLINE_SECONDS = 8.0
+        mock_set.APPRAISAL_HEDGE_SECONDS = 0.3
+        mock_set.COMPARABLES_INDEX_ENABLED = False
+        mock_set.COMPARABLES_CACHE_TTL_HOURS = 24
+        mock_set.SEMANTIC_CACHE_INDEX_ENABLED = False
+        mock_set.SEMANTIC_CACHE_THRESHOLD = 0.9
+        mock_set.COMBINED_EXTRACTION_ROLLOUT_PERCENT = 100
+        mock_set.STREAMING_GENERATION_ENABLED = False
         yield mock_set
 
 
@@ -142,3 +161,22 @@ def client():
 
     # Cleanup
     app.dependency_overrides = {}
+
+
+@pytest.fixture
+def postgrest_client():
+    """
+    Factory for a mocked Supabase client whose `table().select()` query chains
+    filters onto itself and returns `pages` from successive execute() calls.
+    Returns (client, query).
+    """
+
+    def make(*pages):
+        client = MagicMock()
+        query = client.table.return_value.select.return_value
+        for method in ("eq", "gt", "gte", "lt", "or_", "order", "limit"):
+            getattr(query, method).return_value = query
+        query.execute.side_effect = [MagicMock(data=page) for page in pages]
+        return client, query
+
+    return make
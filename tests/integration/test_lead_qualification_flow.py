@@ -1,9 +1,11 @@
+import functools
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from application.workflows.agents import create_lead_processing_graph
 from domain.enums import LeadStatus
+from domain.ports import DatabasePort
 
 
 @pytest.fixture
@@ -24,7 +26,7 @@ def mock_ports():
         }
     }
 
-    def get_lead(phone):
+    def get_lead(phone, message_limit=None):
         return lead_store.get(phone)
 
     def update_lead(phone, update_data):
@@ -43,6 +45,7 @@ def mock_ports():
 
     db.get_lead.side_effect = get_lead
     db.update_lead.side_effect = update_lead
+    db.save_turn.side_effect = functools.partial(DatabasePort.save_turn, db)
     db.save_lead.side_effect = save_lead
     db.get_cached_response.return_value = None
 
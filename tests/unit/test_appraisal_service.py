@@ -4,12 +4,16 @@ Simplified unit tests for AppraisalService integration.
 Tests core functionality and investment metrics integration.
 """
 
-from unittest.mock import Mock
+import threading
+import time
+from unittest.mock import Mock, patch
 
 import pytest
 
 from application.services.appraisal import AppraisalService
-from domain.appraisal import AppraisalRequest
+from application.services.comparables_cache import ComparablesCache
+from domain.appraisal import AppraisalRequest, Comparable
+from infrastructure.adapters.cache_adapter import InMemoryCacheAdapter
 
 
 class TestAppraisalServiceIntegration:
@@ -72,3 +76,235 @@ class TestAppraisalServiceIntegration:
         assert result.confidence_level == 0
         assert result.reliability_stars == 1
         assert result.investment_metrics is None
+
+
+def _comps(n, psqm=4500):
+    return [
+        Comparable(
+            title=f"Comp {i}",
+            price=psqm * 100,
+            surface_sqm=100,
+            price_per_sqm=psqm,
+            description="",
+        )
+        for i in range(n)
+    ]
+
+
+class TestConcurrentAppraisal:
+    """Concurrent local/Perplexity fan-out in estimate_value."""
+
+    @pytest.fixture(autouse=True)
+    def real_mode(self):
+        with patch("application.services.appraisal.settings") as mock_settings:
+            mock_settings.TEST_MODE = False
+            yield
+
+    @pytest.fixture
+    def request_data(self):
+        return AppraisalRequest(city="Firenze", zone="Centro", surface_sqm=100)
+
+    def _service(self, local_result, research, local_delay=0.0, deadline=2.0, hedge=0.2, **kwargs):
+        def search_local(**kwargs):
+            time.sleep(local_delay)
+            return local_result
+
+        local_search = Mock()
+        local_search.search_local_comparables = Mock(side_effect=search_local)
+        research_port = Mock()
+        research_port.find_market_comparables = Mock(side_effect=research)
+        return AppraisalService(
+            research_port=research_port,
+            local_search=local_search,
+            concurrent=True,
+            deadline_seconds=deadline,
+            hedge_seconds=hedge,
+            **kwargs,
+        )
+
+    def test_local_hit_within_hedge_never_calls_research(self, request_data):
+        service = self._service(_comps(4), lambda **kwargs: "research", local_delay=0.05)
+
+        result = service.estimate_value(request_data)
+
+        assert len(result.comparables) == 4
+        service.executor.shutdown(wait=True)
+        service.research.find_market_comparables.assert_not_called()
+
+    def test_local_hit_after_hedge_skips_remote_extraction(self, request_data):
+        release = threading.Event()
+
+        def slow_research(**kwargs):
+            release.wait(1)
+            return "Apt | €450,000 | 100 sqm"
+
+        service = self._service(_comps(4), slow_research, local_delay=0.1, hedge=0.05)
+        service._parse_comparables = Mock(return_value=_comps(1))
+
+        start = time.monotonic()
+        result = service.estimate_value(request_data)
+        elapsed = time.monotonic() - start
+        release.set()
+
+        assert len(result.comparables) == 4
+        assert elapsed < 0.5
+        service.executor.shutdown(wait=True)
+        service.research.find_market_comparables.assert_called_once()
+        service._parse_comparables.assert_not_called()
+
+    def test_remote_answer_waits_briefly_for_local(self, request_data):
+        service = self._service(_comps(4), lambda **kwargs: "research", local_delay=0.15, hedge=0.1)
+        service._parse_comparables = Mock(return_value=_comps(5))
+
+        result = service.estimate_value(request_data)
+
+        # Research landed at ~0.1s, local search at ~0.15s: local still wins
+        assert len(result.comparables) == 4
+
+    def test_cached_research_is_not_held_back_by_hedge(self, request_data):
+        comparables_cache = Mock()
+        comparables_cache.get.return_value = _comps(3)
+        service = self._service(
+            [],
+            lambda **kwargs: "research",
+            local_delay=1.0,
+            deadline=2.0,
+            hedge=0.3,
+            comparables_cache=comparables_cache,
+        )
+
+        start = time.monotonic()
+        result = service.estimate_value(request_data)
+
+        # Only the grace period for local search, not the hedge on top of it
+        assert time.monotonic() - start < 0.5
+        assert len(result.comparables) == 3
+        service.research.find_market_comparables.assert_not_called()
+
+    def test_local_miss_uses_speculative_research(self, request_data):
+        service = self._service([], lambda **kwargs: "research")
+        service._parse_comparables = Mock(return_value=_comps(5))
+
+        result = service.estimate_value(request_data)
+
+        assert len(result.comparables) == 5
+        service.research.find_market_comparables.assert_called_once()
+
+    def test_thin_local_result_kept_when_remote_is_empty(self, request_data):
+        service = self._service(_comps(2), lambda **kwargs: "")
+        service._parse_comparables = Mock(return_value=[])
+
+        result = service.estimate_value(request_data)
+
+        assert len(result.comparables) == 2
+
+    def test_deadline_returns_fallback(self, request_data):
+        def hung_research(**kwargs):
+            time.sleep(1)
+            return ""
+
+        service = self._service([], hung_research, local_delay=0.0, deadline=0.2)
+
+        start = time.monotonic()
+        result = service.estimate_value(request_data)
+
+        assert time.monotonic() - start < 0.8
+        assert result.estimated_value == 0
+
+
+class TestComparablesExtraction:
+    """Regex first pass and the parsed-comparables cache."""
+
+    RESEARCH_TEXT = """
+    Apartment in Centro | €450,000 | 95 sqm
+    Renovated Flat | €480,000 | 100 sqm
+    Luxury Apt | €520,000 | 105 sqm
+    Bilocale in affitto | €1.300/mese | 60 mq
+    """
+
+    @pytest.fixture
+    def request_data(self):
+        return AppraisalRequest(city="Florence", zone="Centro", surface_sqm=100)
+
+    def test_regex_first_pass_skips_llm(self):
+        service = AppraisalService(research_port=Mock())
+        service._parse_comparables_llm = Mock(return_value=[])
+
+        comps = service._parse_comparables(self.RESEARCH_TEXT)
+
+        assert [c.surface_sqm for c in comps] == [95, 100, 105]
+        service._parse_comparables_llm.assert_not_called()
+
+    def test_exclusions_only_read_the_listing_itself(self):
+        text = """
+        Trilocale Oltrarno | €450,000 | 95 sqm | ottima rendita da affitto
+        Renovated Flat | €480,000 | 100 sqm | private sale, not an auction
+        Attico Santa Croce | €520,000 | 105 sqm | rent yield 4%
+        Asta giudiziaria: quadrilocale | €300.000 | 100 mq
+        Loft arredato | €15.000 al mese | 20 mq
+        """
+        service = AppraisalService(research_port=Mock())
+        service._parse_comparables_llm = Mock(return_value=[])
+
+        comps = service._parse_comparables(text)
+
+        assert [c.surface_sqm for c in comps] == [95, 100, 105]
+        service._parse_comparables_llm.assert_not_called()
+
+    def test_llm_used_when_regex_finds_too_few(self):
+        service = AppraisalService(research_port=Mock())
+        service._parse_comparables_llm = Mock(return_value=_comps(3))
+
+        comps = service._parse_comparables("Trilocale luminoso, prezzo su richiesta")
+
+        assert len(comps) == 3
+        service._parse_comparables_llm.assert_called_once()
+
+    def test_cached_comparables_skip_research(self, request_data):
+        cache = InMemoryCacheAdapter()
+        research = Mock()
+        research.find_market_comparables = Mock(return_value=self.RESEARCH_TEXT)
+        service = AppraisalService(
+            research_port=research, comparables_cache=ComparablesCache(cache)
+        )
+
+        first = service._research_comparables(request_data)
+        # Same search spelled differently, one sqm apart
+        second = service._research_comparables(
+            AppraisalRequest(city="Firenze", zone="centro", surface_sqm=101)
+        )
+
+        assert second == first
+        research.find_market_comparables.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "raw",
+        [
+            "not json",
+            '{"source": "perplexity"}',
+            '{"expires_at": "2999-01-01T00:00:00+00:00", "comparables": [{"title": 1}]}',
+        ],
+    )
+    def test_malformed_cache_entry_is_a_miss(self, request_data, raw):
+        cache = InMemoryCacheAdapter()
+        comparables_cache = ComparablesCache(cache)
+        key = comparables_cache.key("Florence", "Centro", "appartamento", 100)
+        cache.set(key, raw)
+        research = Mock()
+        research.find_market_comparables = Mock(return_value=self.RESEARCH_TEXT)
+        service = AppraisalService(research_port=research, comparables_cache=comparables_cache)
+
+        assert comparables_cache.get(key) is None
+        assert len(service._research_comparables(request_data)) == 3
+        research.find_market_comparables.assert_called_once()
+
+    def test_cache_backend_error_is_a_miss(self, request_data):
+        cache = Mock()
+        cache.get.side_effect = ConnectionError("redis down")
+        research = Mock()
+        research.find_market_comparables = Mock(return_value=self.RESEARCH_TEXT)
+        service = AppraisalService(
+            research_port=research, comparables_cache=ComparablesCache(cache)
+        )
+
+        assert len(service._research_comparables(request_data)) == 3
@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import time
+
+from infrastructure.blocking_executor import BlockingCallExecutor
+from infrastructure.metrics import blocking_calls_in_flight, blocking_calls_queue_depth
+
+
+def _gauge(gauge, route):
+    return gauge.labels(route=route)._value.get()
+
+
+def test_run_executes_off_the_event_loop():
+    executor = BlockingCallExecutor(max_workers=2)
+
+    async def main():
+        loop_thread = threading.get_ident()
+        worker_thread = await executor.run("test_thread", threading.get_ident)
+        return loop_thread, worker_thread
+
+    loop_thread, worker_thread = asyncio.run(main())
+    executor.shutdown()
+
+    assert loop_thread != worker_thread
+
+
+def test_event_loop_stays_responsive_during_blocking_call():
+    executor = BlockingCallExecutor(max_workers=2)
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.02)
+
+    async def main():
+        await asyncio.gather(executor.run("test_loop", time.sleep, 0.2), ticker())
+
+    asyncio.run(main())
+    executor.shutdown()
+
+    assert len(ticks) == 5
+    assert ticks[-1] - ticks[0] < 0.2
+
+
+def test_route_limit_queues_excess_calls():
+    executor = BlockingCallExecutor(max_workers=4, route_limits={"test_limit": 1})
+    release = threading.Event()
+    observed = {}
+
+    async def main():
+        first = asyncio.ensure_future(executor.run("test_limit", release.wait, 1))
+        second = asyncio.ensure_future(executor.run("test_limit", lambda: "done"))
+        await asyncio.sleep(0.05)
+        observed["queued"] = _gauge(blocking_calls_queue_depth, "test_limit")
+        observed["in_flight"] = _gauge(blocking_calls_in_flight, "test_limit")
+        release.set()
+        return await asyncio.gather(first, second)
+
+    results = asyncio.run(main())
+    executor.shutdown()
+
+    assert observed == {"queued": 1, "in_flight": 1}
+    assert results[1] == "done"
+    assert _gauge(blocking_calls_queue_depth, "test_limit") == 0
+    assert _gauge(blocking_calls_in_flight, "test_limit") == 0
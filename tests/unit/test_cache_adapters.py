@@ -140,7 +140,7 @@ class TestInMemoryCacheAdapter:
         adapter = InMemoryCacheAdapter()
 
         # Verify
-        assert adapter._data == {}
+        assert len(adapter._data) == 0
 
     def test_set_and_get(self):
         """Test basic SET and GET operations."""
@@ -202,14 +202,31 @@ class TestInMemoryCacheAdapter:
         # Verify - just check it completes
         assert True
 
-    def test_ttl_parameter_is_accepted_but_ignored(self):
-        """Test that TTL parameter is accepted but not enforced (in-memory limitation)."""
+    @patch("infrastructure.cache.memory_cache.time.monotonic")
+    def test_ttl_expires_entries(self, mock_monotonic):
+        """Test that entries are gone once their TTL has elapsed."""
         # Setup
+        mock_monotonic.return_value = 1000.0
         adapter = InMemoryCacheAdapter()
+        adapter.set("key1", "value1", ttl=1)
+
+        # Execute / Verify
+        assert adapter.get("key1") == "value1"
+        mock_monotonic.return_value = 1002.0
+        assert adapter.get("key1") is None
+
+    def test_evicts_least_recently_used_beyond_max_entries(self):
+        """Test that the cache stays bounded, evicting the LRU entry."""
+        # Setup
+        adapter = InMemoryCacheAdapter(max_entries=2)
+        adapter.set("key1", "value1")
+        adapter.set("key2", "value2")
+        adapter.get("key1")
 
         # Execute
-        adapter.set("key1", "value1", ttl=1)  # TTL is ignored in this simple implementation
-        result = adapter.get("key1")
+        adapter.set("key3", "value3")
 
-        # Verify - value is still there (no auto-expiration)
-        assert result == "value1"
+        # Verify
+        assert adapter.get("key2") is None
+        assert adapter.get("key1") == "value1"
+        assert adapter.get("key3") == "value3"
@@ -0,0 +1,42 @@
+from datetime import UTC, datetime, timedelta
+
+from application.services.comparable_ranking import rank_comparables
+
+NOW = datetime(2026, 10, 1, tzinfo=UTC)
+
+
+def _prop(pid, price, sqm, **extra):
+    return {"id": pid, "title": pid, "price": price, "sqm": sqm, **extra}
+
+
+def test_closest_size_and_zone_rank_first():
+    candidates = [
+        _prop("far", 560000, 140, zone_slug="centro"),
+        _prop("other-zone", 400000, 100, zone_slug="novoli"),
+        _prop("best", 405000, 100, zone_slug="centro"),
+    ]
+
+    ranked = rank_comparables(candidates, 100, zone_slug="centro", now=NOW)
+
+    assert [r.prop["id"] for r in ranked] == ["best", "other-zone", "far"]
+
+
+def test_implausible_prices_are_dropped():
+    candidates = [_prop("ok", 400000, 100), _prop("garage", 20000, 100), _prop("typo", 4e7, 80)]
+
+    ranked = rank_comparables(candidates, 100, now=NOW)
+
+    assert [r.prop["id"] for r in ranked] == ["ok"]
+
+
+def test_condition_and_recency_break_ties():
+    old = (NOW - timedelta(days=720)).isoformat()
+    fresh = (NOW - timedelta(days=10)).isoformat()
+    candidates = [
+        _prop("stale-poor", 400000, 100, condition="Da ristrutturare", updated_at=old),
+        _prop("fresh-good", 400000, 100, condition="Buono", updated_at=fresh),
+    ]
+
+    ranked = rank_comparables(candidates, 100, condition="good", k=1, now=NOW)
+
+    assert [r.prop["id"] for r in ranked] == ["fresh-good"]
@@ -0,0 +1,154 @@
+"""
+Unit tests for the in-memory ComparablesIndex.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from application.services.comparables_index import ComparablesIndex
+from application.services.local_property_search import LocalPropertySearchService
+
+
+def _listing(listing_id, sqm, price, **overrides):
+    row = {
+        "id": listing_id,
+        "title": f"Appartamento {listing_id}",
+        "description": "Luminoso",
+        "price": price,
+        "sqm": sqm,
+        "city": "Firenze",
+        "zone_slug": "santo-spirito",
+        "property_type": "apartment",
+        "condition": "good",
+        "status": "available",
+        "search_text": "appartamento luminoso santo spirito",
+        "updated_at": f"2026-10-01T00:00:{listing_id:02d}+00:00",
+        "created_at": "2026-09-01T00:00:00+00:00",
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture
+def index(postgrest_client):
+    db, _ = postgrest_client(
+        [
+            _listing(1, 100, 500000),
+            _listing(2, 110, 560000),
+            _listing(3, 60, 300000, zone_slug="campo-di-marte", search_text="bilocale"),
+            _listing(4, 95, 480000, property_type="villa"),
+            _listing(5, 100, 400000, city="Siena"),
+        ]
+    )
+    idx = ComparablesIndex(db, refresh_seconds=3600)
+    idx.refresh()
+    return idx
+
+
+def test_not_ready_before_first_refresh(postgrest_client):
+    db, _ = postgrest_client([])
+    assert ComparablesIndex(db).ready is False
+
+
+def test_filters_by_zone_type_and_size(index):
+    rows = index.candidates(
+        "Firenze", zone_slug="santo-spirito", property_type="apartment", sqm_range=(80, 120)
+    )
+
+    assert sorted(r["id"] for r in rows) == [1, 2]
+    assert "search_text" not in rows[0]
+
+
+def test_text_match_and_unknown_city(index):
+    assert [r["id"] for r in index.candidates("Firenze", text="bilocale")] == [3]
+    assert index.candidates("Roma") == []
+
+
+def test_text_match_ignores_case_and_does_not_span_listings(index):
+    assert [r["id"] for r in index.candidates("Firenze", text="BILOCALE")] == [3]
+    assert index.candidates("Firenze", text="spirito\nbilocale") == []
+
+
+def test_implausible_prices_are_filtered_out(postgrest_client):
+    db, _ = postgrest_client([_listing(1, 100, 500000), _listing(2, 100, 1000)])
+    idx = ComparablesIndex(db)
+    idx.refresh()
+
+    assert [r["id"] for r in idx.candidates("Firenze")] == [1]
+
+
+def test_limit_prefers_closest_condition_after_size(postgrest_client):
+    db, _ = postgrest_client(
+        [
+            _listing(1, 100, 500000, condition="poor"),
+            _listing(2, 100, 500000, condition="ottimo"),
+            _listing(3, 100, 500000, condition=None),
+        ]
+    )
+    idx = ComparablesIndex(db)
+    idx.refresh()
+
+    rows = idx.candidates("Firenze", sqm_range=(80, 120), condition="excellent", limit=1)
+
+    assert [r["id"] for r in rows] == [2]
+
+
+def test_limit_keeps_listings_closest_in_size(index):
+    rows = index.candidates("Firenze", sqm_range=(50, 150), limit=2)
+
+    assert [r["id"] for r in rows] == [1, 4]
+
+
+def test_incremental_refresh_applies_changes_since_watermark(postgrest_client):
+    db, query = postgrest_client(
+        [_listing(1, 100, 500000), _listing(2, 110, 560000)],
+        [
+            _listing(2, 110, 560000, status="sold", updated_at="2026-10-02T00:00:00+00:00"),
+            _listing(6, 105, 520000, updated_at="2026-10-02T00:00:01+00:00"),
+        ],
+    )
+    idx = ComparablesIndex(db)
+    idx.refresh()
+    idx.refresh()
+
+    # Re-reads an overlap window behind the newest row seen
+    query.gte.assert_called_once_with("updated_at", "2026-09-30T23:58:02+00:00")
+    assert sorted(r["id"] for r in idx.candidates("Firenze")) == [1, 6]
+    stats = idx.stats()
+    assert stats["rows"] == 2
+    assert stats["memory_bytes"] > 0
+    assert stats["watermark"] == "2026-10-02T00:00:01+00:00"
+
+
+def test_refresh_picks_up_late_commits_and_skips_applied_rows(postgrest_client):
+    db, _ = postgrest_client(
+        [_listing(1, 100, 500000), _listing(2, 110, 560000)],
+        [
+            # Already applied: re-read from the overlap window
+            _listing(2, 110, 560000),
+            # Stamped before the watermark but committed after the last refresh
+            _listing(7, 90, 450000, updated_at="2026-10-01T00:00:01.500000+00:00"),
+        ],
+    )
+    idx = ComparablesIndex(db)
+    idx.refresh()
+
+    assert idx.refresh() == 1
+    assert sorted(r["id"] for r in idx.candidates("Firenze")) == [1, 2, 7]
+
+
+def test_local_search_uses_warm_index_without_db(index):
+    db = MagicMock()
+    service = LocalPropertySearchService(db, index=index)
+
+    results = service.search_local_comparables(
+        city="Florence",
+        zone="Santo Spirito",
+        property_type="apartment",
+        surface_sqm=100,
+        min_comparables=2,
+    )
+
+    assert len(results) == 2
+    db.table.assert_not_called()
@@ -0,0 +1,78 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from application.services.embedding_service import EmbeddingService
+from domain.ports import AIPort
+from infrastructure.adapters.cache_adapter import InMemoryCacheAdapter
+
+
+def _ai():
+    ai = MagicMock(spec=AIPort)
+    ai.get_embedding.side_effect = lambda text: [float(len(text))]
+    ai.get_embeddings.side_effect = lambda texts: [[float(len(t))] for t in texts]
+    return ai
+
+
+def test_embed_hits_local_cache_on_repeat():
+    ai = _ai()
+    service = EmbeddingService(ai)
+
+    assert service.embed("ciao") == [4.0]
+    assert service.embed("ciao") == [4.0]
+
+    ai.get_embedding.assert_called_once_with("ciao")
+
+
+def test_embed_reads_shared_cache_across_instances():
+    ai = _ai()
+    cache = InMemoryCacheAdapter()
+    EmbeddingService(ai, cache=cache).embed("villa con piscina")
+
+    other = EmbeddingService(ai, cache=cache)
+
+    assert other.embed("villa con piscina") == [17.0]
+    assert ai.get_embedding.call_count == 1
+
+
+def test_lru_evicts_oldest_entry():
+    ai = _ai()
+    service = EmbeddingService(ai, max_entries=2)
+
+    for text in ["a", "bb", "ccc", "a"]:
+        service.embed(text)
+
+    assert ai.get_embedding.call_count == 4
+
+
+def test_concurrent_identical_texts_share_one_call():
+    ai = MagicMock(spec=AIPort)
+    gate = threading.Event()
+
+    def slow_embedding(text):
+        gate.wait(1)
+        return [1.0]
+
+    ai.get_embedding.side_effect = slow_embedding
+    service = EmbeddingService(ai)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(service.embed, "stesso testo") for _ in range(4)]
+        time.sleep(0.05)
+        gate.set()
+        results = [f.result() for f in futures]
+
+    assert results == [[1.0]] * 4
+    ai.get_embedding.assert_called_once()
+
+
+def test_embed_many_batches_only_misses_and_keeps_order():
+    ai = _ai()
+    service = EmbeddingService(ai)
+    service.embed("cached")
+
+    vectors = service.embed_many(["x", "cached", "yy", "x", "zzz"], batch_size=2)
+
+    assert vectors == [[1.0], [6.0], [2.0], [1.0], [3.0]]
+    assert [c.args[0] for c in ai.get_embeddings.call_args_list] == [["x", "yy"], ["zzz"]]
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from infrastructure.ml.feature_encoder import FeatureEncoder
+from infrastructure.ml.feature_engineering import PropertyFeatures
+
+FEATURE_NAMES = [
+    "sqm",
+    "bedrooms",
+    "property_age_years",
+    "has_elevator",
+    "zone_slug_centro-milano",
+    "zone_slug_prati-roma",
+    "condition_good",
+    "energy_class_B",
+]
+
+
+@pytest.mark.ml_required
+class TestFeatureEncoder:
+    def test_encode_sets_numeric_and_one_hot_columns(self):
+        encoder = FeatureEncoder(FEATURE_NAMES)
+        features = PropertyFeatures(
+            sqm=90, bedrooms=2, has_elevator=True, zone_slug="prati-roma", condition="good"
+        )
+
+        row = encoder.encode(features)
+
+        assert row.dtype == np.float32
+        assert row.shape == (1, len(FEATURE_NAMES))
+        assert row[0].tolist() == [90, 2, 30, 1, 0, 1, 1, 0]
+
+    def test_encode_reuses_buffer_and_resets_previous_row(self):
+        encoder = FeatureEncoder(FEATURE_NAMES)
+
+        first = encoder.encode(PropertyFeatures(sqm=50, zone_slug="centro-milano"))
+        second = encoder.encode(PropertyFeatures(sqm=60, zone_slug="prati-roma"))
+
+        assert first is second
+        assert second[0][FEATURE_NAMES.index("zone_slug_centro-milano")] == 0
+        assert second[0][FEATURE_NAMES.index("zone_slug_prati-roma")] == 1
+
+    def test_new_zones_from_retrained_model_are_encoded(self):
+        encoder = FeatureEncoder([*FEATURE_NAMES, "zone_slug_centro-napoli"])
+
+        row = encoder.encode(PropertyFeatures(sqm=70, zone_slug="centro-napoli"))
+
+        assert row[0][-1] == 1
+
+    def test_encode_frame_matches_single_row_encoding(self):
+        encoder = FeatureEncoder(FEATURE_NAMES)
+        batch = [
+            PropertyFeatures(sqm=90, zone_slug="prati-roma", energy_class="B"),
+            PropertyFeatures(sqm=120, bedrooms=3, zone_slug="unknown-zone"),
+        ]
+
+        matrix = encoder.encode_frame(pd.DataFrame([f.model_dump() for f in batch]))
+
+        for i, features in enumerate(batch):
+            np.testing.assert_array_equal(matrix[i], encoder.encode(features)[0])
+
+    def test_fit_matches_get_dummies_drop_first(self):
+        df = pd.DataFrame(
+            {
+                "sqm": [100, 80, None],
+                "bedrooms": [3, 2, 2],
+                "zone_slug": ["duomo-firenze", "centro-milano", "prati-roma"],
+                "condition": ["good", "fair", "good"],
+            }
+        )
+
+        encoder = FeatureEncoder.fit(df)
+
+        assert encoder.feature_names == [
+            "sqm",
+            "bedrooms",
+            "zone_slug_duomo-firenze",
+            "zone_slug_prati-roma",
+            "condition_good",
+        ]
+        # Missing values are imputed with the training median
+        assert encoder.encode_frame(df)[2][0] == 90
+
+    def test_metadata_round_trip(self):
+        encoder = FeatureEncoder.fit(pd.DataFrame({"sqm": [50, 70], "zone_slug": ["a", "b"]}))
+
+        restored = FeatureEncoder.from_metadata(encoder.to_metadata())
+
+        assert restored.feature_names == encoder.feature_names
+        assert restored.defaults["sqm"] == 60
@@ -210,3 +210,53 @@ def test_investment_metrics_all_zones():
         assert (
             metrics["monthly_rent"] == expected_rent
         ), f"Zone {zone} should have rent {expected_rent}"
+
+
+# --- Batch Prediction Tests ---
+
+
+@pytest.mark.ml_required
+def test_predict_many_matches_single_predictions():
+    """Batch predictions must agree with the single-row path."""
+    adapter = XGBoostAdapter()
+    batch = [
+        PropertyFeatures(sqm=100, condition="good", zone_slug="centro-milano"),
+        PropertyFeatures(sqm=65, bedrooms=2, condition="fair", zone_slug="prati-roma"),
+        PropertyFeatures(sqm=140, condition="luxury", energy_class="B", has_garden=True),
+    ]
+
+    result = adapter.predict_many(batch)
+
+    assert len(result) == 3
+    assert not result.fallback.any()
+    for features, value in zip(batch, result.predictions, strict=True):
+        assert value == pytest.approx(adapter.predict(features), rel=1e-4)
+
+
+@pytest.mark.ml_required
+def test_predict_many_accepts_dataframe_and_flags_fallback_rows():
+    """DataFrame input works and rows without a usable size fall back per row."""
+    import pandas as pd
+
+    adapter = XGBoostAdapter()
+    df = pd.DataFrame(
+        [
+            {"sqm": 90, "condition": "good", "zone_slug": "duomo-firenze"},
+            {"sqm": None, "condition": "good", "zone_slug": "duomo-firenze"},
+        ]
+    )
+
+    result = adapter.predict_many(df)
+
+    assert result.fallback.tolist() == [False, True]
+    assert result.predictions[0] > 0
+
+
+def test_predict_many_uses_heuristic_without_model():
+    """Without a loaded model every row is valued with the heuristic."""
+    adapter = XGBoostAdapter(model_path="models/does_not_exist.json")
+
+    result = adapter.predict_many([PropertyFeatures(sqm=100, condition="luxury")])
+
+    assert result.fallback.all()
+    assert result.predictions[0] == 100 * 5000 * 1.4
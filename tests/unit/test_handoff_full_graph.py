@@ -1,3 +1,4 @@
+import functools
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -18,7 +19,7 @@ def mock_db():
             saved_leads[phone] = {**lead_data, "id": "test-id"}
         return {"id": "test-id"}
 
-    def get_lead_side_effect(phone):
+    def get_lead_side_effect(phone, message_limit=None):
         return saved_leads.get(phone)
 
     def update_lead_side_effect(phone, data):
@@ -28,6 +29,7 @@ def mock_db():
     db.save_lead.side_effect = save_lead_side_effect
     db.get_lead.side_effect = get_lead_side_effect
     db.update_lead.side_effect = update_lead_side_effect
+    db.save_turn.side_effect = functools.partial(DatabasePort.save_turn, db)
     db.get_properties.return_value = []
     return db
 
@@ -117,6 +119,9 @@ def test_graph_routing_sentiment_handoff(mock_notifier, mock_db, mock_ai, mock_m
     req = instance.notify_agency.call_args[0][0]
     assert req.reason == HandoffReason.SENTIMENT
     assert req.priority == "urgent"
+    # The handoff check runs before the market query and the cache lookup
+    assert not {"market_analysis", "cache_check"} & set(result["node_timings"])
+    mock_db.get_cached_response.assert_not_called()
 
 
 @patch("infrastructure.adapters.notification_adapter.NotificationAdapter")
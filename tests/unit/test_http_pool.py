@@ -0,0 +1,52 @@
+import asyncio
+from typing import TypeVar
+
+from domain.ports import AIPort
+from infrastructure.http_pool import HTTPClientPool
+
+T = TypeVar("T")
+
+
+class _BlockingAI(AIPort):
+    def generate_response(self, prompt: str) -> str:
+        return prompt.upper()
+
+    def get_embedding(self, text: str) -> list[float]:
+        return [float(len(text))]
+
+    def generate_structured(self, prompt: str, schema: type[T]) -> T:
+        return schema()
+
+
+def test_pool_reuses_one_client_per_base_url():
+    pool = HTTPClientPool()
+
+    first = pool.client("https://api.example.com/v1", "key")
+    second = pool.client("https://api.example.com/v1", "key")
+    other = pool.client("https://other.example.com", "key")
+
+    assert first is second
+    assert first is not other
+    assert first.headers["Authorization"] == "Bearer key"
+    asyncio.run(pool.aclose())
+
+
+def test_aclose_drops_clients():
+    pool = HTTPClientPool()
+    client = pool.client("https://api.example.com", "key")
+    async_client = pool.async_client("https://api.example.com", "key")
+
+    asyncio.run(pool.aclose())
+
+    assert client.is_closed
+    assert async_client.is_closed
+    assert pool.client("https://api.example.com", "key") is not client
+
+
+def test_ai_port_async_defaults_wrap_blocking_calls():
+    ai = _BlockingAI()
+
+    async def main():
+        return await asyncio.gather(ai.agenerate_response("ciao"), ai.aget_embedding("abc"))
+
+    assert asyncio.run(main()) == ["CIAO", [3.0]]
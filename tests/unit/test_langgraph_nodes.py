@@ -3,14 +3,17 @@
 Tests each node's behavior through graph invocation with proper state setup.
 """
 
-from unittest.mock import MagicMock
+import functools
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 from application.workflows.agents import (
     IntentExtraction,
+    MessageUnderstanding,
     PropertyPreferences,
     SentimentAnalysis,
+    _sends_property_list,
     create_lead_processing_graph,
 )
 from domain.enums import LeadStatus
@@ -32,11 +35,13 @@ def mock_db():
             saved_leads[phone] = {**lead_data, "id": "test-lead-uuid"}
         return {"id": "test-lead-uuid"}
 
-    def get_lead_side_effect(phone):
+    def get_lead_side_effect(phone, message_limit=None):
         return saved_leads.get(phone)
 
     db.get_lead.side_effect = get_lead_side_effect
     db.save_lead.side_effect = save_lead_side_effect
+    # Unpack the per-turn flush into save_message/update_lead so tests can assert on them
+    db.save_turn.side_effect = functools.partial(DatabasePort.save_turn, db)
     db.get_properties.return_value = []
     db.get_cached_response.return_value = None
     db.get_market_stats.return_value = {"avg_price_sqm": 3500}
@@ -550,3 +555,192 @@ def test_finalize_node_saves_metadata(mock_db, mock_ai, mock_msg):
     assert "metadata" in update_payload
     assert "preferences" in update_payload["metadata"]
     assert "sentiment" in update_payload["metadata"]
+
+
+def test_nodes_share_one_fallback_chat_model(mock_db, mock_ai, mock_msg):
+    """Without an adapter LLM, the graph builds a single pooled ChatMistralAI for all nodes."""
+    fallback_llm = mock_ai.llm
+    mock_ai.llm = None
+
+    with patch("application.workflows.agents.ChatMistralAI", return_value=fallback_llm) as chat:
+        graph = create_lead_processing_graph(mock_db, mock_ai, mock_msg)
+        for text in ["Cerco casa a Milano", "Con tre camere"]:
+            graph.invoke({"phone": "+39333000000", "user_input": text})
+
+    assert chat.call_count == 1
+    assert fallback_llm.with_structured_output.call_count >= 4
+
+
+# =============================================================================
+# COMBINED EXTRACTION TESTS
+# =============================================================================
+
+
+def _combined_lead(mock_db):
+    mock_db.get_lead.side_effect = None
+    mock_db.get_lead.return_value = {
+        "id": "test-lead-uuid",
+        "customer_phone": "+39333000000",
+        "is_ai_active": True,
+        "messages": [],
+    }
+
+
+def test_combined_extraction_replaces_three_calls(mock_db, mock_ai, mock_msg):
+    """With the flag on, one MessageUnderstanding call feeds intent, preferences and sentiment."""
+    _combined_lead(mock_db)
+    combined = MagicMock()
+    combined.invoke.return_value = {
+        "parsed": MessageUnderstanding(
+            intent=IntentExtraction(budget=300000, intent="INFO", entities=["Roma"]),
+            preferences=PropertyPreferences(zones=["Prati"]),
+            sentiment=SentimentAnalysis(sentiment="NEUTRAL", urgency="LOW", notes="curious"),
+        ),
+        "raw": None,
+        "parsing_error": None,
+    }
+    default_structured = mock_ai.llm.with_structured_output.side_effect
+
+    def structured(model, **kwargs):
+        return combined if model is MessageUnderstanding else default_structured(model)
+
+    mock_ai.llm.with_structured_output.side_effect = structured
+
+    with patch("application.workflows.agents.settings.COMBINED_EXTRACTION_ENABLED", True):
+        graph = create_lead_processing_graph(mock_db, mock_ai, mock_msg)
+        result = graph.invoke({"phone": "+39333000000", "user_input": "Info su Prati, 300k"})
+
+    requested = [c.args[0] for c in mock_ai.llm.with_structured_output.call_args_list]
+    assert requested.count(MessageUnderstanding) == 1
+    assert IntentExtraction not in requested
+    assert PropertyPreferences not in requested
+    assert SentimentAnalysis not in requested
+    assert result["budget"] == 300000
+    assert result["preferences"].zones == ["Prati"]
+    assert result["sentiment"].sentiment == "NEUTRAL"
+
+
+def test_combined_extraction_falls_back_per_invalid_part(mock_db, mock_ai, mock_msg):
+    """Parts that fail validation are re-extracted by their own node; valid parts are kept."""
+    _combined_lead(mock_db)
+    raw = MagicMock()
+    raw.tool_calls = [
+        {
+            "args": {
+                "intent": {"budget": 250000, "intent": "INFO", "entities": []},
+                "preferences": {"zones": ["Navigli"]},
+                "sentiment": {"sentiment": "CONFUSED"},
+            }
+        }
+    ]
+    combined = MagicMock()
+    combined.invoke.return_value = {"parsed": None, "raw": raw, "parsing_error": ValueError()}
+    default_structured = mock_ai.llm.with_structured_output.side_effect
+
+    def structured(model, **kwargs):
+        return combined if model is MessageUnderstanding else default_structured(model)
+
+    mock_ai.llm.with_structured_output.side_effect = structured
+
+    with patch("application.workflows.agents.settings.COMBINED_EXTRACTION_ENABLED", True):
+        graph = create_lead_processing_graph(mock_db, mock_ai, mock_msg)
+        result = graph.invoke({"phone": "+39333000000", "user_input": "Navigli, 250k"})
+
+    requested = [c.args[0] for c in mock_ai.llm.with_structured_output.call_args_list]
+    assert requested.count(SentimentAnalysis) == 1
+    assert PropertyPreferences not in requested
+    assert result["preferences"].zones == ["Navigli"]
+    assert result["sentiment"].sentiment == "POSITIVE"
+
+
+# =============================================================================
+# PARALLEL BRANCH TESTS
+# =============================================================================
+
+
+def test_analysis_branches_run_concurrently_and_report_timings(mock_db, mock_ai, mock_msg):
+    """Preference extraction and the cache embedding overlap instead of running back to back."""
+    import threading
+    import time
+
+    _combined_lead(mock_db)
+    started = threading.Barrier(2, timeout=2)
+
+    def slow_embedding(text):
+        started.wait()
+        time.sleep(0.1)
+        return [0.1] * 1024
+
+    mock_ai.get_embedding.side_effect = slow_embedding
+    default_structured = mock_ai.llm.with_structured_output.side_effect
+
+    def structured(model, **kwargs):
+        m = default_structured(model)
+        if model is PropertyPreferences:
+            result = m.invoke.return_value
+
+            def slow_preferences(prompt):
+                started.wait()
+                time.sleep(0.1)
+                return result
+
+            m.invoke.side_effect = slow_preferences
+        return m
+
+    mock_ai.llm.with_structured_output.side_effect = structured
+
+    graph = create_lead_processing_graph(mock_db, mock_ai, mock_msg)
+    result = graph.invoke({"phone": "+39333000000", "user_input": "Cerco un bilocale"})
+
+    timings = result["node_timings"]
+    assert {"ingest", "intent", "sentiment", "cache_check", "analysis_join"} <= set(timings)
+    assert timings["preferences"] >= 100
+    assert timings["cache_check"] >= 100
+    assert result["ai_response"] == "AI generated response"
+
+
+# =============================================================================
+# STREAMING GENERATION TESTS
+# =============================================================================
+
+
+def test_streaming_generation_sends_segments_and_skips_final_send(mock_db, mock_ai, mock_msg):
+    """Streamed replies go out sentence by sentence and tokens reach the lead's dashboard room."""
+    _combined_lead(mock_db)
+    reply = "Ciao! Ho trovato un trilocale perfetto per te a Brera.\n\nVuoi fissare una visita?"
+    chunks = [MagicMock(content=reply[i : i + 5]) for i in range(0, len(reply), 5)]
+    chunks.insert(3, MagicMock(content=""))
+    mock_ai.llm.stream.return_value = chunks
+    mock_msg.send_message.side_effect = ["SM1", "SM2"]
+
+    with (
+        patch("application.workflows.agents.settings.STREAMING_GENERATION_ENABLED", True),
+        patch("application.workflows.agents._broadcast_to_room") as broadcast,
+    ):
+        graph = create_lead_processing_graph(mock_db, mock_ai, mock_msg)
+        result = graph.invoke({"phone": "+39333000000", "user_input": "Cerco a Brera"})
+
+    assert result["ai_response"] == reply
+    assert [c.args[1] for c in mock_msg.send_message.call_args_list] == [
+        "Ciao! Ho trovato un trilocale perfetto per te a Brera.",
+        "Vuoi fissare una visita?",
+    ]
+    tokens = [c.args[0] for c in broadcast.call_args_list if c.args[0]["type"] == "token"]
+    assert "".join(t["delta"] for t in tokens) == reply
+    assert [t["index"] for t in tokens] == list(range(len(tokens)))
+    assert {c.kwargs["room_id"] for c in broadcast.call_args_list} == {"+39333000000"}
+    assistant_msg = mock_db.save_message.call_args_list[-1].args[1]
+    assert assistant_msg["sid"] == "SM2"
+
+
+def test_property_list_is_skipped_once_status_mentions_a_list():
+    """Streaming and finalize_node agree on when matches go out as an interactive list."""
+    state = {
+        "source": "WHATSAPP",
+        "retrieved_properties": [{"id": "p1"}],
+        "status_msg": "Showing best available matches based on your criteria.",
+    }
+    assert _sends_property_list(state)
+    assert not _sends_property_list({**state, "status_msg": "Already sent the list"})
+    assert not _sends_property_list({**state, "retrieved_properties": []})
+    assert not _sends_property_list({**state, "source": "WEB"})
@@ -0,0 +1,101 @@
+from unittest.mock import MagicMock, patch
+from uuid import UUID
+
+import pytest
+
+from application.services.lead_scorer import LeadScorer
+from domain.qualification import LeadCategory, LeadScore, QualificationData
+from infrastructure.adapters.cache_adapter import InMemoryCacheAdapter
+from infrastructure.adapters.supabase_adapter import SupabaseAdapter
+from infrastructure.cache.lead_cache import LeadCache, lead_request_scope
+
+PHONE = "+393331234567"
+
+
+@pytest.fixture
+def adapter():
+    with patch("infrastructure.adapters.supabase_adapter.supabase_pool") as mock_pool:
+        mock_pool.client.return_value = MagicMock()
+        adapter = SupabaseAdapter(lead_cache=LeadCache(cache=InMemoryCacheAdapter()))
+    adapter._fetch_lead = MagicMock(  # type: ignore[method-assign]
+        side_effect=lambda phone, limit: {
+            "id": "lead-1",
+            "customer_phone": phone,
+            "status": "active",
+            "messages": [{"content": "uno"}, {"content": "due"}],
+            "message_count": 5,
+        }
+    )
+    return adapter
+
+
+def test_request_scope_reads_lead_once(adapter):
+    with lead_request_scope():
+        adapter.get_lead(PHONE, message_limit=10)
+        adapter.get_lead(PHONE, message_limit=0)
+        lead = adapter.get_lead(PHONE, message_limit=1)
+
+    assert adapter._fetch_lead.call_count == 1
+    assert lead["messages"] == [{"content": "due"}]
+
+
+def test_shared_tier_serves_the_next_request(adapter):
+    adapter.get_lead(PHONE, message_limit=10)
+
+    with lead_request_scope():
+        adapter.get_lead(PHONE, message_limit=10)
+
+    assert adapter._fetch_lead.call_count == 1
+
+
+def test_partial_history_does_not_serve_full_history(adapter):
+    with lead_request_scope():
+        adapter.get_lead(PHONE, message_limit=2)
+        adapter.get_lead(PHONE)
+
+    assert adapter._fetch_lead.call_count == 2
+
+
+def test_writes_patch_request_copy_and_drop_shared_entry(adapter):
+    with lead_request_scope():
+        adapter.get_lead(PHONE, message_limit=10)
+        adapter.update_lead(PHONE, {"status": "scheduled"})
+        adapter.save_message("lead-1", {"role": "user", "content": "tre"})
+        lead = adapter.get_lead(PHONE, message_limit=10)
+
+    assert adapter._fetch_lead.call_count == 1
+    assert lead["status"] == "scheduled"
+    assert lead["messages"][-1]["content"] == "tre"
+    assert lead["message_count"] == 6
+
+    adapter.get_lead(PHONE, message_limit=10)
+    assert adapter._fetch_lead.call_count == 2
+
+
+def test_returned_leads_are_copies(adapter):
+    with lead_request_scope():
+        adapter.get_lead(PHONE, message_limit=10)["status"] = "mutated"
+        assert adapter.get_lead(PHONE, message_limit=10)["status"] == "active"
+
+
+def test_lead_routing_drops_cached_lead(adapter):
+    lead_id = UUID(int=1)
+    adapter._fetch_lead.side_effect = lambda phone, limit: {
+        "id": str(lead_id),
+        "customer_phone": phone,
+        "messages": [],
+        "message_count": 0,
+    }
+    score = LeadScore(
+        raw_score=18,
+        normalized_score=9,
+        category=LeadCategory.HOT,
+        details=QualificationData(),
+        action_item="",
+    )
+    adapter.get_lead(PHONE)
+
+    LeadScorer(adapter).route_lead(lead_id, score)
+    adapter.get_lead(PHONE)
+
+    assert adapter._fetch_lead.call_count == 2
@@ -59,9 +59,12 @@ class TestLocalPropertySearchService:
         )
 
         assert len(results) == 3
-        # Verify ilike was called with Firenze
-        ilike_calls = [call.args for call in mock_query.ilike.call_args_list]
-        assert any("Firenze" in arg[1] for arg in ilike_calls)
+        # Verify the indexed columns were filtered with normalized keys
+        eq_calls = [call.args for call in mock_query.eq.call_args_list]
+        assert ("city", "Firenze") in eq_calls
+        assert ("zone_slug", "centro") in eq_calls
+        assert ("property_type", "apartment") in eq_calls
+        mock_query.ilike.assert_not_called()
 
     def test_sanity_check_filtering(self, search_service, mock_db):
         """Should filter out properties with unrealistic price/sqm."""
@@ -114,3 +117,67 @@ class TestLocalPropertySearchService:
         )
 
         assert results == []
+
+    def test_text_fallback_when_zone_column_has_too_few_matches(self, search_service, mock_db):
+        """Should fall back to the trigram-indexed text match and merge results."""
+        mock_query = Mock()
+        mock_db.table.return_value = mock_query
+        for method in ("select", "eq", "ilike", "gte", "lte", "limit"):
+            getattr(mock_query, method).return_value = mock_query
+        mock_query.execute.side_effect = [
+            Mock(data=[{"id": 1, "title": "A", "price": 400000, "sqm": 100}]),
+            Mock(
+                data=[
+                    {"id": 1, "title": "A", "price": 400000, "sqm": 100},
+                    {"id": 2, "title": "B", "price": 420000, "sqm": 95},
+                ]
+            ),
+        ]
+
+        results = search_service.search_local_comparables(
+            city="Firenze", zone="Santo Spirito", surface_sqm=100, min_comparables=2
+        )
+
+        assert sorted(r.title for r in results) == ["A", "B"]
+        mock_query.ilike.assert_called_once_with("search_text", "%santo spirito%")
+
+    def test_legacy_schema_falls_back_to_description_match(self, search_service, mock_db):
+        """Should keep working before the search-columns migration has run."""
+        mock_query = Mock()
+        mock_db.table.return_value = mock_query
+        for method in ("select", "eq", "ilike", "gte", "lte", "limit"):
+            getattr(mock_query, method).return_value = mock_query
+        mock_query.execute.side_effect = [
+            Exception("{'code': '42703', 'message': 'column properties.city does not exist'}"),
+            Mock(data=[{"id": 1, "title": "A", "price": 400000, "sqm": 100}]),
+        ]
+
+        results = search_service.search_local_comparables(city="Florence", surface_sqm=100)
+
+        assert len(results) == 1
+        mock_query.ilike.assert_called_once_with("description", "%Firenze%")
+
+    def test_widens_search_until_enough_candidates(self, search_service, mock_db):
+        """Should drop the zone and widen the sqm band step by step."""
+        mock_query = Mock()
+        mock_db.table.return_value = mock_query
+        for method in ("select", "eq", "ilike", "gte", "lte", "limit"):
+            getattr(mock_query, method).return_value = mock_query
+        city_wide = [
+            {"id": i, "title": f"P{i}", "price": 400000 + i * 1000, "sqm": 100} for i in range(3)
+        ]
+        mock_query.execute.side_effect = [
+            Mock(data=[]),  # zone, +/-20%
+            Mock(data=[]),  # zone text match, +/-20%
+            Mock(data=[]),  # zone, +/-35%
+            Mock(data=[]),  # zone text match, +/-35%
+            Mock(data=city_wide),  # whole city, +/-35%
+        ]
+
+        results = search_service.search_local_comparables(
+            city="Firenze", zone="Oltrarno", surface_sqm=100
+        )
+
+        assert len(results) == 3
+        assert mock_query.execute.call_count == 5
+        mock_query.gte.assert_called_with("sqm", 65)
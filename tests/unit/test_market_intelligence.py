@@ -6,6 +6,25 @@ import pytest
 from application.services.market_intelligence import MarketIntelligenceService
 
 
+def _stats(**values):
+    stats = dict.fromkeys(
+        [
+            "listings_count",
+            "sample_size",
+            "avg_price_sqm",
+            "median_price_sqm",
+            "p25_price_sqm",
+            "p75_price_sqm",
+            "min_price_sqm",
+            "max_price_sqm",
+            "avg_price",
+        ],
+        0,
+    )
+    stats.update(values)
+    return stats
+
+
 class TestMarketIntelligenceService:
     @pytest.fixture
     def mock_dependencies(self):
@@ -71,6 +90,9 @@ class TestMarketIntelligenceService:
             {"price_per_mq": 3500, "zone": "Prati"},
             {"price_per_mq": 4500, "zone": "Trastevere"},
         ]
+        mock_dependencies["db"].get_market_aggregates.return_value = _stats(
+            listings_count=3, sample_size=3, avg_price_sqm=4000.0, median_price_sqm=4000.0
+        )
 
         # Mock AI response
         ai_response = json.dumps(
@@ -88,8 +110,10 @@ class TestMarketIntelligenceService:
         # Verify cache was checked
         mock_dependencies["cache"].get.assert_called_once_with(cache_key)
 
-        # Verify database was queried
+        # Verify stats were aggregated by the database and only a sample was fetched
+        mock_dependencies["db"].get_market_aggregates.assert_called_once_with(zone=None, city=city)
         mock_dependencies["db"].client.table.assert_called_once_with("market_data")
+        mock_query.limit.assert_called_once_with(10)
 
         # Verify AI was called
         mock_dependencies["ai"].generate_response.assert_called_once()
@@ -99,6 +123,7 @@ class TestMarketIntelligenceService:
         assert "stats" in result
         assert result["stats"]["avg_price"] == 4000.0
         assert result["stats"]["count"] == 3
+        assert result["stats"]["median_price"] == 4000.0
 
         # Verify cache was updated
         mock_dependencies["cache"].set.assert_called_once()
@@ -122,6 +147,7 @@ class TestMarketIntelligenceService:
         mock_query.limit.return_value = mock_query
         mock_query.execute.return_value = mock_result
         mock_result.data = []  # No data
+        mock_dependencies["db"].get_market_aggregates.return_value = _stats()
 
         # Execute
         result = service.get_market_analysis(city="Unknown City")
@@ -149,6 +175,9 @@ class TestMarketIntelligenceService:
         mock_query.limit.return_value = mock_query
         mock_query.execute.return_value = mock_result
         mock_result.data = [{"price_per_mq": 5000}]
+        mock_dependencies["db"].get_market_aggregates.return_value = _stats(
+            listings_count=1, avg_price_sqm=5000.0
+        )
 
         # Mock AI
         ai_response = json.dumps(
@@ -179,6 +208,9 @@ class TestMarketIntelligenceService:
         mock_query.limit.return_value = mock_query
         mock_query.execute.return_value = mock_result
         mock_result.data = [{"price_per_mq": 3000}]
+        mock_dependencies["db"].get_market_aggregates.return_value = _stats(
+            listings_count=1, avg_price_sqm=3000.0
+        )
 
         ai_response = json.dumps(
             {
@@ -195,3 +227,17 @@ class TestMarketIntelligenceService:
         # Verify fallback to database
         mock_dependencies["db"].client.table.assert_called_once()
         assert result["sentiment"] == "POSITIVO"
+
+    def test_predict_market_trend_compares_aggregated_windows(self, service, mock_dependencies):
+        """Trend compares two database-side averages instead of fetching rows."""
+        mock_dependencies["db"].get_market_aggregates.side_effect = [
+            _stats(listings_count=4, avg_price_sqm=5300.0),
+            _stats(listings_count=6, avg_price_sqm=5000.0),
+        ]
+
+        result = service.predict_market_trend(zone="Brera")
+
+        assert result["trend"] == "RISING"
+        assert result["change_pct"] == 6.0
+        assert mock_dependencies["db"].get_market_aggregates.call_count == 2
+        mock_dependencies["db"].client.table.assert_not_called()
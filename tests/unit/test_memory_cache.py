@@ -0,0 +1,62 @@
+"""
+Unit tests for BoundedTTLCache.
+"""
+
+from unittest.mock import patch
+
+from infrastructure.cache.memory_cache import BoundedTTLCache
+from infrastructure.metrics import cache_evictions_total
+
+
+def test_evicts_by_bytes():
+    cache = BoundedTTLCache(max_entries=100, max_bytes=10)
+    cache.set("a", "12345")
+    cache.set("b", "12345")
+
+    cache.set("c", "123")
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "12345"
+    assert cache.size_bytes == 8
+
+
+def test_rejects_value_larger_than_bound():
+    cache = BoundedTTLCache(max_bytes=4)
+
+    cache.set("a", "too large")
+
+    assert len(cache) == 0
+
+
+@patch("infrastructure.cache.memory_cache.time.monotonic")
+def test_periodic_sweep_drops_unread_expired_entries(mock_monotonic):
+    mock_monotonic.return_value = 0.0
+    cache = BoundedTTLCache(default_ttl=10, sweep_interval=60)
+    cache.set("idle", "value")
+    cache.set("fresh", "value", ttl=1000)
+
+    mock_monotonic.return_value = 61.0
+    cache.get("fresh")
+
+    assert len(cache) == 1
+
+
+@patch("infrastructure.cache.memory_cache.time.monotonic")
+def test_explicit_zero_ttl_is_not_the_default(mock_monotonic):
+    mock_monotonic.return_value = 0.0
+    cache = BoundedTTLCache(default_ttl=10)
+
+    cache.set("a", "value", ttl=0)
+
+    assert cache.get("a") is None
+
+
+def test_counts_evictions_under_cache_type():
+    evictions = cache_evictions_total.labels(cache_type="test_bounded")
+    before = evictions._value.get()
+    cache = BoundedTTLCache(max_entries=1, cache_type="test_bounded")
+
+    cache.set("a", "1")
+    cache.set("b", "2")
+
+    assert evictions._value.get() == before + 1
@@ -0,0 +1,107 @@
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+from infrastructure.ml.feature_engineering import PropertyFeatures
+from infrastructure.ml.model_server import ModelServer
+from infrastructure.ml.xgboost_adapter import XGBoostAdapter
+
+
+@pytest.mark.ml_required
+class TestModelServer:
+    def test_model_loaded_once_and_reused(self):
+        server = ModelServer()
+        features = PropertyFeatures(sqm=100, condition="good", zone_slug="centro-milano")
+
+        with patch(
+            "infrastructure.ml.model_server.XGBoostAdapter", wraps=XGBoostAdapter
+        ) as adapter_cls:
+            first = server.predict(features)
+            second = server.predict(features)
+
+        assert adapter_cls.call_count == 1
+        assert first == second
+        assert first > 0
+
+    def test_stats_report_load_time_and_prediction_count(self):
+        server = ModelServer()
+        server.warm_up()
+        server.predict(PropertyFeatures(sqm=80))
+        server.predict(PropertyFeatures(sqm=90))
+
+        stats = server.stats()
+        version_stats = stats["versions"][stats["active_version"]]
+        assert stats["active_version"] == "v1.0"
+        assert version_stats["predictions"] == 2
+        assert version_stats["load_seconds"] >= 0
+
+    def test_reload_swaps_to_registry_version(self):
+        import xgboost as xgb
+
+        from infrastructure.ml.model_registry import ModelRegistry
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            registry = ModelRegistry(storage_path=temp_dir)
+            model = xgb.XGBRegressor(n_estimators=2)
+            model.fit([[1], [2], [3]], [1, 2, 3])
+            version = registry.save_model(model, {"mape": 0.1})
+
+            server = ModelServer(registry=registry)
+            server.warm_up()
+            served = server.reload()
+
+            assert served == version
+            assert server.model_version == version
+            assert set(server.stats()["versions"]) == {"v1.0", version}
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_reload_of_active_version_keeps_prediction_count(self):
+        import xgboost as xgb
+
+        from infrastructure.ml.model_registry import ModelRegistry
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            registry = ModelRegistry(storage_path=temp_dir)
+            model = xgb.XGBRegressor(n_estimators=2)
+            model.fit([[1], [2], [3]], [1, 2, 3])
+            version = registry.save_model(model, {"mape": 0.1})
+
+            server = ModelServer(registry=registry)
+            server.reload(version)
+            server.predict(PropertyFeatures(sqm=80))
+            server.reload(version)
+
+            assert server.stats()["versions"][version]["predictions"] == 1
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_failed_reload_records_no_stats(self):
+        from infrastructure.ml.model_registry import ModelRegistry
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            registry = ModelRegistry(storage_path=temp_dir)
+            server = ModelServer(registry=registry)
+            server.warm_up()
+            with pytest.raises(RuntimeError):
+                server.reload("v-missing")
+
+            assert set(server.stats()["versions"]) == {"v1.0"}
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_reload_without_candidates_raises(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            from infrastructure.ml.model_registry import ModelRegistry
+
+            server = ModelServer(registry=ModelRegistry(storage_path=temp_dir))
+            with pytest.raises(ValueError):
+                server.reload()
+        finally:
+            shutil.rmtree(temp_dir)
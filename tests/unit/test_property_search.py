@@ -0,0 +1,51 @@
+from domain.property_search import (
+    comparables_query_key,
+    normalize_city,
+    normalize_property_type,
+    property_search_keys,
+    surface_bucket,
+    zone_slug,
+)
+
+
+def test_normalize_city_maps_variants():
+    assert normalize_city("Florence") == "Firenze"
+    assert normalize_city(" milano ") == "Milano"
+    assert normalize_city("montepulciano") == "Montepulciano"
+    assert normalize_city("") is None
+
+
+def test_zone_slug_ignores_case_and_accents():
+    assert zone_slug("Santo Spirito") == "santo-spirito"
+    assert zone_slug("Città Studi") == "citta-studi"
+    assert zone_slug(None) is None
+
+
+def test_normalize_property_type_from_listing_titles():
+    assert normalize_property_type("Attico a Milano Centro") == "penthouse"
+    assert normalize_property_type("Trilocale Via Roma") == "apartment"
+    assert normalize_property_type("Lakefront Villa") == "villa"
+    assert normalize_property_type("Box auto") is None
+
+
+def test_property_search_keys_infers_city_from_text():
+    keys = property_search_keys(
+        {"title": "Bilocale Moderno", "description": "Nel cuore di Firenze", "zone": "Oltrarno"}
+    )
+
+    assert keys == {"city": "Firenze", "zone_slug": "oltrarno", "property_type": "apartment"}
+
+
+def test_surface_bucket_groups_nearby_sizes():
+    assert surface_bucket(95) == surface_bucket(96)
+    assert surface_bucket(95) != surface_bucket(120)
+    assert surface_bucket(0) is None
+
+
+def test_comparables_query_key_ignores_spelling_variants():
+    assert comparables_query_key("florence", "Santo Spirito", "appartamento", 95) == (
+        comparables_query_key("Firenze", "santo-spirito", "apartment", 96)
+    )
+    assert comparables_query_key("Firenze", "Oltrarno", "villa", 95) != (
+        comparables_query_key("Firenze", "Oltrarno", "apartment", 95)
+    )
@@ -0,0 +1,35 @@
+from application.services.response_segmenter import SentenceSegmenter
+
+
+def _stream(segmenter, text, step=3):
+    segments = []
+    for i in range(0, len(text), step):
+        segments.extend(segmenter.feed(text[i : i + step]))
+    return segments
+
+
+def test_short_sentences_are_held_until_min_chars():
+    segmenter = SentenceSegmenter(min_chars=30)
+
+    segments = _stream(segmenter, "Ciao Mario! Ho trovato tre case. Vuoi vederle? ")
+
+    assert segments == ["Ciao Mario! Ho trovato tre case."]
+    assert segmenter.flush() == "Vuoi vederle?"
+
+
+def test_paragraph_break_releases_segment_immediately():
+    segmenter = SentenceSegmenter(min_chars=500)
+
+    segments = _stream(segmenter, "Ecco le opzioni:\n\n- Trilocale Brera")
+
+    assert segments == ["Ecco le opzioni:"]
+    assert segmenter.flush() == "- Trilocale Brera"
+
+
+def test_prices_with_dots_are_not_split():
+    segmenter = SentenceSegmenter(min_chars=5)
+
+    segments = _stream(segmenter, "Prezzo €350.000 trattabili. Zona Navigli.")
+
+    assert segments == ["Prezzo €350.000 trattabili."]
+    assert segmenter.flush() == "Zona Navigli."
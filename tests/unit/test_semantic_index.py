@@ -0,0 +1,129 @@
+"""
+Unit tests for the in-memory SemanticCacheIndex.
+"""
+
+import json
+import time
+from unittest.mock import patch
+
+from infrastructure.adapters.supabase_adapter import SupabaseAdapter
+from infrastructure.cache.semantic_index import SemanticCacheIndex
+
+
+def _row(query, embedding, response, **overrides):
+    row = {
+        "id": query,
+        "query_text": query,
+        # PostgREST serializes pgvector columns as strings
+        "query_embedding": json.dumps(embedding),
+        "response_text": response,
+        "tenant_id": "t1",
+        "language": "it",
+        "updated_at": "2026-10-17T00:00:00+00:00",
+    }
+    row.update(overrides)
+    return row
+
+
+def _index(postgrest_client, **kwargs):
+    db, _ = postgrest_client([])
+    return SemanticCacheIndex(db, refresh_seconds=3600, **kwargs)
+
+
+def test_refresh_loads_rows_into_scoped_partitions(postgrest_client):
+    db, _ = postgrest_client(
+        [
+            _row("prezzi a Brera?", [1.0, 0.0, 0.0], "Circa 9000 euro/mq"),
+            _row("prices in Brera?", [1.0, 0.0, 0.0], "About 9000 eur/sqm", language="en"),
+        ]
+    )
+    index = SemanticCacheIndex(db, refresh_seconds=3600)
+
+    assert index.ready is False
+    index.refresh()
+
+    assert index.ready is True
+    assert index.lookup([0.9, 0.1, 0.0], tenant_id="t1", language="it") == "Circa 9000 euro/mq"
+    assert index.lookup([0.9, 0.1, 0.0], tenant_id="t1", language="en") == "About 9000 eur/sqm"
+    assert index.lookup([0.9, 0.1, 0.0], tenant_id="t2", language="it") is None
+
+
+def test_threshold_rejects_distant_queries(postgrest_client):
+    index = _index(postgrest_client, threshold=0.95)
+    index.add("a", [1.0, 0.0], "risposta")
+
+    assert index.lookup([1.0, 0.5]) is None
+    assert index.lookup([1.0, 0.5], threshold=0.8) == "risposta"
+
+
+def test_expired_entries_never_match(postgrest_client):
+    index = _index(postgrest_client, ttl_seconds=60)
+    index.add("a", [1.0, 0.0], "vecchia", stored_at=time.time() - 120)
+
+    assert index.lookup([1.0, 0.0]) is None
+    index.refresh()
+    assert len(index) == 0
+
+
+def test_expired_nearest_entry_does_not_hide_live_match(postgrest_client):
+    index = _index(postgrest_client, ttl_seconds=60)
+    index.add("a", [1.0, 0.0], "vecchia", stored_at=time.time() - 120)
+    index.add("b", [1.0, 0.1], "nuova")
+
+    assert index.lookup([1.0, 0.0]) == "nuova"
+
+
+def test_refresh_picks_up_late_commits_and_skips_applied_rows(postgrest_client):
+    db, query = postgrest_client(
+        [_row("a", [1.0, 0.0], "A", updated_at="2026-10-17T00:00:10+00:00")],
+        [
+            # Already applied: re-read from the overlap window
+            _row("a", [1.0, 0.0], "A", updated_at="2026-10-17T00:00:10+00:00"),
+            # Stamped before the watermark but committed after the last refresh
+            _row("b", [0.0, 1.0], "B", updated_at="2026-10-17T00:00:05+00:00"),
+        ],
+    )
+    index = SemanticCacheIndex(db, refresh_seconds=3600, ttl_seconds=10**9)
+    index.refresh()
+
+    assert index.refresh() == 1
+    query.gte.assert_called_with("updated_at", "2026-10-16T23:58:10+00:00")
+    assert index.lookup([0.0, 1.0], tenant_id="t1", language="it") == "B"
+
+
+def test_evicts_least_recently_used_past_max_entries(postgrest_client):
+    index = _index(postgrest_client, max_entries=2)
+    index.add("a", [1.0, 0.0, 0.0], "A")
+    index.add("b", [0.0, 1.0, 0.0], "B")
+    assert index.lookup([1.0, 0.0, 0.0]) == "A"
+
+    index.add("c", [0.0, 0.0, 1.0], "C")
+
+    assert len(index) == 2
+    assert index.lookup([0.0, 1.0, 0.0]) is None
+    assert index.lookup([1.0, 0.0, 0.0]) == "A"
+
+
+def test_rewrite_moves_query_between_scopes(postgrest_client):
+    index = _index(postgrest_client)
+    index.add("a", [1.0, 0.0], "old", language="it")
+    index.add("a", [1.0, 0.0], "new", language="en")
+
+    assert index.lookup([1.0, 0.0], language="it") is None
+    assert index.lookup([1.0, 0.0], language="en") == "new"
+
+
+def test_adapter_uses_ready_index_instead_of_rpc(postgrest_client):
+    index = _index(postgrest_client)
+    index.refresh()
+    with patch("infrastructure.adapters.supabase_adapter.supabase_pool"):
+        adapter = SupabaseAdapter(semantic_index=index)
+
+    adapter.save_to_cache("ciao", [1.0, 0.0], "Salve!", tenant_id="t1", language="it")
+    cached = adapter.get_cached_response([1.0, 0.0], tenant_id="t1", language="it")
+
+    assert cached == "Salve!"
+    adapter.client.rpc.assert_not_called()
+    row = adapter.client.table.return_value.upsert.call_args.args[0]
+    assert row["tenant_id"] == "t1"
+    assert row["language"] == "it"
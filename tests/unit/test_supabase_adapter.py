@@ -7,13 +7,17 @@ from infrastructure.adapters.supabase_adapter import SupabaseAdapter
 
 @pytest.fixture
 def adapter():
-    with patch("infrastructure.adapters.supabase_adapter.create_client") as mock_create:
+    with patch("infrastructure.adapters.supabase_adapter.supabase_pool") as mock_pool:
         mock_client = MagicMock()
-        mock_create.return_value = mock_client
+        mock_pool.client.return_value = mock_client
         return SupabaseAdapter()
 
 
 def test_get_market_stats_success(adapter):
+    # Databases without the market_zone_stats function aggregate client-side
+    adapter.client.rpc.return_value.execute.side_effect = Exception(
+        "{'code': 'PGRST202', 'message': 'Could not find the function'}"
+    )
     # Setup the chain: adapter.client.table().select().ilike().execute()
     mock_execute = MagicMock()
     mock_execute.execute.return_value = MagicMock(
@@ -28,6 +32,7 @@ def test_get_market_stats_success(adapter):
     stats = adapter.get_market_stats("Milano")
     assert stats["listings_count"] == 2
     assert stats["avg_price_sqm"] == 5500
+    assert stats["median_price_sqm"] == 5500
 
 
 def test_save_lead(adapter):
@@ -44,4 +49,141 @@ def test_save_lead(adapter):
             "messages": [{"role": "user", "content": "hello"}],
         }
     )
-    assert result is None
+    # The stored row is returned so callers don't need to re-fetch the lead
+    assert result == {"id": 1}
+
+
+def test_get_lead_fetches_recent_messages_in_one_request(adapter):
+    query = adapter.client.table.return_value.select.return_value.eq.return_value
+    query.order.return_value = query
+    query.limit.return_value = query
+    query.execute.return_value = MagicMock(
+        data=[
+            {
+                "id": "lead-1",
+                "customer_phone": "+393331234567",
+                "messages": [{"content": "newest"}, {"content": "older"}],
+                "message_count": [{"count": 42}],
+            }
+        ]
+    )
+
+    lead = adapter.get_lead("+393331234567", message_limit=2)
+
+    adapter.client.table.assert_called_once_with("leads")
+    query.order.assert_called_once_with("created_at", desc=True, foreign_table="messages")
+    query.limit.assert_any_call(2, foreign_table="messages")
+    assert [m["content"] for m in lead["messages"]] == ["older", "newest"]
+    assert lead["message_count"] == 42
+
+
+def test_save_turn_writes_messages_and_lead_in_one_rpc(adapter):
+    messages = [
+        {"role": "user", "content": "ciao", "timestamp": "t1"},
+        {"role": "assistant", "content": "salve", "timestamp": "t2", "metadata": {"sid": "SM1"}},
+    ]
+
+    adapter.save_turn("+393331234567", "lead-1", messages, {"status": "active"})
+
+    name, params = adapter.client.rpc.call_args.args
+    assert name == "save_conversation_turn"
+    assert [row["content"] for row in params["p_messages"]] == ["ciao", "salve"]
+    assert params["p_lead_update"] == {"status": "active"}
+    adapter.client.table.assert_not_called()
+
+
+def test_save_turn_falls_back_when_rpc_is_missing(adapter):
+    adapter.client.rpc.return_value.execute.side_effect = Exception(
+        "{'code': 'PGRST202', 'message': 'Could not find the function'}"
+    )
+
+    adapter.save_turn(
+        "+393331234567", "lead-1", [{"role": "user", "content": "ciao"}], {"status": "active"}
+    )
+
+    adapter.client.table.return_value.upsert.assert_called_once()
+    assert adapter.client.table.return_value.upsert.call_args.kwargs == {
+        "on_conflict": "id",
+        "ignore_duplicates": True,
+    }
+    adapter.client.table.return_value.update.assert_called_once_with({"status": "active"})
+
+
+@patch.object(SupabaseAdapter._write_turn.retry, "sleep", lambda _: None)
+def test_save_turn_retries_with_the_same_message_ids(adapter):
+    # The first attempt may have committed: the retry must reuse its ids so the
+    # RPC's ON CONFLICT (id) DO NOTHING skips the messages already stored
+    adapter.client.rpc.return_value.execute.side_effect = [Exception("connection reset"), None]
+
+    adapter.save_turn("+393331234567", "lead-1", [{"role": "user", "content": "ciao"}], {})
+
+    first, second = (c.args[1]["p_messages"] for c in adapter.client.rpc.call_args_list)
+    assert first[0]["id"] == second[0]["id"]
+
+
+def test_save_turn_rejects_lead_fields_the_rpc_cannot_write(adapter):
+    with pytest.raises(ValueError):
+        adapter.save_turn("+393331234567", "lead-1", [], {"customer_name": "Mario"})
+
+    adapter.client.rpc.assert_not_called()
+
+
+def test_get_market_aggregates_uses_rpc(adapter):
+    adapter.client.rpc.return_value.execute.return_value = MagicMock(
+        data=[{"listings_count": 12, "sample_size": 10, "avg_price_sqm": 5100.5}]
+    )
+
+    stats = adapter.get_market_aggregates(zone="Brera", city="Milano")
+
+    adapter.client.rpc.assert_called_once_with(
+        "market_zone_stats",
+        {"p_zone": "Brera", "p_city": "Milano", "p_since": None, "p_until": None},
+    )
+    assert stats["avg_price_sqm"] == 5100.5
+    assert stats["median_price_sqm"] == 0
+    adapter.client.table.assert_not_called()
+
+
+def test_get_property_interest_stats_uses_rpc(adapter):
+    adapter.client.rpc.return_value.execute.return_value = MagicMock(
+        data=[{"total_leads": 4, "hot_leads": 2, "scheduled_viewings": 1}]
+    )
+
+    stats = adapter.get_property_interest_stats("prop-1", hot_threshold=60)
+
+    adapter.client.rpc.assert_called_once_with(
+        "property_interest_stats", {"p_property_id": "prop-1", "p_hot_threshold": 60}
+    )
+    assert stats == {"total_leads": 4, "hot_leads": 2, "scheduled_viewings": 1}
+    adapter.client.table.assert_not_called()
+
+
+def test_get_property_interest_stats_falls_back_to_containment_filter(adapter):
+    adapter.client.rpc.return_value.execute.side_effect = Exception(
+        "{'code': 'PGRST202', 'message': 'Could not find the function'}"
+    )
+    contains = adapter.client.table.return_value.select.return_value.contains
+    contains.return_value.execute.return_value = MagicMock(
+        data=[
+            {"score": 80, "journey_state": "SCHEDULED"},
+            {"score": 20, "journey_state": "ACTIVE"},
+        ]
+    )
+
+    stats = adapter.get_property_interest_stats("prop-1")
+
+    contains.assert_called_once_with("metadata", {"interested_property_ids": ["prop-1"]})
+    assert stats == {"total_leads": 2, "hot_leads": 1, "scheduled_viewings": 1}
+
+
+def test_get_market_stats_served_from_cache():
+    cache = MagicMock()
+    cache.get.return_value = '{"zone": "Brera", "listings_count": 3}'
+    with patch("infrastructure.adapters.supabase_adapter.supabase_pool"):
+        adapter = SupabaseAdapter(cache=cache)
+
+    stats = adapter.get_market_stats("Brera")
+
+    assert stats == {"zone": "Brera", "listings_count": 3}
+    cache.get.assert_called_once_with("market_stats:brera")
+    adapter.client.rpc.assert_not_called()
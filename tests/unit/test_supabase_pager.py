@@ -0,0 +1,52 @@
+"""
+Unit tests for the keyset-paginated Supabase readers.
+"""
+
+import pytest
+
+from infrastructure.adapters.supabase_pager import iter_pages, iter_rows
+
+
+def test_pages_by_id_until_short_page(postgrest_client):
+    client, query = postgrest_client([{"id": 1}, {"id": 2}], [{"id": 3}])
+
+    rows = list(iter_rows(client, "properties", "title", page_size=2))
+
+    assert [r["id"] for r in rows] == [1, 2, 3]
+    client.table.return_value.select.assert_called_with("title, id")
+    query.gt.assert_called_once_with("id", 2)
+    assert query.execute.call_count == 2
+
+
+def test_non_unique_key_resumes_after_key_and_id(postgrest_client):
+    client, query = postgrest_client(
+        [{"id": 7, "created_at": "2026-10-01"}, {"id": 9, "created_at": "2026-10-02"}], []
+    )
+
+    rows = list(
+        iter_rows(
+            client,
+            "leads",
+            "*",
+            where=lambda q: q.gte("created_at", "2026-09-01"),
+            key="created_at",
+            descending=True,
+            page_size=2,
+        )
+    )
+
+    assert len(rows) == 2
+    query.gte.assert_called_with("created_at", "2026-09-01")
+    query.or_.assert_called_once_with(
+        'created_at.lt."2026-10-02",and(created_at.eq."2026-10-02",id.lt."9")'
+    )
+    query.order.assert_any_call("created_at", desc=True)
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_iter_pages_yields_each_page(prefetch, postgrest_client):
+    client, _ = postgrest_client([{"id": 1}, {"id": 2}], [{"id": 3}, {"id": 4}], [])
+
+    pages = list(iter_pages(client, "properties", "id", page_size=2, prefetch=prefetch))
+
+    assert pages == [[{"id": 1}, {"id": 2}], [{"id": 3}, {"id": 4}]]
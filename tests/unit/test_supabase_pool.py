@@ -0,0 +1,44 @@
+"""
+Unit tests for the shared Supabase client pool.
+"""
+
+import httpx
+
+from infrastructure.metrics import supabase_requests_in_flight
+from infrastructure.supabase_pool import SupabaseClientPool, _MeteredTransport
+
+KEY = "test-key-" + "x" * 32
+
+
+def _pool():
+    return SupabaseClientPool(max_connections=4, keepalive_seconds=30, timeout=10, http2=False)
+
+
+def test_clients_are_cached_and_share_one_session():
+    pool = _pool()
+
+    first = pool.client(key=KEY, url="https://one.supabase.co")
+    again = pool.client(key=KEY, url="https://one.supabase.co")
+    other = pool.client(key=KEY, url="https://two.supabase.co")
+
+    assert first is again
+    assert other is not first
+    assert first.postgrest.session is other.postgrest.session is pool.http_client()
+    pool.close()
+
+
+def test_metered_transport_tracks_in_flight_requests():
+    seen = []
+
+    def handler(request):
+        seen.append(supabase_requests_in_flight._value.get())
+        return httpx.Response(200, json=[{"id": 1}])
+
+    baseline = supabase_requests_in_flight._value.get()
+    transport = _MeteredTransport(httpx.MockTransport(handler), max_concurrent=2)
+    with httpx.Client(transport=transport) as client:
+        response = client.get("https://one.supabase.co/rest/v1/leads")
+
+    assert response.json() == [{"id": 1}]
+    assert seen == [baseline + 1]
+    assert supabase_requests_in_flight._value.get() == baseline
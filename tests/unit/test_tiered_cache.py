@@ -0,0 +1,149 @@
+"""
+Unit tests for TieredCache and SingleFlight.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from infrastructure.adapters.cache_adapter import InMemoryCacheAdapter
+from infrastructure.cache.redis_cache import RedisPerplexityCache
+from infrastructure.cache.single_flight import SingleFlight
+from infrastructure.cache.tiered_cache import INVALIDATION_CHANNEL, TieredCache
+
+
+@pytest.fixture
+def redis():
+    l2 = MagicMock()
+    l2.available = True
+    l2.subscribe.return_value = True
+    return l2
+
+
+def test_l2_hit_fills_l1(redis):
+    redis.get.return_value = "v"
+    cache = TieredCache(l1=InMemoryCacheAdapter(), l2=redis)
+
+    assert cache.get("k") == "v"
+    assert cache.get("k") == "v"
+
+    redis.get.assert_called_once_with("k")
+
+
+def test_set_writes_both_tiers_and_notifies_peers(redis):
+    cache = TieredCache(l1=InMemoryCacheAdapter(), l2=redis, l1_ttl=30)
+
+    cache.set("k", "v", ttl=600)
+
+    redis.set.assert_called_once_with("k", "v", ttl=600)
+    channel, message = redis.publish.call_args.args
+    assert channel == INVALIDATION_CHANNEL
+    assert message.endswith(":k")
+    assert cache.get("k") == "v"
+
+
+def test_peer_invalidation_drops_l1_entry(redis):
+    cache = TieredCache(l1=InMemoryCacheAdapter(), l2=redis)
+    handler = redis.subscribe.call_args.args[1]
+    cache.set("k", "v")
+
+    # Own messages are ignored, peers' messages evict
+    handler(redis.publish.call_args.args[1])
+    assert cache.l1.get("k") == "v"
+    handler("other-worker:k")
+    assert cache.l1.get("k") is None
+
+
+def test_unavailable_redis_falls_back_to_l1_only(redis):
+    redis.available = False
+    cache = TieredCache(l1=InMemoryCacheAdapter(), l2=redis)
+
+    cache.set("k", "v")
+
+    assert cache.get("k") == "v"
+    redis.set.assert_not_called()
+    redis.subscribe.assert_not_called()
+
+
+class _SharedRedis:
+    """Just enough of RedisAdapter for several workers to share one store and channel."""
+
+    available = True
+
+    def __init__(self):
+        self.store = {}
+        self.handlers = []
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ttl=3600):
+        self.store[key] = value
+
+    def delete(self, key):
+        self.store.pop(key, None)
+
+    def publish(self, channel, message):
+        for handler in self.handlers:
+            handler(message)
+
+    def subscribe(self, channel, handler):
+        self.handlers.append(handler)
+        return True
+
+
+def test_perplexity_cache_clear_reaches_other_workers():
+    shared = _SharedRedis()
+    first, second = (
+        RedisPerplexityCache(cache=TieredCache(l1=InMemoryCacheAdapter(), l2=shared))
+        for _ in range(2)
+    )
+    query = ("Firenze", "Santo Spirito", "apartment", 100)
+
+    first.set(*query, "comparables")
+    assert second.get(*query) == "comparables"  # now also in the second worker's L1
+
+    first.clear()
+
+    assert second.get(*query) is None
+    assert first.get(*query) is None
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    flight = SingleFlight("test")
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(timeout=5)
+        return "result"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.run("k", compute))) for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert calls == [1]
+    assert results == ["result"] * 5
+
+
+def test_single_flight_shares_errors_and_forgets_key():
+    flight = SingleFlight("test")
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flight.run("k", fail)
+
+    # A failed call isn't remembered: the next caller retries
+    assert flight.run("k", lambda: "ok") == "ok"
@@ -4,13 +4,13 @@ from infrastructure.adapters.validation_adapter import PostgresValidationAdapter
 
 
 class TestPostgresValidationAdapter:
-    @patch("infrastructure.adapters.supabase_adapter.create_client")
+    @patch("infrastructure.adapters.supabase_adapter.supabase_pool")
     @patch("config.settings.settings")
-    def test_log_validation(self, mock_settings, mock_create_client):
+    def test_log_validation(self, mock_settings, mock_pool):
         """Test logging validation to DB."""
         # Setup
         mock_client = MagicMock()
-        mock_create_client.return_value = mock_client
+        mock_pool.client.return_value = mock_client
         mock_settings.SUPABASE_URL = "http://test"
         mock_settings.SUPABASE_KEY = "test"
 
@@ -35,12 +35,12 @@ class TestPostgresValidationAdapter:
         assert call_args["zone"] == "centro-milano"
         assert call_args["alert_triggered"] is False
 
-    @patch("infrastructure.adapters.supabase_adapter.create_client")
+    @patch("infrastructure.adapters.supabase_adapter.supabase_pool")
     @patch("config.settings.settings")
-    def test_log_validation_alert(self, mock_settings, mock_create_client):
+    def test_log_validation_alert(self, mock_settings, mock_pool):
         """Test logging triggers alert on high drift."""
         mock_client = MagicMock()
-        mock_create_client.return_value = mock_client
+        mock_pool.client.return_value = mock_client
         adapter = PostgresValidationAdapter()
 
         # High error (50%)
@@ -54,12 +54,12 @@ class TestPostgresValidationAdapter:
         assert call_args["alert_triggered"] is True
         assert call_args["error_pct"] == 0.5
 
-    @patch("infrastructure.adapters.supabase_adapter.create_client")
+    @patch("infrastructure.adapters.supabase_adapter.supabase_pool")
     @patch("config.settings.settings")
-    def test_detect_drift(self, mock_settings, mock_create_client):
+    def test_detect_drift(self, mock_settings, mock_pool):
         """Test drift detection via recent history."""
         mock_client = MagicMock()
-        mock_create_client.return_value = mock_client
+        mock_pool.client.return_value = mock_client
         adapter = PostgresValidationAdapter()
 
         # Mock Response: 50 rows with average error > 15%